@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        # Connects the model signals that publish live change events,
+        # maintain the denormalized counters, refresh the gallery cache,
+        # invalidate the hot-object cache and keep the stock ledger. These
+        # can't wait: a save before they load would go unrecorded. They only
+        # import Django and the models (a few ms in all); job code
+        # (accounts.tasks) and the CSV import's process pool load on first use.
+        from . import signals, counters, gallery, hot_objects, stock  # noqa: F401
+        from . import checks  # noqa: F401
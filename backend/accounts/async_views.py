@@ -0,0 +1,153 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+
+from . import events, gallery
+from .authentication import BranchJWTAuthentication
+from .branching import get_current_branch
+from .models import Service, Product, Appointment
+from .fast_serializers import ServiceValuesSerializer, ProductValuesSerializer
+
+
+# ===============================================
+# ASYNC (ASGI) READ VIEWS
+# ===============================================
+# Read-only mirrors of the catalog, gallery and calendar endpoints for the
+# ASGI app. They use Django's async ORM, so a slow query no longer pins a
+# worker thread, and the same ValuesSerializers as the synchronous list
+# views, so the JSON matches field for field. Those build plain dicts from
+# values_list() rows; running a DRF ModelSerializer per row here would tie up
+# the event loop for every other request on the worker.
+
+async def _authenticate(request, allow_ticket=False):
+    """Returns (user, error_response) using the same JWT rules as the APIViews."""
+    authenticator = BranchJWTAuthentication()
+    try:
+        result = await authenticator.aauthenticate(request)
+        if result is None and allow_ticket and request.GET.get('ticket'):
+            result = await authenticator.aauthenticate_ticket(request.GET['ticket'])
+    except AuthenticationFailed as exc:
+        return None, _unauthorized(authenticator, exc.detail)
+    if result is None:
+        return None, _unauthorized(authenticator, "Authentication credentials were not provided.")
+    return result[0], None
+
+
+def _unauthorized(authenticator, detail):
+    response = JsonResponse({"detail": detail}, status=status.HTTP_401_UNAUTHORIZED)
+    response['WWW-Authenticate'] = authenticator.authenticate_header(None)
+    return response
+
+
+async def _serialize(queryset, serializer_class):
+    """Returns (data, total); the total comes from acount()."""
+    total = await queryset.acount()
+    data = await serializer_class().aserialize(queryset)
+    return data, total
+
+
+def _list_response(data, total):
+    response = JsonResponse(data, safe=False)
+    response['X-Total-Count'] = str(total)
+    return response
+
+
+@require_GET
+async def async_service_list(request):
+    """GET /api/accounts/async/services/"""
+    _, error = await _authenticate(request)
+    if error:
+        return error
+    services = Service.objects.order_by('-created_at')
+    return _list_response(*await _serialize(services, ServiceValuesSerializer))
+
+
+@require_GET
+async def async_product_list(request):
+    """GET /api/accounts/async/products/"""
+    _, error = await _authenticate(request)
+    if error:
+        return error
+    products = Product.objects.order_by('-created_at')
+    return _list_response(*await _serialize(products, ProductValuesSerializer))
+
+
+@require_GET
+async def async_feedback_gallery(request):
+    """GET /api/accounts/async/feedback/gallery/ (public)"""
+    # Same cursor feed and cache as FeedbackGalleryView; the first page never touches the database.
+    cursor = request.GET.get('cursor')
+    try:
+        limit = int(request.GET.get('limit', 0)) or None
+        page = await sync_to_async(gallery.feed_page)(cursor, limit)
+    except ValueError as exc:
+        return JsonResponse({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    if not cursor:
+        page = {**page, 'summary': await sync_to_async(gallery.rating_summary)()}
+    return JsonResponse(page)
+
+
+@require_GET
+async def async_booked_appointments(request):
+    """GET /api/accounts/async/appointments/booked/"""
+    _, error = await _authenticate(request)
+    if error:
+        return error
+    appointments = (
+        Appointment.objects.filter(status='Confirmed')
+        .order_by('appointment_date')
+        .values('appointment_date', 'service_id')
+    )
+    total = await appointments.acount()
+    data = [
+        {'date': row['appointment_date'], 'service_id': row['service_id']}
+        async for row in appointments.aiterator()
+    ]
+    return _list_response(data, total)
+
+
+# ===============================================
+# LIVE CHANGE STREAM (SERVER-SENT EVENTS)
+# ===============================================
+HEARTBEAT_SECONDS = 15
+
+
+@require_GET
+async def event_stream(request):
+    """
+    GET /api/accounts/events/?channels=product,service,appointment&ticket=...
+
+    Streams row diffs as they are committed so dashboards can patch their
+    local lists instead of re-fetching them. EventSource cannot send headers,
+    so it authenticates with a one-use ?ticket= from POST events/ticket/.
+    Requires the ASGI app.
+    """
+    _, error = await _authenticate(request, allow_ticket=True)
+    if error:
+        return error
+    requested = request.GET.get('channels')
+    channels = [c for c in requested.split(',') if c in events.CHANNELS] if requested else events.CHANNELS
+    subscription = events.get_broker().subscribe(channels, branch=get_current_branch())
+
+    async def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = await subscription.get(timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"event: {event['channel']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,60 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from . import events
+from .branching import branch_for_user, set_current_branch
+
+
+class BranchJWTAuthentication(JWTAuthentication):
+    """
+    Standard JWT authentication that also activates the caller's branch, so
+    every branch-scoped queryset in the view is filtered automatically.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            set_current_branch(branch_for_user(result[0]))
+        return result
+
+    async def aauthenticate(self, request):
+        """Async counterpart of authenticate() for plain Django async views."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        user = await self.aget_user(validated_token)
+        set_current_branch(branch_for_user(user))
+        return user, validated_token
+
+    async def aauthenticate_ticket(self, ticket):
+        """Authenticates a one-use event stream ticket (accounts.events.issue_ticket)."""
+        user_id = await events.aredeem_ticket(ticket)
+        if user_id is None:
+            raise AuthenticationFailed(_("Stream ticket is invalid, expired or already used."), code="bad_ticket")
+        user = await self.aget_user({api_settings.USER_ID_CLAIM: user_id})
+        set_current_branch(branch_for_user(user))
+        return user, None
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        try:
+            user = await self.user_model.objects.select_related('userprofile').aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,123 @@
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import models
+
+
+# ===============================================
+# BRANCH SCOPING
+# ===============================================
+# The branch of the staff member making the current request. It is set by
+# BranchJWTAuthentication once the caller is known and cleared again by
+# BranchScopeMiddleware, so worker threads never leak it between requests.
+#
+# The rule: staff assigned to a branch see that branch's rows plus the shared
+# head-office rows (branch NULL). Everyone else is unscoped: head-office
+# admins, the shell and workers, and customers, who book and buy at any
+# branch and are limited to their own rows by the views (owner/user filters)
+# rather than by branch. None means "no scoping".
+#
+# Every branch's rows live in the one database, kept apart by the indexed
+# `branch` column. Separate per-branch databases can't serve this rule:
+# customers and head office read across branches, head-office rows would be
+# missing from every branch database, and the rows point at auth_user on
+# `default`. accounts/checks.py refuses a BRANCH_DATABASES setting.
+_current_branch = ContextVar('current_branch', default=None)
+
+
+def get_current_branch():
+    return _current_branch.get()
+
+
+def set_current_branch(branch):
+    """Sets the active branch and returns a token for reset_current_branch()."""
+    return _current_branch.set(branch or None)
+
+
+def reset_current_branch(token):
+    _current_branch.reset(token)
+
+
+def branch_for_user(user):
+    """
+    Returns the branch a user's querysets should be scoped to: the branch of
+    a staff member's profile, or None for head-office staff and customers.
+    """
+    if not user or not user.is_authenticated or not user.is_staff:
+        return None
+    profile = getattr(user, 'userprofile', None)
+    return profile.branch if profile and profile.branch else None
+
+
+class BranchScopedQuerySet(models.QuerySet):
+    def for_branch(self, branch):
+        """Rows of `branch` plus the shared head-office rows; everything when branch is None."""
+        if not branch:
+            return self
+        return self.filter(models.Q(branch=branch) | models.Q(branch__isnull=True))
+
+
+class BranchScopedManager(models.Manager.from_queryset(BranchScopedQuerySet)):
+    """Default manager that only returns rows the caller's branch may see."""
+
+    def get_queryset(self):
+        return super().get_queryset().for_branch(get_current_branch())
+
+
+class BranchScopedModel(models.Model):
+    """
+    Abstract base for rows that belong to one store location.
+
+    `objects` is scoped to the active branch; `all_branches` is the escape
+    hatch for reports and maintenance code that must see every branch.
+    """
+    branch = models.CharField(max_length=100, blank=True, null=True, db_index=True)
+
+    objects = BranchScopedManager()
+    all_branches = models.Manager()
+
+    # Name of a related BranchScopedModel to inherit the branch from when the
+    # row is created outside of a branch (e.g. a customer booking a service).
+    branch_source = None
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self.branch is None:
+            self.branch = get_current_branch()
+        if self.branch is None and self.branch_source:
+            source = getattr(self, self.branch_source, None)
+            self.branch = getattr(source, 'branch', None)
+        super().save(*args, **kwargs)
+
+
+# ===============================================
+# MIDDLEWARE
+# ===============================================
+class BranchScopeMiddleware:
+    """Guarantees the branch context is cleared at the end of every request."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _current_branch.set(None)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_branch.reset(token)
+
+    async def __acall__(self, request):
+        token = _current_branch.set(None)
+        try:
+            return await self.get_response(request)
+        finally:
+            _current_branch.reset(token)
+
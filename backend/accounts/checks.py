@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+
+# ===============================================
+# SYSTEM CHECKS
+# ===============================================
+# Some state only means something when every worker process shares it: the
+# rate-limit counts (accounts/throttling.py) are one budget only when all
+# workers increment the same cache, atomically, and an Idempotency-Key
+# (accounts/idempotency.py) is only claimed once when every worker's
+# cache.add() goes to the same cache, and an event stream ticket
+# (accounts/events.py) issued by one worker must be found by the one serving
+# the stream. These are deployment checks:
+# `manage.py check --deploy` (which serve.py runs first) fails on them.
+# The BRANCH_DATABASES check always runs.
+
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+# Shared, but add() is a read followed by a write, so two callers can both win.
+NON_ATOMIC_ADD_CACHES = PROCESS_LOCAL_CACHES | {
+    'django.core.cache.backends.filebased.FileBasedCache',
+}
+# Same for incr(), which DatabaseCache also does as a read and a write.
+NON_ATOMIC_INCR_CACHES = NON_ATOMIC_ADD_CACHES | {
+    'django.core.cache.backends.db.DatabaseCache',
+}
+
+
+def _unsafe_cache(alias, unsafe_backends, setting, purpose, id):
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    if backend not in unsafe_backends:
+        return []
+    return [Error(
+        f"{setting} uses the '{alias}' cache ({backend.rsplit('.', 1)[-1]}), which can't {purpose}.",
+        hint="Point it at a cache shared by all workers, such as Redis (DJANGO_REDIS_URL in production).",
+        id=id,
+    )]
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_caches(app_configs, **kwargs):
+    return [
+        *_unsafe_cache(getattr(settings, 'RATE_LIMIT_CACHE', 'default'), NON_ATOMIC_INCR_CACHES,
+                       'RATE_LIMIT_CACHE', 'keep one rate-limit budget across worker processes',
+                       'accounts.E001'),
+        *_unsafe_cache(getattr(settings, 'IDEMPOTENCY', {}).get('CACHE', 'default'), NON_ATOMIC_ADD_CACHES,
+                       "IDEMPOTENCY['CACHE']", 'stop two worker processes accepting the same Idempotency-Key',
+                       'accounts.E002'),
+        *_unsafe_cache(getattr(settings, 'EVENT_STREAM', {}).get('CACHE', 'default'), PROCESS_LOCAL_CACHES,
+                       "EVENT_STREAM['CACHE']", 'hand a stream ticket from one worker process to another',
+                       'accounts.E004'),
+    ]
+
+
+@register()
+def check_branch_databases(app_configs, **kwargs):
+    # Per-branch databases were dropped; a leftover setting would silently do nothing.
+    if not getattr(settings, 'BRANCH_DATABASES', None):
+        return []
+    return [Error(
+        "BRANCH_DATABASES is not supported: customers and head office read across branches, and branch "
+        "rows point at auth_user, so every branch's rows must stay in the default database.",
+        hint="Remove BRANCH_DATABASES; rows are kept apart by their indexed `branch` column "
+             "(see accounts/branching.py).",
+        id='accounts.E003',
+    )]
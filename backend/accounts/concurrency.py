@@ -0,0 +1,79 @@
+from django.db import models, router, transaction
+from django.db.models import F
+
+
+# ===============================================
+# OPTIMISTIC CONCURRENCY (VERSION + IF-MATCH)
+# ===============================================
+# Staff edit forms send back the version they loaded as `If-Match: "<n>"`.
+# The save becomes UPDATE ... WHERE id = %s AND version = n, so of two
+# concurrent edits the second one matches no row and gets 412 instead of
+# silently overwriting the first. No row locks are held between the read and
+# the write.
+
+class VersionConflict(Exception):
+    """The row's version no longer matches the one the client sent."""
+
+
+class VersionedModel(models.Model):
+    """
+    Abstract base adding a `version` that every save() of an existing row
+    bumps in SQL (version = version + 1). save(expected_version=[n, ...])
+    makes the UPDATE conditional and raises VersionConflict when it matched
+    nothing. Queryset .update() paths that change user-editable columns bump
+    the version themselves; counter columns don't.
+    """
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, expected_version=None, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        self.version = F('version') + 1
+        self._expected_version = expected_version
+        try:
+            # In its own savepoint, so a conflict inside a caller's transaction
+            # only undoes this save and the caller can still read the current row.
+            using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+            with transaction.atomic(using=using):
+                super().save(*args, **kwargs)
+        finally:
+            self._expected_version = None
+            # The new number is only known to the database; it is re-read on first access.
+            self.__dict__.pop('version', None)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = getattr(self, '_expected_version', None)
+        if expected is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if not super()._do_update(base_qs.filter(version__in=expected), using, pk_val, values, update_fields,
+                                  forced_update):
+            raise VersionConflict(f"{self._meta.object_name} {pk_val} was modified by someone else.")
+        return True
+
+
+def etag(instance):
+    return f'"{instance.version}"'
+
+
+def parse_if_match(header):
+    """
+    The versions listed in an If-Match header, or None when there is no
+    precondition (header absent or "*"). Weak tags are accepted because
+    CompressionMiddleware weakens the ETags it compresses.
+    """
+    if not header or header.strip() == '*':
+        return None
+    versions = []
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag.isdigit():
+            versions.append(int(tag))
+    return versions  # Empty when nothing parsed: matches no row, so the write is refused
@@ -0,0 +1,201 @@
+import contextlib
+import contextvars
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .models import Service, Order, Appointment, PetProfile, Feedback, FeedbackSummary, UserProfile
+
+
+# ===============================================
+# DENORMALIZED COUNTERS
+# ===============================================
+# Counter columns are bumped with F() expressions from the model signals, so
+# they change in the same transaction as the row that caused them (views
+# wrap the save in transaction.atomic()). Bulk paths that bypass the signals
+# go through bulk_delete(). `manage.py reconcile_counters` repairs drift.
+
+# (source model, source FK attname, target model, target key field, counter field)
+COUNTERS = (
+    (Order, 'service_id', Service, 'id', 'order_count'),
+    (Order, 'user_id', UserProfile, 'user_id', 'order_count'),
+    (Appointment, 'service_id', Service, 'id', 'booking_count'),
+    (Appointment, 'user_id', UserProfile, 'user_id', 'appointment_count'),
+    (PetProfile, 'owner_id', UserProfile, 'user_id', 'pet_count'),
+)
+
+_suspended = contextvars.ContextVar('counters_suspended', default=False)
+
+
+@contextlib.contextmanager
+def suspended():
+    """Turns the signal handlers off while a caller adjusts counters itself."""
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def _specs(model):
+    return [spec for spec in COUNTERS if spec[0] is model]
+
+
+def adjust(target, key_field, key, field, delta):
+    # Greatest() keeps a drifted counter from failing the unsigned constraint.
+    target._base_manager.filter(**{key_field: key}).update(**{field: Greatest(F(field) + delta, 0)})
+
+
+def adjust_feedback_summary(changes):
+    """`changes` maps a rating to how many feedback rows with it were added (or removed, if negative)."""
+    values = {
+        'feedback_count': Greatest(F('feedback_count') + sum(changes.values()), 0),
+        'rating_total': Greatest(F('rating_total') + sum(r * n for r, n in changes.items()), 0),
+    }
+    for rating, n in changes.items():
+        field = FeedbackSummary.HISTOGRAM_FIELDS.get(rating)
+        if field and n:
+            values[field] = Greatest(F(field) + n, 0)
+    if not FeedbackSummary.objects.filter(pk=FeedbackSummary.SINGLETON_ID).update(**values):
+        FeedbackSummary.load()
+        FeedbackSummary.objects.filter(pk=FeedbackSummary.SINGLETON_ID).update(**values)
+
+
+# --- Signal handlers ---
+# Old keys are read with one query in pre_save, and only when an existing row
+# is saved with a counted column in play, so loading rows costs nothing extra.
+
+def _saved_fields(attnames, instance, update_fields):
+    """The counted attnames this save writes, skipping deferred ones."""
+    return [
+        attname for attname in attnames
+        if attname in instance.__dict__
+        and (update_fields is None or attname in update_fields or attname.removesuffix('_id') in update_fields)
+    ]
+
+
+def _stored(sender, instance, fields, using):
+    if not fields:
+        return None
+    return sender._base_manager.using(using).filter(pk=instance.pk).values(*fields).first()
+
+
+def _read_before(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    instance._counted_values = None
+    if raw or instance._state.adding or _suspended.get():
+        return
+    fields = _saved_fields([attname for _, attname, *_ in _specs(sender)], instance, update_fields)
+    instance._counted_values = _stored(sender, instance, fields, using)
+
+
+def _count_save(sender, instance, created, **kwargs):
+    if _suspended.get():
+        return
+    previous, instance._counted_values = getattr(instance, '_counted_values', None), None
+    if not created and previous is None:
+        return
+    for _, attname, target, key_field, field in _specs(sender):
+        if not created and attname not in previous:
+            continue  # Not written by this save
+        old, new = (previous or {}).get(attname), getattr(instance, attname)
+        if old == new:
+            continue
+        if old is not None:
+            adjust(target, key_field, old, field, -1)
+        if new is not None:
+            adjust(target, key_field, new, field, 1)
+
+
+def _count_delete(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    for _, attname, target, key_field, field in _specs(sender):
+        key = getattr(instance, attname)
+        if key is not None:
+            adjust(target, key_field, key, field, -1)
+
+
+def _read_rating_before(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    instance._counted_rating = None
+    if raw or instance._state.adding or _suspended.get():
+        return
+    stored = _stored(sender, instance, _saved_fields(['rating'], instance, update_fields), using)
+    instance._counted_rating = stored and stored['rating']
+
+
+def _feedback_save(sender, instance, created, **kwargs):
+    if _suspended.get():
+        return
+    previous, instance._counted_rating = getattr(instance, '_counted_rating', None), None
+    if created:
+        adjust_feedback_summary({instance.rating: 1})
+    elif previous is not None and instance.rating != previous:
+        adjust_feedback_summary({previous: -1, instance.rating: 1})
+
+
+def _feedback_delete(sender, instance, **kwargs):
+    if not _suspended.get():
+        adjust_feedback_summary({instance.rating: -1})
+
+
+for source in {spec[0] for spec in COUNTERS}:
+    pre_save.connect(_read_before, sender=source)
+    post_save.connect(_count_save, sender=source)
+    post_delete.connect(_count_delete, sender=source)
+
+pre_save.connect(_read_rating_before, sender=Feedback)
+post_save.connect(_feedback_save, sender=Feedback)
+post_delete.connect(_feedback_delete, sender=Feedback)
+
+
+# --- Bulk paths ---
+
+def bulk_delete(model, ids):
+    """
+    Deletes rows by primary key with one grouped decrement per affected
+    counter row instead of one per deleted row. Call inside a transaction.
+    """
+    rows = model._base_manager.filter(pk__in=ids)
+    for _, attname, target, key_field, field in _specs(model):
+        for row in rows.exclude(**{attname: None}).values(attname).annotate(n=Count('pk')):
+            adjust(target, key_field, row[attname], field, -row['n'])
+    if model is Feedback:
+        changes = {row['rating']: -row['n'] for row in rows.values('rating').annotate(n=Count('pk'))}
+        if changes:
+            adjust_feedback_summary(changes)
+    with suspended():
+        return rows.delete()
+
+
+# --- Repair ---
+
+def _actual_count(source, attname, key_field):
+    return Coalesce(Subquery(
+        source._base_manager.filter(**{attname: OuterRef(key_field)}).order_by()
+        .values(attname).annotate(n=Count('pk')).values('n')
+    ), 0)
+
+
+def reconcile(dry_run=False):
+    """
+    Recomputes every counter from the source tables with one UPDATE per
+    counter column. Returns {label: number of rows that had drifted}.
+    """
+    drift = {}
+    for source, attname, target, key_field, field in COUNTERS:
+        label = f"{target.__name__}.{field}"
+        stale = target._base_manager.annotate(actual=_actual_count(source, attname, key_field)).exclude(
+            **{field: F('actual')})
+        drift[label] = stale.count()
+        if drift[label] and not dry_run:
+            with transaction.atomic():
+                target._base_manager.update(**{field: _actual_count(source, attname, key_field)})
+
+    actual = FeedbackSummary.compute()
+    summary = FeedbackSummary.objects.filter(pk=FeedbackSummary.load().pk)
+    drift['FeedbackSummary'] = int(summary.values(*actual).get() != actual)
+    if drift['FeedbackSummary'] and not dry_run:
+        summary.update(**actual)
+    return drift
@@ -0,0 +1,84 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Appointment, Order, Product, FeedbackSummary
+
+
+# ===============================================
+# ADMIN DASHBOARD SUMMARY
+# ===============================================
+# The overview cards used to need six list calls and client-side counting.
+# Here each table is read once: a single aggregate() whose figures are
+# conditional counts (COUNT(...) FILTER (WHERE ...)) over the same pass, and
+# the rating comes from the FeedbackSummary counters. Each aggregate goes
+# through the table's branch-scoped manager, so branch staff get their own
+# figures.
+# The result is cached per branch for a few seconds.
+
+def _config():
+    config = {'CACHE_TTL': 30}
+    config.update(getattr(settings, 'DASHBOARD_SUMMARY', {}))
+    return config
+
+
+def _money(value):
+    return f"{value or 0:.2f}"
+
+
+def compute():
+    """The summary for the caller's branch (the managers are branch-scoped)."""
+    now = timezone.now()
+    today = timezone.localdate(now)
+    day_start = timezone.make_aware(datetime.combine(today, time.min))
+    week_start = day_start - timedelta(days=6)
+    today_text = today.isoformat()  # appointment_date is stored as 'YYYY-MM-DD'
+
+    bookings = Appointment.objects.aggregate(
+        today=Count('pk', filter=Q(appointment_date=today_text) & ~Q(status='Cancelled')),
+        today_completed=Count('pk', filter=Q(appointment_date=today_text, status='Completed')),
+        today_cancelled=Count('pk', filter=Q(appointment_date=today_text, status='Cancelled')),
+        upcoming=Count('pk', filter=Q(appointment_date__gt=today_text, status='Confirmed')),
+    )
+    orders = Order.objects.aggregate(
+        pending=Count('pk', filter=Q(status='Pending')),
+        today=Count('pk', filter=Q(order_date__gte=day_start)),
+        revenue_today=Sum('total_cost', filter=Q(order_date__gte=day_start, status='Completed')),
+    )
+    products = Product.objects.aggregate(
+        total=Count('pk'),
+        low_stock=Count('pk', filter=Q(stocks__gt=0, stocks__lte=F('reorder_point'))),
+        out_of_stock=Count('pk', filter=Q(stocks__lte=0)),
+    )
+    users = User.objects.filter(is_staff=False).aggregate(
+        customers=Count('pk', filter=Q(is_active=True)),
+        new_today=Count('pk', filter=Q(date_joined__gte=day_start)),
+        new_this_week=Count('pk', filter=Q(date_joined__gte=week_start)),
+    )
+    feedback = FeedbackSummary.load()
+
+    orders['revenue_today'] = _money(orders['revenue_today'])
+    return {
+        'date': today_text,
+        'generated_at': now.isoformat(),
+        'bookings': bookings,
+        'orders': orders,
+        'products': products,
+        'users': users,
+        'feedback': {'count': feedback.feedback_count, 'average_rating': feedback.average_rating},
+    }
+
+
+def summary(branch=None):
+    """compute() through the cache; `branch` must be the caller's active branch."""
+    config = _config()
+    key = f"dashboard:summary:{branch or '*'}"
+    data = cache.get(key)
+    if data is None:
+        data = compute()
+        cache.set(key, data, config['CACHE_TTL'])
+    return data
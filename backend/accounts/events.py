@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import secrets
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+
+# ===============================================
+# CHANGE EVENTS (PUB/SUB)
+# ===============================================
+# Row-level change events for the staff dashboards and the booking calendar.
+# Publishers (model signals, bulk update paths) call publish(); the SSE view
+# subscribes. The broker is chosen by settings.EVENT_BROKER so the in-process
+# default can be swapped for a local broker (e.g. Redis pub/sub) that exposes
+# the same publish()/subscribe() interface when running several workers.
+
+CHANNELS = ('product', 'service', 'appointment')
+
+
+class Subscription:
+    """A bounded per-client queue fed by the broker from any thread."""
+
+    def __init__(self, broker, channels, branch=None, maxsize=1000):
+        self.broker = broker
+        self.channels = set(channels)
+        self.branch = branch
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.lagged = False
+
+    def wants(self, event):
+        if event['channel'] not in self.channels:
+            return False
+        return self.branch is None or event.get('branch') in (None, self.branch)
+
+    def _deliver(self, event):
+        # Runs on the subscriber's event loop.
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop the backlog and ask the client to refetch.
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'channel': 'control', 'op': 'resync'})
+
+    async def get(self, timeout=None):
+        event = await asyncio.wait_for(self.queue.get(), timeout)
+        if event.get('op') == 'resync':
+            self.lagged = False
+        return event
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Fan-out to subscribers living in this process only."""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.wants(event)]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # The subscriber's loop is already closed.
+                self.unsubscribe(subscription)
+
+    def subscribe(self, channels, branch=None):
+        subscription = Subscription(self, channels, branch)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, 'EVENT_BROKER', 'accounts.events.InProcessBroker')
+                _broker = import_string(path)()
+    return _broker
+
+
+def publish(channel, op, pk, changes=None, branch=None):
+    """Publishes one row change, e.g. publish('product', 'updated', 4, {'stocks': 9})."""
+    get_broker().publish({
+        'channel': channel,
+        'op': op,
+        'id': pk,
+        'branch': branch,
+        'changes': changes or {},
+    })
+
+
+# ===============================================
+# STREAM TICKETS
+# ===============================================
+def _ticket_config():
+    return {'TICKET_TTL': 30, 'CACHE': 'default', **getattr(settings, 'EVENT_STREAM', {})}
+
+
+def _ticket_key(ticket):
+    # Hashed: the ticket arrives as untrusted query input.
+    return f"event-ticket:{hashlib.sha256(ticket.encode()).hexdigest()}"
+
+
+def issue_ticket(user_id):
+    """Returns (ticket, ttl): a one-use credential for opening the event stream as `user_id`."""
+    config = _ticket_config()
+    ticket = secrets.token_urlsafe(32)
+    caches[config['CACHE']].set(_ticket_key(ticket), user_id, config['TICKET_TTL'])
+    return ticket, config['TICKET_TTL']
+
+
+async def aredeem_ticket(ticket):
+    """The user id the ticket was issued for, or None. A ticket only redeems once."""
+    cache = caches[_ticket_config()['CACHE']]
+    key = _ticket_key(ticket)
+    user_id = await cache.aget(key)
+    # delete() reports whether it removed the key, so two racing redeems can't both win.
+    if user_id is None or not await cache.adelete(key):
+        return None
+    return user_id
@@ -0,0 +1,175 @@
+from django.db import models
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import Service, Product, Order, Feedback, PetVisit, StockMovement
+
+
+# ===============================================
+# LEAN READ SERIALIZERS (values() PROJECTIONS)
+# ===============================================
+# Read-only counterparts of the ModelSerializers used by the big list
+# endpoints. They fetch exactly the listed columns with values_list(), joins
+# included, convert Decimal/datetime columns in one pass and build plain
+# dicts, skipping model and serializer instantiation per row. The output is
+# identical to the ModelSerializer it mirrors, including DRF's habit of
+# leaving out a `related.field` key when the relation is null.
+
+def _decimal_converter(model_field):
+    # Same text DRF's DecimalField produces with COERCE_DECIMAL_TO_STRING.
+    places = model_field.decimal_places
+
+    def convert(value):
+        return None if value is None else '{:.{}f}'.format(value, places)
+    return convert
+
+
+def _datetime_converter(model_field):
+    # Same text DRF's DateTimeField produces with the default ISO 8601 format.
+    def convert(value):
+        if value is None:
+            return None
+        if timezone.is_aware(value):
+            value = value.astimezone(timezone.get_current_timezone())
+        text = value.isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return convert
+
+
+class ValuesSerializer:
+    """
+    Subclasses set `model` and `fields`, where each field is either a model
+    field name or an (output name, ORM lookup) pair such as
+    ('service_name', 'service__name'). `fields`/`expand` mirror the
+    ?fields=/?expand= options of SparseFieldsMixin: `expandable` maps a
+    relation to the columns of its nested object (the first must be 'id').
+    """
+    model = None
+    fields = ()
+    expandable = {}
+
+    def __init__(self, fields=None, expand=()):
+        declared = [(f, f) if isinstance(f, str) else f for f in self.fields]
+        expand = [name for name in expand if name in self.expandable]
+        if fields is not None:
+            names = [name for name, _ in declared]
+            unknown = [name for name in fields if name not in names]
+            if unknown:
+                # Same 400 the ModelSerializers give (SparseFieldsMixin)
+                raise ValidationError({"fields": [
+                    f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(names)}."
+                ]})
+            keep = set(fields) | set(expand)
+            declared = [f for f in declared if f[0] in keep]
+        self.lookups = []     # Flat list of columns for values_list()
+        self.layout = []      # (name, column index) or (name, (sub names, column indexes))
+        self.converters = []  # (column index, converter)
+        self.optional = []    # Columns dropped from a row when a nullable relation is empty
+        for name, lookup in declared:
+            if name in expand:
+                sub_names = self.expandable[name]
+                indexes = [self._add_column(f"{name}__{sub}", nested=True) for sub in sub_names]
+                self.layout.append((name, (sub_names, indexes)))
+            else:
+                self.layout.append((name, self._add_column(lookup)))
+        self.flat = all(isinstance(index, int) for _, index in self.layout)
+
+    def _add_column(self, lookup, nested=False):
+        index = len(self.lookups)
+        self.lookups.append(lookup)
+        model_field, via_nullable = self._resolve(lookup)
+        if isinstance(model_field, models.DecimalField):
+            self.converters.append((index, _decimal_converter(model_field)))
+        elif isinstance(model_field, models.DateTimeField):
+            self.converters.append((index, _datetime_converter(model_field)))
+        if via_nullable and not nested:
+            self.optional.append(index)
+        return index
+
+    def _resolve(self, lookup):
+        model, via_nullable = self.model, False
+        parts = lookup.split('__')
+        for part in parts[:-1]:
+            relation = model._meta.get_field(part)
+            via_nullable = via_nullable or relation.null
+            model = relation.related_model
+        return model._meta.get_field(parts[-1]), via_nullable
+
+    def serialize(self, queryset):
+        return self._to_data(list(queryset.values_list(*self.lookups)))
+
+    async def aserialize(self, queryset):
+        """serialize() for async views: the rows come from the async ORM."""
+        return self._to_data([row async for row in queryset.values_list(*self.lookups)])
+
+    def _to_data(self, rows):
+        if not rows:
+            return []
+        if self.converters:
+            columns = list(zip(*rows))
+            for index, convert in self.converters:
+                columns[index] = list(map(convert, columns[index]))
+            rows = zip(*columns)
+        if self.flat:
+            names = [name for name, _ in self.layout]
+            data = [dict(zip(names, row)) for row in rows]
+        else:
+            data = [self._build(row) for row in rows]
+        if self.optional:
+            optional = [name for name, index in self.layout if index in self.optional]
+            for item in data:
+                for name in optional:
+                    if item[name] is None:
+                        del item[name]
+        return data
+
+    def _build(self, row):
+        item = {}
+        for name, index in self.layout:
+            if isinstance(index, int):
+                item[name] = row[index]
+            else:
+                sub_names, indexes = index
+                item[name] = None if row[indexes[0]] is None else {
+                    sub: row[i] for sub, i in zip(sub_names, indexes)
+                }
+        return item
+
+
+class ServiceValuesSerializer(ValuesSerializer):
+    model = Service
+    fields = ('id', 'name', 'description', 'included', 'duration', 'cost', 'availability', 'created_by',
+              ('created_by_username', 'created_by__username'), 'created_at', 'order_count', 'booking_count', 'version')
+    expandable = {'created_by': ('id', 'username')}
+
+
+class ProductValuesSerializer(ValuesSerializer):
+    model = Product
+    fields = ('id', 'name', 'description', 'category', 'unit_of_measure', 'stocks', 'price', 'is_available',
+              'reorder_point', 'created_by', ('created_by_username', 'created_by__username'), 'created_at', 'version')
+    expandable = {'created_by': ('id', 'username')}
+
+
+class OrderValuesSerializer(ValuesSerializer):
+    model = Order
+    fields = ('id', 'user', ('username', 'user__username'), 'service', ('service_name', 'service__name'),
+              'order_date', 'status', 'total_cost')
+    expandable = {'user': ('id', 'username'), 'service': ('id', 'name', 'cost')}
+
+
+class FeedbackValuesSerializer(ValuesSerializer):
+    model = Feedback
+    fields = ('id', 'user', ('username', 'user__username'), 'rating', 'feedback_text', 'submitted_at')
+    expandable = {'user': ('id', 'username')}
+
+
+class PetVisitValuesSerializer(ValuesSerializer):
+    model = PetVisit
+    fields = ('id', 'pet', 'appointment', 'kind', 'visited_at', 'weight_kg', 'notes', 'recorded_by',
+              ('recorded_by_username', 'recorded_by__username'), 'created_at')
+
+
+class StockMovementValuesSerializer(ValuesSerializer):
+    model = StockMovement
+    fields = ('id', 'product', 'delta', 'stocks_after', 'reason', 'created_by',
+              ('created_by_username', 'created_by__username'), 'created_at')
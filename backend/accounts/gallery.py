@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .fast_serializers import FeedbackValuesSerializer
+from .models import Feedback, FeedbackSummary
+from .pagination import keyset_page
+
+
+# ===============================================
+# PUBLIC FEEDBACK GALLERY
+# ===============================================
+# The gallery is a keyset ("cursor") feed, newest first, over the
+# (submitted_at, id) index, with the rating summary read from the
+# FeedbackSummary row. The summary and the default first page are cached and
+# rewritten after every committed feedback change, so anonymous landing-page
+# traffic is served from the cache rather than the database.
+
+SUMMARY_KEY = 'feedback:summary'
+FIRST_PAGE_KEY = 'feedback:first-page'
+
+
+def _config():
+    config = {'PAGE_SIZE': 20, 'MAX_PAGE_SIZE': 100, 'CACHE_TTL': 300}
+    config.update(getattr(settings, 'FEEDBACK_GALLERY', {}))
+    return config
+
+
+def _query_page(cursor, limit):
+    return keyset_page(Feedback.objects.all(), FeedbackValuesSerializer(), 'submitted_at', cursor, limit)
+
+
+def feed_page(cursor=None, limit=None):
+    config = _config()
+    limit = min(max(limit or config['PAGE_SIZE'], 1), config['MAX_PAGE_SIZE'])
+    if cursor or limit != config['PAGE_SIZE']:
+        return _query_page(cursor, limit)
+    page = cache.get(FIRST_PAGE_KEY)
+    if page is None:
+        page = _query_page(None, limit)
+        cache.set(FIRST_PAGE_KEY, page, config['CACHE_TTL'])
+    return page
+
+
+def rating_summary():
+    summary = cache.get(SUMMARY_KEY)
+    if summary is None:
+        summary = FeedbackSummary.load().as_dict()
+        cache.set(SUMMARY_KEY, summary, _config()['CACHE_TTL'])
+    return summary
+
+
+def refresh_cache():
+    """Rewrites (rather than just deletes) the cached entries so readers never miss."""
+    config = _config()
+    cache.set_many({
+        SUMMARY_KEY: FeedbackSummary.load().as_dict(),
+        FIRST_PAGE_KEY: _query_page(None, config['PAGE_SIZE']),
+    }, config['CACHE_TTL'])
+
+
+def _schedule_refresh(sender, **kwargs):
+    # Runs after the counters in accounts.counters have been committed.
+    transaction.on_commit(refresh_cache)
+
+
+post_save.connect(_schedule_refresh, sender=Feedback)
+post_delete.connect(_schedule_refresh, sender=Feedback)
@@ -0,0 +1,140 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .branching import get_current_branch
+from .models import Product, Service
+
+
+# ===============================================
+# HOT-OBJECT CACHE (SERVICE / PRODUCT LOOKUPS)
+# ===============================================
+# Every order and booking resolves its service by primary key and reads its
+# cost, so during a booking rush the same few dozen rows are fetched
+# thousands of times. Each worker keeps a bounded LRU of small snapshots of
+# those rows, each living at most TTL seconds.
+#
+# Snapshots remember the per-model stamp (kept in the shared cache) they were
+# loaded under. Saves and deletes replace the stamp once they commit, which
+# drops every older snapshot of that model in every worker sharing the cache.
+# With the per-process LocMemCache other workers only notice through the TTL.
+
+class Snapshot:
+    """The cached columns of one row; the rest stay deferred on instance()."""
+    __slots__ = ('db', 'stamp', 'expires')
+    model = None
+    fields = ()
+
+    def __init__(self, values, db, stamp, expires):
+        for name, value in zip(self.fields, values):
+            setattr(self, name, value)
+        self.db = db
+        self.stamp = stamp
+        self.expires = expires
+
+    def instance(self):
+        """A fresh model instance per call, so callers never share mutable state."""
+        return self.model.from_db(self.db, self.fields, [getattr(self, name) for name in self.fields])
+
+
+class ServiceSnapshot(Snapshot):
+    __slots__ = ('id', 'branch', 'version', 'name', 'duration', 'cost', 'availability')
+    model = Service
+    fields = __slots__
+
+
+class ProductSnapshot(Snapshot):
+    # stocks is left out: it changes far more often than anything else here.
+    __slots__ = ('id', 'branch', 'version', 'name', 'category', 'unit_of_measure', 'price', 'is_available')
+    model = Product
+    fields = __slots__
+
+
+SNAPSHOTS = {Service: ServiceSnapshot, Product: ProductSnapshot}
+
+_entries = OrderedDict()  # (model, db alias, pk) -> Snapshot, least recently used first
+_lock = threading.Lock()
+
+
+def _config():
+    config = {'MAX_ENTRIES': 1024, 'TTL': 60, 'CACHE': 'default'}
+    config.update(getattr(settings, 'HOT_OBJECT_CACHE', {}))
+    return config
+
+
+def _stamp_key(model):
+    return f'hot-objects:{model._meta.label_lower}'
+
+
+def _current_stamp(model, shared):
+    key = _stamp_key(model)
+    stamp = shared.get(key)
+    if stamp is None:
+        # Never set or evicted: start a new generation (add() lets one worker win).
+        shared.add(key, uuid.uuid4().hex, None)
+        stamp = shared.get(key)
+    return stamp
+
+
+def get(model, pk):
+    """
+    The `model` row with primary key `pk` as an instance built from its
+    snapshot, or None when it doesn't exist or the caller's branch can't
+    see it. Columns outside the snapshot load on first access.
+    """
+    snapshot_class = SNAPSHOTS[model]
+    config = _config()
+    db = model.objects.db  # Same database the branch-scoped manager would read
+    key = (model, db, pk)
+    # Read the stamp before the row, so a change committed in between leaves
+    # the new snapshot already out of date rather than stale under a new stamp.
+    stamp = _current_stamp(model, caches[config['CACHE']])
+    now = time.monotonic()
+
+    with _lock:
+        snapshot = _entries.get(key)
+        if snapshot is not None and snapshot.stamp == stamp and snapshot.expires > now:
+            _entries.move_to_end(key)
+        else:
+            snapshot = None
+
+    if snapshot is None:
+        values = model._base_manager.using(db).filter(pk=pk).values_list(*snapshot_class.fields).first()
+        if values is None:
+            return None
+        snapshot = snapshot_class(values, db, stamp, now + config['TTL'])
+        with _lock:
+            _entries[key] = snapshot
+            _entries.move_to_end(key)
+            while len(_entries) > config['MAX_ENTRIES']:
+                _entries.popitem(last=False)
+
+    branch = get_current_branch()
+    if branch and snapshot.branch not in (None, branch):  # Same rule as BranchScopedQuerySet.for_branch
+        return None
+    return snapshot.instance()
+
+
+def invalidate(model):
+    """Starts a new generation for `model`; call it after the change commits."""
+    caches[_config()['CACHE']].set(_stamp_key(model), uuid.uuid4().hex, None)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+def _schedule_invalidate(sender, **kwargs):
+    transaction.on_commit(lambda: invalidate(sender))
+
+
+for model in SNAPSHOTS:
+    post_save.connect(_schedule_invalidate, sender=model)
+    post_delete.connect(_schedule_invalidate, sender=model)
@@ -0,0 +1,96 @@
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.http.request import RawPostDataException
+from rest_framework import status
+from rest_framework.response import Response
+
+from .renderers import FastJSONRenderer
+
+
+# ===============================================
+# IDEMPOTENCY KEYS
+# ===============================================
+# Clients that retry a create on timeout send the same `Idempotency-Key`
+# header each time. The first request runs normally and its response is kept
+# (status + rendered JSON) for IDEMPOTENCY['TTL'] seconds; replays get that
+# response back without touching the serializer or the database. A short
+# lock taken with cache.add() makes concurrent duplicates wait their turn
+# instead of writing twice. Keys are scoped per user and endpoint. That lock
+# only holds across workers when they share the cache, which the deployment
+# check accounts.E002 (accounts/checks.py) enforces.
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+MAX_KEY_LENGTH = 255
+
+
+def _config():
+    config = {'CACHE': 'default', 'TTL': 24 * 3600, 'LOCK_TIMEOUT': 30}
+    config.update(getattr(settings, 'IDEMPOTENCY', {}))
+    return config
+
+
+def _fingerprint(request):
+    # Reusing a key with a different payload is a client bug, not a retry.
+    try:
+        body = request.body
+    except RawPostDataException:
+        # Something already consumed the stream; fall back to the parsed data.
+        body = FastJSONRenderer().render(request.data)
+    return hashlib.sha256(body).hexdigest()
+
+
+def _replay(stored):
+    fingerprint, status_code, body = stored
+    response = HttpResponse(body, status=status_code, content_type='application/json')
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(method):
+    """Decorates an APIView.post so it honours the Idempotency-Key header."""
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.META.get(HEADER)
+        if not key:
+            return method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        config = _config()
+        cache = caches[config['CACHE']]
+        user_part = request.user.pk if request.user.is_authenticated else 'anon'
+        digest = hashlib.sha256(f"{user_part}:{request.path}:{key}".encode()).hexdigest()
+        response_key, lock_key = f"idem:resp:{digest}", f"idem:lock:{digest}"
+        fingerprint = _fingerprint(request)
+
+        stored = cache.get(response_key)
+        if stored is None:
+            if not cache.add(lock_key, 1, config['LOCK_TIMEOUT']):
+                # Another request with this key is still running.
+                response = Response({"detail": "A request with this Idempotency-Key is already in progress."},
+                                    status=status.HTTP_409_CONFLICT)
+                response['Retry-After'] = '1'
+                return response
+            try:
+                # Re-check: the first request may have finished between get() and add().
+                stored = cache.get(response_key)
+                if stored is None:
+                    response = method(self, request, *args, **kwargs)
+                    # Server errors are not stored so the client can retry them.
+                    if response.status_code < 500:
+                        body = FastJSONRenderer().render(response.data)
+                        cache.set(response_key, (fingerprint, response.status_code, body), config['TTL'])
+                    return response
+            finally:
+                cache.delete(lock_key)
+
+        if stored[0] != fingerprint:
+            return Response({"detail": "Idempotency-Key was already used with a different request body."},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        return _replay(stored)
+    return wrapper
@@ -0,0 +1,218 @@
+import contextlib
+import csv
+import os
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+
+from . import counters
+from .models import UserProfile, PetProfile
+from .serializers import CustomerImportRowSerializer
+
+
+# ===============================================
+# BULK CUSTOMER & PET IMPORT (CSV)
+# ===============================================
+# Onboarding a branch means thousands of customers. The file is read as a
+# stream and handled a chunk at a time: rows are validated, the new accounts'
+# passwords are hashed in a process pool (hashing is deliberately slow and
+# dominates the cost), then User, UserProfile and PetProfile rows go in with
+# bulk_create, one transaction per chunk. A bad row is reported and skipped;
+# it never aborts the rest of the file.
+#
+# Columns: username, email, password, pet_name, pet_breed, birthdate, age,
+# allergies, notes. A customer with several pets repeats the username; only
+# the first row's account columns are used.
+
+REQUIRED_COLUMNS = ('username',)
+MAX_REPORTED_ERRORS = 1000
+
+
+class CustomerImportError(ValueError):
+    """The file as a whole can't be imported (e.g. missing header columns)."""
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.customers_created = 0
+        self.pets_created = 0
+        self.error_count = 0
+        self.errors = []  # First MAX_REPORTED_ERRORS of {"line": n, "errors": {...}}
+        self.started = time.monotonic()
+
+    def add_error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    @property
+    def seconds(self):
+        return time.monotonic() - self.started
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'customers_created': self.customers_created,
+            'pets_created': self.pets_created,
+            'error_count': self.error_count,
+            'errors': sorted(self.errors, key=lambda error: error['line']),
+            'seconds': round(self.seconds, 2),
+        }
+
+
+# --- Password hashing ---
+
+def _init_hash_worker(settings_module):
+    # Spawned/forkserver workers start without Django configured.
+    if settings_module:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+@contextlib.contextmanager
+def password_hasher(processes):
+    """Yields hash(passwords) -> list of encoded hashes, spread over `processes` workers."""
+    if processes <= 1:
+        yield lambda passwords: [make_password(password) for password in passwords]
+        return
+    from concurrent.futures import ProcessPoolExecutor  # Pulls in multiprocessing; only imports need it
+
+    settings_module = os.environ.get('DJANGO_SETTINGS_MODULE')
+    with ProcessPoolExecutor(processes, initializer=_init_hash_worker, initargs=(settings_module,)) as pool:
+        def hash_passwords(passwords):
+            chunksize = max(1, len(passwords) // (processes * 4))
+            return list(pool.map(make_password, passwords, chunksize=chunksize))
+        yield hash_passwords
+
+
+# --- Pipeline ---
+
+def _chunks(reader, size):
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _clean(raw):
+    """CSV cells as serializer input: trimmed (passwords excepted), a blank birthdate left out."""
+    data = {}
+    for name in CustomerImportRowSerializer._declared_fields:
+        value = raw.get(name) or ''
+        data[name] = value if name == 'password' else value.strip()
+    if not data['birthdate']:
+        del data['birthdate']
+    return data
+
+
+def _import_chunk(rows, owners, hash_passwords, created_by, branch, report):
+    """
+    Validates and writes one chunk. `owners` maps the usernames created so far
+    in this import to their user id, so later rows can add pets to them.
+    """
+    valid = []
+    for line, raw in rows:
+        serializer = CustomerImportRowSerializer(data=_clean(raw))
+        if serializer.is_valid():
+            valid.append((line, serializer.validated_data))
+        else:
+            report.add_error(line, serializer.errors)
+
+    candidates = {data['username'] for _, data in valid} - owners.keys()
+    taken = set(User.objects.filter(username__in=candidates).values_list('username', flat=True))
+
+    accounts = {}  # username -> validated row that creates the account
+    pets = []  # (line, username, validated row)
+    for line, data in valid:
+        username = data['username']
+        if username in taken:
+            report.add_error(line, {'username': ["A user with that username already exists."]})
+            continue
+        if username not in owners and username not in accounts:
+            if not data.get('password'):
+                report.add_error(line, {'password': ["Required for a new customer."]})
+                continue
+            accounts[username] = data
+        if data.get('pet_name'):
+            pets.append((line, username, data))
+
+    hashes = hash_passwords([data['password'] for data in accounts.values()])
+    pet_counts = Counter(username for _, username, _ in pets)
+
+    try:
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=username, email=data.get('email', ''), password=encoded)
+                for (username, data), encoded in zip(accounts.items(), hashes)
+            ])
+            if users and users[0].pk is None:
+                # Backends that can't return ids from a bulk insert
+                users = User.objects.filter(username__in=accounts.keys()).only('id', 'username')
+            created = {user.username: user.pk for user in users}
+            UserProfile.objects.bulk_create([
+                UserProfile(user_id=user_id, role='user', status='Active', pet_count=pet_counts[username])
+                for username, user_id in created.items()
+            ])
+            PetProfile.all_branches.bulk_create([
+                PetProfile(
+                    owner_id=created.get(username) or owners[username],
+                    pet_name=data['pet_name'],
+                    pet_breed=data['pet_breed'],
+                    age=data.get('age', ''),
+                    birthdate=data.get('birthdate'),
+                    allergies=data.get('allergies') or None,
+                    notes=data.get('notes') or None,
+                    created_by=created_by,
+                    branch=branch,
+                )
+                for _, username, data in pets
+            ])
+            # bulk_create skips the counter signals; new profiles were created with
+            # their pet_count, customers from earlier chunks are bumped here.
+            for username, count in pet_counts.items():
+                if username not in created:
+                    counters.adjust(UserProfile, 'user_id', owners[username], 'pet_count', count)
+    except IntegrityError as exc:
+        # Someone registered one of these usernames since the check above.
+        for line, _ in valid:
+            report.add_error(line, {'non_field_errors': [f"Chunk not imported: {exc}"]})
+        return
+
+    owners.update(created)
+    report.customers_created += len(created)
+    report.pets_created += len(pets)
+
+
+def import_customers(stream, created_by=None, branch=None, chunk_size=None, processes=None, progress=None):
+    """
+    Imports customers and pets from a text stream of CSV. `progress` is called
+    with the ImportReport after every chunk. Returns the final ImportReport.
+    """
+    options = getattr(settings, 'CUSTOMER_IMPORT', {})
+    chunk_size = chunk_size or options.get('CHUNK_SIZE', 500)
+    processes = processes or options.get('PROCESSES') or os.cpu_count() or 1
+
+    reader = csv.DictReader(stream)
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+    if missing:
+        raise CustomerImportError(f"Missing column(s): {', '.join(missing)}.")
+
+    report = ImportReport()
+    owners = {}
+    with password_hasher(processes) as hash_passwords:
+        for chunk in _chunks(reader, chunk_size):
+            report.rows += len(chunk)
+            _import_chunk(chunk, owners, hash_passwords, created_by, branch, report)
+            if progress:
+                progress(report)
+    return report
@@ -0,0 +1,154 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+
+from . import events, hot_objects
+from . import stock as ledger
+from .models import Product, Service, StockMovement
+
+
+# ===============================================
+# COALESCED STOCK / AVAILABILITY CHANGES
+# ===============================================
+# The dashboards buffer rapid clicks (availability toggles, stock +/-) and
+# send them here as one list. Changes to the same row are folded together
+# first, rows that end up with the same assignment share one
+# UPDATE ... WHERE id IN (...), and everything commits in a single short
+# transaction instead of one write-lock round per click.
+
+# model -> (event channel, availability field, whether it has stocks)
+TARGETS = {
+    Product: ('product', 'is_available', True),
+    Service: ('service', 'availability', False),
+}
+
+
+class ChangeError(ValueError):
+    pass
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)  # JSON true/false are ints in Python
+
+
+def coalesce(model, changes):
+    """
+    Folds a list of {"id", "stocks" | "stocks_delta" | <availability field> |
+    "toggle"} items into {id: (stock op, availability op)} where each op is
+    None, ('set', value), ('add', delta) or ('toggle',). Later items win;
+    a delta after an absolute stock value is added to it, two toggles cancel.
+    Stock levels may not be negative; deltas are checked against the stored
+    level by apply_changes().
+    """
+    _, available_field, has_stocks = TARGETS[model]
+    folded = {}
+    for change in changes:
+        if not isinstance(change, dict) or not _is_int(change.get('id')):
+            raise ChangeError("Every change needs an integer 'id'.")
+        stock, availability = folded.get(change['id'], (None, None))
+
+        if has_stocks and 'stocks' in change:
+            if not _is_int(change['stocks']) or change['stocks'] < 0:
+                raise ChangeError("'stocks' must be a non-negative integer.")
+            stock = ('set', change['stocks'])
+        if has_stocks and 'stocks_delta' in change:
+            delta = change['stocks_delta']
+            if not _is_int(delta):
+                raise ChangeError("'stocks_delta' must be an integer.")
+            stock = ('add', delta) if stock is None else (stock[0], stock[1] + delta)
+
+        if available_field in change:
+            if not isinstance(change[available_field], bool):
+                raise ChangeError(f"'{available_field}' must be true or false.")
+            availability = ('set', change[available_field])
+        if change.get('toggle'):
+            if availability is None:
+                availability = ('toggle',)
+            elif availability[0] == 'set':
+                availability = ('set', not availability[1])
+            else:
+                availability = None
+
+        if stock == ('add', 0):
+            stock = None
+        folded[change['id']] = (stock, availability)
+    return {pk: ops for pk, ops in folded.items() if ops != (None, None)}
+
+
+def _assignments(model, stock, availability):
+    _, available_field, _ = TARGETS[model]
+    values = {'version': F('version') + 1}
+    if stock:
+        values['stocks'] = stock[1] if stock[0] == 'set' else F('stocks') + stock[1]
+    if availability:
+        values[available_field] = availability[1] if availability[0] == 'set' else ~F(available_field)
+    return values
+
+
+def _record_movements(rows, stocks_before, user):
+    movements, changes = [], []
+    for row in rows:
+        before = stocks_before.get(row['id'])
+        if before is None or before == row['stocks']:
+            continue
+        movements.append(StockMovement(
+            product_id=row['id'], delta=row['stocks'] - before, stocks_after=row['stocks'], reason='adjustment',
+            created_by=user, branch=row['branch'],
+        ))
+        changes.append((row['id'], (before, row['reorder_point']), (row['stocks'], row['reorder_point'])))
+    ledger.record(movements, changes)
+
+
+def apply_changes(model, changes, queryset=None, user=None):
+    """
+    Applies coalesced changes in one transaction. `queryset` limits which
+    rows the caller may touch (defaults to the branch-scoped manager); stock
+    movements are recorded as made by `user`.
+    Returns {'updated': [{id, <changed fields>, version}], 'not_found': [ids]}.
+    """
+    channel, available_field, has_stocks = TARGETS[model]
+    folded = coalesce(model, changes)
+    queryset = model.objects.all() if queryset is None else queryset
+    columns = ['id', 'branch', 'version'] + (['stocks', 'reorder_point'] if has_stocks else []) + [available_field]
+
+    groups = {}
+    for pk, ops in folded.items():
+        groups.setdefault(ops, []).append(pk)
+
+    with transaction.atomic():
+        stocks_before = {}
+        stock_ids = [pk for pk, (stock, _) in folded.items() if stock]
+        if stock_ids:
+            # Levels before the change, for the ledger (row-locked where the database supports it)
+            stocks_before = dict(queryset.select_for_update().filter(id__in=stock_ids).values_list('id', 'stocks'))
+        for (stock, availability), ids in groups.items():
+            queryset.filter(id__in=ids).update(**_assignments(model, stock, availability))
+        rows = list(queryset.filter(id__in=folded).values(*columns))
+        short = [row['id'] for row in rows if has_stocks and row['stocks'] < 0]
+        if short:
+            # Raising rolls the UPDATEs back along with their on_commit events
+            raise ChangeError(f"Not enough stock for product(s) {', '.join(map(str, short))}.")
+
+        updated = []
+        for row in rows:
+            stock, availability = folded[row['id']]
+            item = {'id': row['id']}
+            if stock:
+                item['stocks'] = row['stocks']
+            if availability:
+                item[available_field] = row[available_field]
+            # .update() skips the post_save signals that feed the dashboards.
+            changes_for_event = {k: v for k, v in item.items() if k != 'id'}
+            item['version'] = row['version']
+            updated.append(item)
+            transaction.on_commit(partial(
+                events.publish, channel, 'updated', row['id'], changes_for_event, row['branch'],
+            ))
+        if rows:
+            transaction.on_commit(partial(hot_objects.invalidate, model))  # No post_save here either
+        if stocks_before:
+            _record_movements(rows, stocks_before, user)
+
+    found = {row['id'] for row in rows}
+    return {'updated': updated, 'not_found': [pk for pk in folded if pk not in found]}
@@ -0,0 +1,195 @@
+import contextvars
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+# ===============================================
+# BACKGROUND JOBS
+# ===============================================
+# A small database-backed job queue. Views enqueue slow or bulk side effects
+# with `some_task.delay(...)` and `manage.py run_worker` executes them outside
+# the request. Set JOBS_EAGER = True to run jobs inline (handy in tests).
+
+_current_job = contextvars.ContextVar('current_job', default=None)
+
+
+def job(queue='default', priority=0, max_attempts=3):
+    """Marks a module-level function as a job and gives it a .delay() helper."""
+    def decorator(func):
+        func.job_name = f"{func.__module__}.{func.__qualname__}"
+        func.job_options = {'queue': queue, 'priority': priority, 'max_attempts': max_attempts}
+
+        def delay(*args, **kwargs):
+            return enqueue(func, *args, **kwargs)
+
+        func.delay = delay
+        return func
+    return decorator
+
+
+def enqueue(func, *args, _priority=None, _delay=None, _queue=None, **kwargs):
+    """
+    Queues func(*args, **kwargs). Arguments must be JSON serializable, so pass
+    primary keys rather than model instances. Returns the Job row, or None
+    when JOBS_EAGER ran it inline.
+    """
+    if getattr(settings, 'JOBS_EAGER', False):
+        func(*args, **kwargs)
+        return None
+    options = func.job_options
+    return Job.objects.create(
+        queue=_queue or options['queue'],
+        name=func.job_name,
+        payload={'args': list(args), 'kwargs': kwargs},
+        priority=options['priority'] if _priority is None else _priority,
+        max_attempts=options['max_attempts'],
+        run_at=timezone.now() + (_delay or timedelta(0)),
+    )
+
+
+def claim_next(queues):
+    """Atomically takes the highest-priority due job, or returns None."""
+    now = timezone.now()
+    candidates = (
+        Job.objects.filter(queue__in=queues, status='queued', run_at__lte=now)
+        .order_by('-priority', 'run_at', 'id')
+        .values_list('id', flat=True)[:5]
+    )
+    for job_id in candidates:
+        # The conditional UPDATE is the lock: only one worker can flip the row.
+        claimed = Job.objects.filter(id=job_id, status='queued').update(
+            status='running', started_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+def retry_delay(attempts):
+    """Exponential backoff: 10s, 20s, 40s, ... capped at one hour."""
+    return timedelta(seconds=min(10 * 2 ** (attempts - 1), 3600))
+
+
+def set_progress(progress):
+    """Stores `progress` (JSON) on the running job's row; a no-op when run inline."""
+    job_id = _current_job.get()
+    if job_id is not None:
+        Job.objects.filter(id=job_id).update(progress=progress)
+
+
+def run_job(job_row):
+    token = _current_job.set(job_row.id)
+    try:
+        func = import_string(job_row.name)
+        if not hasattr(func, 'job_options'):
+            raise ValueError(f"{job_row.name} is not registered with @job")
+        func(*job_row.payload.get('args', []), **job_row.payload.get('kwargs', {}))
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Job %s (%s) failed on attempt %s", job_row.id, job_row.name, job_row.attempts)
+        if job_row.attempts >= job_row.max_attempts:
+            Job.objects.filter(id=job_row.id).update(
+                status='failed', finished_at=timezone.now(), last_error=error,
+            )
+        else:
+            Job.objects.filter(id=job_row.id).update(
+                status='queued', run_at=timezone.now() + retry_delay(job_row.attempts), last_error=error,
+            )
+        return False
+    finally:
+        _current_job.reset(token)
+    Job.objects.filter(id=job_row.id).update(status='done', finished_at=timezone.now())
+    return True
+
+
+def requeue_stale(timeout=timedelta(minutes=30)):
+    """Puts back jobs whose worker died mid-run, or fails them once out of attempts."""
+    stale = Job.objects.filter(status='running', started_at__lt=timezone.now() - timeout)
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', finished_at=timezone.now(), last_error='Worker stopped while running the job.',
+    )
+    return stale.update(status='queued')
+
+
+def housekeeping():
+    """Requeues stale jobs and keeps one prune_finished_jobs run scheduled a day out."""
+    requeue_stale()
+    pending = Job.objects.filter(name=prune_finished_jobs.job_name, status__in=['queued', 'running'])
+    if not pending.exists():
+        prune_finished_jobs.delay(_delay=timedelta(days=1))
+
+
+def work(queues=('default',), burst=False, poll_interval=1.0, max_jobs=None):
+    """
+    Worker loop. With burst=True it returns once the queues are empty.
+    housekeeping() runs on start and every JOBS_HOUSEKEEPING_INTERVAL seconds.
+    """
+    processed = 0
+    interval = getattr(settings, 'JOBS_HOUSEKEEPING_INTERVAL', 300)
+    next_housekeeping = 0
+    while max_jobs is None or processed < max_jobs:
+        close_old_connections()
+        if time.monotonic() >= next_housekeeping:
+            housekeeping()
+            next_housekeeping = time.monotonic() + interval
+        job_row = claim_next(queues)
+        if job_row is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job_row)
+        processed += 1
+    return processed
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def queue_stats(sample=1000):
+    """Depth per queue/status plus wait and run time percentiles in seconds."""
+    depth = {}
+    for row in Job.objects.values('queue', 'status').annotate(count=Count('id')):
+        depth.setdefault(row['queue'], {})[row['status']] = row['count']
+
+    recent = Job.objects.filter(status='done').order_by('-finished_at').values_list(
+        'run_at', 'started_at', 'finished_at',
+    )[:sample]
+    waits = [(started - run_at).total_seconds() for run_at, started, _ in recent]
+    runs = [(finished - started).total_seconds() for _, started, finished in recent]
+    oldest = Job.objects.filter(status='queued', run_at__lte=timezone.now()).order_by('run_at').values_list(
+        'run_at', flat=True,
+    ).first()
+    return {
+        'depth': depth,
+        'oldest_due_age': (timezone.now() - oldest).total_seconds() if oldest else 0,
+        'wait_p50': _percentile(waits, 0.5),
+        'wait_p95': _percentile(waits, 0.95),
+        'run_p50': _percentile(runs, 0.5),
+        'run_p95': _percentile(runs, 0.95),
+        'sampled': len(waits),
+    }
+
+
+@job(queue='maintenance', priority=-10)
+def prune_finished_jobs(days=7):
+    """Deletes finished job rows older than `days` to keep the claim index small."""
+    cutoff = timezone.now() - timedelta(days=days)
+    with transaction.atomic():
+        Job.objects.filter(status__in=['done', 'failed'], finished_at__lt=cutoff).delete()
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ("Replays the list endpoints' queries, flags full table scans and unindexed sorts in their plans "
+            "and proposes indexes. --check fails when a plan is worse than accounts/query_plans.json.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Exit with an error if any endpoint has a scan or sort missing from the baseline.')
+        parser.add_argument('--write-baseline', action='store_true',
+                            help='Accept the current plans as the new baseline.')
+        parser.add_argument('--sql', action='store_true', help='Print the offending SQL for each finding.')
+
+    def handle(self, *args, **options):
+        from accounts import query_plans
+
+        findings = query_plans.check_plans(query_plans.capture_queries())
+        baseline = query_plans.load_baseline()
+
+        for name, problems in findings.items():
+            label = ', '.join(sorted(problems)) if problems else self.style.SUCCESS('indexed')
+            self.stdout.write(f"{name:<30} {label}")
+            if options['sql']:
+                for problem, (sql, params) in sorted(problems.items()):
+                    self.stdout.write(f"    {problem}: {sql} {list(params or ())}")
+
+        proposals = query_plans.advise(findings)
+        if proposals:
+            self.stdout.write("\nProposed indexes (add to Meta.indexes, then `manage.py makemigrations accounts`):")
+            for model, field_lists in proposals.items():
+                self.stdout.write(f"  {model.__name__}:")
+                for fields in field_lists:
+                    name = query_plans.index_name(model, fields)
+                    self.stdout.write(f"    models.Index(fields={fields!r}, name={name!r}),")
+
+        if options['write_baseline']:
+            query_plans.write_baseline(findings)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {query_plans.BASELINE_PATH.name}."))
+            return
+
+        if options['check']:
+            regressed = query_plans.regressions(findings, baseline)
+            if regressed:
+                lines = [f"{name}: {', '.join(problems)}" for name, problems in regressed.items()]
+                raise CommandError("Query plans regressed:\n  " + "\n  ".join(lines))
+            self.stdout.write(self.style.SUCCESS("No query plan regressions."))
@@ -0,0 +1,30 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Prints job queue depth and wait/run latency percentiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sample', type=int, default=1000, help='Number of recent jobs to sample.')
+        parser.add_argument('--json', action='store_true', help='Emit machine-readable JSON.')
+
+    def handle(self, *args, **options):
+        from accounts.jobs import queue_stats
+
+        stats = queue_stats(sample=options['sample'])
+        if options['json']:
+            self.stdout.write(json.dumps(stats))
+            return
+
+        for queue, counts in sorted(stats['depth'].items()):
+            summary = ', '.join(f"{status}={count}" for status, count in sorted(counts.items()))
+            self.stdout.write(f"{queue:<15} {summary}")
+        self.stdout.write(f"Oldest due job waiting: {stats['oldest_due_age']:.1f}s")
+        for label, key in (('Queue wait', 'wait'), ('Run time', 'run')):
+            p50, p95 = stats[f'{key}_p50'], stats[f'{key}_p95']
+            if p50 is None:
+                self.stdout.write(f"{label}: no finished jobs yet")
+            else:
+                self.stdout.write(f"{label}: p50 {p50:.3f}s, p95 {p95:.3f}s (last {stats['sampled']} jobs)")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Recomputes the denormalized counter columns and the feedback summary from the source tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows have drifted.')
+
+    def handle(self, *args, **options):
+        from accounts.counters import reconcile
+
+        drift = reconcile(dry_run=options['dry_run'])
+        for label, rows in drift.items():
+            self.stdout.write(f"{label:<30} {rows} drifted")
+        verb = "would be repaired" if options['dry_run'] else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"{sum(drift.values())} row(s) {verb}."))
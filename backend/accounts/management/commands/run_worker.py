@@ -0,0 +1,52 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+
+
+def _worker_process(queues, burst, poll_interval):
+    # Spawned children (Windows/macOS) start without Django configured.
+    import django
+    django.setup()
+    from accounts.jobs import work
+    work(queues, burst=burst, poll_interval=poll_interval)
+
+
+class Command(BaseCommand):
+    help = "Runs background job workers for the database-backed job queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queues', default='default,maintenance,alerts,imports',
+                            help='Comma-separated queue names, in no particular order (priority decides).')
+        parser.add_argument('--processes', type=int, default=1, help='Number of worker processes.')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queues are empty.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when idle.')
+
+    def handle(self, *args, **options):
+        from django.db import connections
+        from accounts.jobs import work
+
+        queues = [q.strip() for q in options['queues'].split(',') if q.strip()]
+        processes = max(1, options['processes'])
+        self.stdout.write(f"Starting {processes} worker(s) on queues: {', '.join(queues)}")
+
+        if processes == 1:
+            processed = work(queues, burst=options['burst'], poll_interval=options['poll_interval'])
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} job(s)."))
+            return
+
+        # Children must open their own database connections.
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(
+                target=_worker_process, args=(queues, options['burst'], options['poll_interval']),
+            )
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
@@ -0,0 +1,88 @@
+import gzip
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+# ===============================================
+# RESPONSE COMPRESSION
+# ===============================================
+DEFAULT_COMPRESSION = {
+    'MIN_SIZE': 1024,      # Bytes; smaller bodies are sent as-is
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 4,   # Low qualities are much cheaper and still beat gzip on JSON
+}
+
+
+def _accepted_encodings(header):
+    """Parses Accept-Encoding into {coding: q}, dropping q=0 entries."""
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted[coding] = q
+    return accepted
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses buffered responses with brotli (when installed) or gzip,
+    negotiated through Accept-Encoding, once they exceed a size threshold.
+    Streaming responses such as the server-sent events feed pass through.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.options = {**DEFAULT_COMPRESSION, **getattr(settings, 'RESPONSE_COMPRESSION', {})}
+
+    def choose_encoding(self, request):
+        accepted = _accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        wildcard = accepted.get('*', 0)
+        candidates = [('br', accepted.get('br', wildcard))] if brotli is not None else []
+        candidates.append(('gzip', accepted.get('gzip', wildcard)))
+        best, q = max(candidates, key=lambda item: item[1])
+        return best if q > 0 else None
+
+    def compress(self, encoding, content):
+        if encoding == 'br':
+            return brotli.compress(content, quality=self.options['BROTLI_QUALITY'])
+        return gzip.compress(content, compresslevel=self.options['GZIP_LEVEL'], mtime=0)
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < self.options['MIN_SIZE']:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed = self.compress(encoding, response.content)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        # A strong ETag no longer matches the encoded bytes (RFC 9110 8.8.1).
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
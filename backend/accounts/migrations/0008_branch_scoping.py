@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_appointment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='branch',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='branch',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='petprofile',
+            name='branch',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='branch',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='branch',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+    ]
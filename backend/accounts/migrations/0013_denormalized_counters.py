@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    def count_of(model_name, fk, key='pk'):
+        model = apps.get_model('accounts', model_name)
+        return Coalesce(Subquery(
+            model._base_manager.filter(**{fk: OuterRef(key)}).order_by().values(fk)
+            .annotate(n=Count('pk')).values('n')
+        ), 0)
+
+    apps.get_model('accounts', 'Service')._base_manager.update(
+        order_count=count_of('Order', 'service_id'),
+        booking_count=count_of('Appointment', 'service_id'),
+    )
+    apps.get_model('accounts', 'UserProfile')._base_manager.update(
+        order_count=count_of('Order', 'user_id', 'user_id'),
+        appointment_count=count_of('Appointment', 'user_id', 'user_id'),
+        pet_count=count_of('PetProfile', 'created_by_id', 'user_id'),
+    )
+    totals = apps.get_model('accounts', 'Feedback')._base_manager.aggregate(
+        n=Count('pk'), ratings=Coalesce(Sum('rating'), 0))
+    apps.get_model('accounts', 'FeedbackSummary').objects.create(
+        pk=1, feedback_count=totals['n'], rating_total=totals['ratings'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_userprofile_role_branch_status_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feedback_count', models.PositiveIntegerField(default=0)),
+                ('rating_total', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='booking_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='order_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='appointment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='order_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='pet_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
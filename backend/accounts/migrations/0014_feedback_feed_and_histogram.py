@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:07
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_histogram(apps, schema_editor):
+    Feedback = apps.get_model('accounts', 'Feedback')
+    counts = Feedback._base_manager.aggregate(**{
+        f'rating_{n}': Count('pk', filter=Q(rating=n)) for n in range(1, 6)
+    })
+    apps.get_model('accounts', 'FeedbackSummary').objects.filter(pk=1).update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_denormalized_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedbacksummary',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='feedbacksummary',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='feedbacksummary',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='feedbacksummary',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='feedbacksummary',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-submitted_at', '-id'], name='feedback_feed_idx'),
+        ),
+        migrations.RunPython(backfill_histogram, migrations.RunPython.noop),
+    ]
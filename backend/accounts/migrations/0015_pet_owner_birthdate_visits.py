@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_owners(apps, schema_editor):
+    # Pets registered by a customer belong to them; staff-created ones stay unassigned.
+    PetProfile = apps.get_model('accounts', 'PetProfile')
+    PetProfile._base_manager.filter(owner__isnull=True, created_by__is_staff=False).update(owner=F('created_by'))
+    # pet_count now follows the owner (see accounts.counters).
+    apps.get_model('accounts', 'UserProfile')._base_manager.update(pet_count=Coalesce(Subquery(
+        PetProfile._base_manager.filter(owner_id=OuterRef('user_id')).order_by().values('owner_id')
+        .annotate(n=Count('pk')).values('n')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_feedback_feed_and_histogram'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PetVisit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('branch', models.CharField(blank=True, db_index=True, max_length=100, null=True)),
+                ('kind', models.CharField(choices=[('checkup', 'Checkup'), ('grooming', 'Grooming'), ('vaccination', 'Vaccination'), ('treatment', 'Treatment'), ('note', 'Note')], default='checkup', max_length=20)),
+                ('visited_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('weight_kg', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='petprofile',
+            name='birthdate',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='petprofile',
+            name='owner',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pets', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='petprofile',
+            name='age',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='petprofile',
+            index=models.Index(fields=['owner', '-created_at'], name='pet_owner_idx'),
+        ),
+        migrations.AddField(
+            model_name='petvisit',
+            name='appointment',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pet_visits', to='accounts.appointment'),
+        ),
+        migrations.AddField(
+            model_name='petvisit',
+            name='pet',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visits', to='accounts.petprofile'),
+        ),
+        migrations.AddField(
+            model_name='petvisit',
+            name='recorded_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='petvisit',
+            index=models.Index(fields=['pet', '-visited_at', '-id'], name='petvisit_timeline_idx'),
+        ),
+        migrations.RunPython(backfill_owners, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:42
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def opening_balances(apps, schema_editor):
+    # Start each product's ledger at its current stock so the movements add up to `stocks`.
+    Product = apps.get_model('accounts', 'Product')
+    StockMovement = apps.get_model('accounts', 'StockMovement')
+    StockMovement._base_manager.bulk_create(
+        (StockMovement(product_id=pk, delta=stocks, stocks_after=stocks, reason='initial', created_by_id=creator,
+                       branch=branch)
+         for pk, stocks, creator, branch in Product._base_manager.exclude(stocks=0)
+         .values_list('pk', 'stocks', 'created_by_id', 'branch').iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_row_versions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='reorder_point',
+            field=models.PositiveIntegerField(default=5),
+        ),
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('branch', models.CharField(blank=True, db_index=True, max_length=100, null=True)),
+                ('delta', models.IntegerField()),
+                ('stocks_after', models.IntegerField()),
+                ('reason', models.CharField(choices=[('initial', 'Initial stock'), ('edit', 'Product edit'), ('adjustment', 'Inventory adjustment')], default='adjustment', max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='accounts.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', '-created_at', '-id'], name='stockmove_product_time_idx')],
+            },
+        ),
+        migrations.RunPython(opening_balances, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from .branching import BranchScopedModel
+from .concurrency import VersionedModel
 
 # Define custom role choices for fine-grained staff control (Updated from ROLE_CHOICES)
 STAFF_ROLE_CHOICES = (
@@ -16,12 +20,25 @@ STATUS_CHOICES = (
 )
 
 # User Profile Model (Existing)
-class UserProfile(models.Model):
+class UserProfile(VersionedModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     role = models.CharField(max_length=10, choices=STAFF_ROLE_CHOICES, default='user') 
     status = models.CharField(max_length=10, default='Active')  # Active or Blocked
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
     branch = models.CharField(max_length=100, blank=True, null=True) 
+    # Set when staff delete the account; the row is a tombstone until the
+    # background purger (accounts.tasks.purge_user) removes the user's data.
+    deleted_at = models.DateTimeField(blank=True, null=True)
+    # Maintained by accounts.counters; repair with `manage.py reconcile_counters`.
+    pet_count = models.PositiveIntegerField(default=0)
+    order_count = models.PositiveIntegerField(default=0)
+    appointment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Staff list filters (?role=&branch=&status=)
+            models.Index(fields=['role', 'branch', 'status'], name='profile_role_branch_status_idx'),
+        ]
 
     def __str__(self):
         return self.user.username
@@ -33,6 +50,12 @@ class LoginActivity(models.Model):
     login_time = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=10, default="Active") 
 
+    class Meta:
+        indexes = [
+            # Staff login activity log, newest first
+            models.Index(fields=['-login_time'], name='loginactivity_time_idx'),
+        ]
+
     def role(self):
         profile = getattr(self.user, 'userprofile', None)
         return profile.role if profile else "user" 
@@ -52,7 +75,7 @@ class LoginLog(models.Model):
 
 
 # Service model (Existing)
-class Service(models.Model):
+class Service(BranchScopedModel, VersionedModel):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     included = models.TextField(blank=True, null=True) 
@@ -61,23 +84,43 @@ class Service(models.Model):
     availability = models.BooleanField(default=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Maintained by accounts.counters
+    order_count = models.PositiveIntegerField(default=0)
+    booking_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Service list, newest first: everything (head office) or one branch
+            models.Index(fields=['-created_at'], name='service_created_idx'),
+            models.Index(fields=['branch', '-created_at'], name='service_branch_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 # Order model (Existing)
-class Order(models.Model):
+class Order(BranchScopedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     service = models.ForeignKey(Service, on_delete=models.CASCADE)
     order_date = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='Pending')
     total_cost = models.DecimalField(max_digits=10, decimal_places=2)
 
+    branch_source = 'service'
+
+    class Meta:
+        indexes = [
+            # Order list, newest first: staff, one branch, one customer
+            models.Index(fields=['-order_date'], name='order_date_idx'),
+            models.Index(fields=['branch', '-order_date'], name='order_branch_date_idx'),
+            models.Index(fields=['user', '-order_date'], name='order_user_date_idx'),
+        ]
+
     def __str__(self):
         return f"Order {self.id} by {self.user.username} - {self.service.name}"
 
 # Product Model (Existing)
-class Product(models.Model):
+class Product(BranchScopedModel, VersionedModel):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     category = models.CharField(max_length=100, default='Food') 
@@ -85,41 +128,192 @@ class Product(models.Model):
     stocks = models.IntegerField(default=0)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     is_available = models.BooleanField(default=True)
+    # Stock level at or below which staff are alerted (accounts/stock.py); 0 = only when it runs out
+    reorder_point = models.PositiveIntegerField(default=5)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Product list and inventory, newest first
+            models.Index(fields=['-created_at'], name='product_created_idx'),
+            models.Index(fields=['branch', '-created_at'], name='product_branch_created_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
+
+STOCK_MOVEMENT_REASON_CHOICES = (
+    ('initial', 'Initial stock'),
+    ('edit', 'Product edit'),
+    ('adjustment', 'Inventory adjustment'),
+)
+
+class StockMovement(BranchScopedModel):
+    """One change to a product's stocks. Written by accounts/stock.py only."""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='stock_movements')
+    delta = models.IntegerField()
+    stocks_after = models.IntegerField()
+    reason = models.CharField(max_length=20, choices=STOCK_MOVEMENT_REASON_CHOICES, default='adjustment')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    branch_source = 'product'
+
+    class Meta:
+        indexes = [
+            # One product's ledger, newest first (keyset pagination)
+            models.Index(fields=['product', '-created_at', '-id'], name='stockmove_product_time_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Stock movements are append-only; record a new movement instead.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.delta:+d} {self.product} ({self.get_reason_display()})"
+
 # Pet Profile Model (Existing)
-class PetProfile(models.Model):
+class PetProfile(BranchScopedModel):
     pet_name = models.CharField(max_length=100)
     pet_breed = models.CharField(max_length=100)
-    age = models.CharField(max_length=50) # Stored as "6 Months" or "2 Years"
+    age = models.CharField(max_length=50, blank=True) # Stored as "6 Months" or "2 Years"; superseded by birthdate
+    birthdate = models.DateField(blank=True, null=True)
     allergies = models.TextField(blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
     pet_picture = models.ImageField(upload_to='pet_pics/', blank=True, null=True)
+    # The customer the pet belongs to (created_by is the staff member who registered it)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='pets')
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # "My pets" list, newest first
+            models.Index(fields=['owner', '-created_at'], name='pet_owner_idx'),
+            # Staff pet list: everything or one branch
+            models.Index(fields=['-created_at'], name='pet_created_idx'),
+            models.Index(fields=['branch', '-created_at'], name='pet_branch_created_idx'),
+        ]
+
+    def age_on(self, day=None):
+        """Age as "6 Months" / "2 Years" from the birthdate, else the stored text."""
+        if self.birthdate is None:
+            return self.age
+        day = day or timezone.localdate()
+        months = (day.year - self.birthdate.year) * 12 + day.month - self.birthdate.month
+        if day.day < self.birthdate.day:
+            months -= 1
+        months = max(months, 0)
+        if months < 12:
+            return f"{months} Month{'s' if months != 1 else ''}"
+        years = months // 12
+        return f"{years} Year{'s' if years != 1 else ''}"
+
     def __str__(self):
         return f"{self.pet_name} ({self.pet_breed})"
 
+
+# Append-only medical history: one row per visit, optionally tied to the
+# appointment it happened in. Corrections are new rows, never edits.
+PET_VISIT_KIND_CHOICES = (
+    ('checkup', 'Checkup'),
+    ('grooming', 'Grooming'),
+    ('vaccination', 'Vaccination'),
+    ('treatment', 'Treatment'),
+    ('note', 'Note'),
+)
+
+class PetVisit(BranchScopedModel):
+    pet = models.ForeignKey(PetProfile, on_delete=models.CASCADE, related_name='visits')
+    appointment = models.ForeignKey('Appointment', on_delete=models.SET_NULL, null=True, blank=True,
+                                    related_name='pet_visits')
+    kind = models.CharField(max_length=20, choices=PET_VISIT_KIND_CHOICES, default='checkup')
+    visited_at = models.DateTimeField(default=timezone.now)
+    weight_kg = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
+    notes = models.TextField(blank=True)
+    recorded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    branch_source = 'pet'
+
+    class Meta:
+        indexes = [
+            # One pet's timeline, newest first (keyset pagination)
+            models.Index(fields=['pet', '-visited_at', '-id'], name='petvisit_timeline_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Pet visits are append-only; record a new visit instead.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.pet} on {self.visited_at:%Y-%m-%d}"
+
 # Feedback Model (Existing)
 class Feedback(models.Model):
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     rating = models.IntegerField() # Expects 1-5 star rating
     feedback_text = models.TextField()
     submitted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the public gallery (newest first)
+            models.Index(fields=['-submitted_at', '-id'], name='feedback_feed_idx'),
+        ]
     
     def __str__(self):
         return f"Feedback by {self.user.username if self.user else 'Anonymous'} - {self.rating} stars"
 
+# Single-row running totals over Feedback, maintained by accounts.counters
+class FeedbackSummary(models.Model):
+    feedback_count = models.PositiveIntegerField(default=0)
+    rating_total = models.PositiveIntegerField(default=0)
+    # Histogram of star ratings
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    SINGLETON_ID = 1
+    HISTOGRAM_FIELDS = {n: f'rating_{n}' for n in range(1, 6)}
+
+    @classmethod
+    def load(cls):
+        return cls.objects.get_or_create(pk=cls.SINGLETON_ID)[0]
+
+    @classmethod
+    def compute(cls):
+        """The column values recomputed from the Feedback table (one aggregate query)."""
+        aggregates = {'feedback_count': models.Count('pk'), 'rating_total': models.Sum('rating', default=0)}
+        for rating, field in cls.HISTOGRAM_FIELDS.items():
+            aggregates[field] = models.Count('pk', filter=models.Q(rating=rating))
+        return Feedback.objects.aggregate(**aggregates)
+
+    def as_dict(self):
+        return {
+            'count': self.feedback_count,
+            'average_rating': self.average_rating,
+            'histogram': {str(n): getattr(self, field) for n, field in self.HISTOGRAM_FIELDS.items()},
+        }
+
+    @property
+    def average_rating(self):
+        return round(self.rating_total / self.feedback_count, 2) if self.feedback_count else None
+
+    def __str__(self):
+        return f"{self.feedback_count} feedback, average {self.average_rating}"
+
 # ===============================================
 # ✅ NEW: APPOINTMENT MODEL
 # ===============================================
 
-class Appointment(models.Model):
+class Appointment(BranchScopedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     service = models.ForeignKey(Service, on_delete=models.CASCADE)
     # Storing date as a CharField to easily match the frontend 'YYYY-MM-DD' string
@@ -127,5 +321,65 @@ class Appointment(models.Model):
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='Confirmed')
     booked_at = models.DateTimeField(auto_now_add=True)
 
+    branch_source = 'service'
+
+    class Meta:
+        indexes = [
+            # Booking calendar: confirmed appointments by date, optionally for one branch
+            models.Index(fields=['status', 'appointment_date'], name='appointment_calendar_idx'),
+            models.Index(fields=['branch', 'status', 'appointment_date'], name='appointment_branch_cal_idx'),
+        ]
+
     def __str__(self):
         return f"{self.service.name} for {self.user.username} on {self.appointment_date}"
+
+
+# ===============================================
+# STATUS TRANSITION AUDIT
+# ===============================================
+# One row per bulk status change (accounts/transitions.py), not per object.
+class StatusChangeLog(models.Model):
+    model = models.CharField(max_length=20)  # 'order' or 'appointment'
+    to_status = models.CharField(max_length=50, choices=STATUS_CHOICES)
+    object_ids = models.JSONField(default=list)  # Rows that actually changed
+    from_counts = models.JSONField(default=dict)  # {"Confirmed": 120, "Pending": 3}
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    changed_at = models.DateTimeField(auto_now_add=True)
+    reason = models.CharField(max_length=255, blank=True)
+
+    def __str__(self):
+        return f"{len(self.object_ids)} {self.model}(s) -> {self.to_status}"
+
+
+# ===============================================
+# BACKGROUND JOB QUEUE
+# ===============================================
+JOB_STATUS_CHOICES = (
+    ('queued', 'Queued'),
+    ('running', 'Running'),
+    ('done', 'Done'),
+    ('failed', 'Failed'),
+)
+
+class Job(models.Model):
+    queue = models.CharField(max_length=50, default='default')
+    name = models.CharField(max_length=200)  # Dotted path of a function decorated with @job
+    payload = models.JSONField(default=dict)  # {"args": [...], "kwargs": {...}}
+    priority = models.SmallIntegerField(default=0)  # Higher runs first
+    status = models.CharField(max_length=10, choices=JOB_STATUS_CHOICES, default='queued')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)  # Not picked up before this time (retry backoff)
+    enqueued_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    progress = models.JSONField(default=dict, blank=True)  # Written by the job itself (jobs.set_progress)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['queue', 'status', '-priority', 'run_at'], name='job_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}]"
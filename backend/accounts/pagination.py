@@ -0,0 +1,47 @@
+import base64
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+# ===============================================
+# KEYSET (CURSOR) PAGINATION
+# ===============================================
+# Newest-first feeds ordered by (timestamp, id). The cursor is the position
+# of the last row served, so each page is an index range scan no matter how
+# deep the client scrolls, unlike OFFSET.
+
+def encode_cursor(timestamp, pk):
+    raw = f"{timestamp}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Returns (timestamp, id); raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        timestamp, pk = raw.rsplit('|', 1)
+        moment = parse_datetime(timestamp)
+        pk = int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor.")
+    if moment is None:
+        raise ValueError("Invalid cursor.")
+    return moment, pk
+
+
+def keyset_page(queryset, serializer, time_field, cursor=None, limit=20):
+    """
+    Serializes one page of `queryset` newest first with a ValuesSerializer
+    (which must include `time_field` and 'id'). Returns {'results', 'next'}.
+    """
+    queryset = queryset.order_by(f'-{time_field}', '-id')
+    if cursor:
+        moment, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(**{f'{time_field}__lt': moment}) | Q(**{time_field: moment, 'id__lt': pk}))
+    # One extra row tells us whether there is a next page.
+    rows = serializer.serialize(queryset[:limit + 1])
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        return {'results': rows[:limit], 'next': encode_cursor(last[time_field], last['id'])}
+    return {'results': rows, 'next': None}
@@ -0,0 +1,40 @@
+import codecs
+import io
+import re
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    orjson = None
+
+# orjson turns integers outside 64 bits into floats instead of failing, so
+# bodies with a 19+ digit run (even inside a string) take the stock path.
+_WIDE_NUMBER = re.compile(rb'\d{19}')
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser that decodes UTF-8 bodies with orjson when it is installed.
+    Other charsets, anything orjson rejects and integers wider than 64 bits
+    go through the stock parser so behaviour and errors match.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            is_utf8 = codecs.lookup(encoding).name == 'utf-8'
+        except LookupError:
+            is_utf8 = False
+        if orjson is None or not is_utf8 or stream is None:
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if _WIDE_NUMBER.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,311 @@
+import json
+import re
+from pathlib import Path
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+# ===============================================
+# QUERY PLAN GUARD & INDEX ADVISOR
+# ===============================================
+# Replays the GET endpoints below through the test client, records every
+# SELECT they issue and asks the database for its plan (SQLite `EXPLAIN
+# QUERY PLAN`, Postgres `EXPLAIN`). Full table scans and sorts that can't use
+# an index are reported, an index is proposed from the columns the query
+# filters and orders on, and `manage.py explain_queries --check` compares the
+# findings against the committed baseline so a plan regression fails CI.
+
+BASELINE_PATH = Path(__file__).with_name('query_plans.json')
+BRANCH = 'Plan Check Branch'
+
+# (name, who calls it, path). {pet} is filled in from the fixture.
+ENDPOINTS = [
+    ('login activity', 'admin', '/api/accounts/logs/'),
+    ('services', 'admin', '/api/accounts/services/'),
+    ('services (branch)', 'manager', '/api/accounts/services/'),
+    ('products', 'admin', '/api/accounts/products/'),
+    ('products (branch)', 'manager', '/api/accounts/products/'),
+    ('inventory', 'admin', '/api/accounts/inventory/'),
+    ('stock movements', 'admin', '/api/accounts/products/{product}/movements/'),
+    ('orders (staff)', 'admin', '/api/accounts/orders/'),
+    ('orders (branch)', 'manager', '/api/accounts/orders/'),
+    ('orders (customer)', 'customer', '/api/accounts/orders/'),
+    ('staff list', 'admin', '/api/accounts/users/staff/?role=admin,manager&status=Active'),
+    ('pets (staff)', 'admin', '/api/accounts/pets/'),
+    ('pets (branch)', 'manager', '/api/accounts/pets/'),
+    ('pets (customer)', 'customer', '/api/accounts/pets/'),
+    ('pet visits', 'customer', '/api/accounts/pets/{pet}/visits/'),
+    ('feedback gallery', 'anonymous', '/api/accounts/feedback/gallery/'),
+    ('feedback summary', 'anonymous', '/api/accounts/feedback/summary/'),
+    ('booked appointments', 'customer', '/api/accounts/appointments/booked/'),
+    ('booked appointments (branch)', 'manager', '/api/accounts/appointments/booked/'),
+]
+
+
+def _fixture():
+    """One row of everything the endpoints read, created inside the rolled-back transaction."""
+    from decimal import Decimal
+    from .models import (
+        UserProfile, LoginActivity, Service, Product, Order, PetProfile, PetVisit, Feedback, Appointment,
+    )
+
+    def user(username, role, is_staff=False, branch=None):
+        account = User.objects.create_user(username=username, password=None, is_staff=is_staff)
+        UserProfile.objects.create(user=account, role=role, branch=branch)
+        return account
+
+    users = {
+        'admin': user('plan_check_admin', 'admin', is_staff=True),
+        'manager': user('plan_check_manager', 'manager', is_staff=True, branch=BRANCH),
+        'customer': user('plan_check_customer', 'user'),
+    }
+    customer = users['customer']
+    LoginActivity.objects.create(user=customer)
+    service = Service.all_branches.create(name='Plan check', duration='1 hour', cost=Decimal('1.00'), branch=BRANCH)
+    product = Product.all_branches.create(name='Plan check', price=Decimal('1.00'), stocks=1, branch=BRANCH)
+    Order.all_branches.create(user=customer, service=service, total_cost=Decimal('1.00'))
+    Appointment.all_branches.create(user=customer, service=service, appointment_date='2030-01-01')
+    pet = PetProfile.all_branches.create(pet_name='Plan', pet_breed='Check', owner=customer, branch=BRANCH)
+    PetVisit.all_branches.create(pet=pet)
+    Feedback.objects.create(user=customer, rating=5, feedback_text='Plan check')
+    return users, {'pet': pet.pk, 'product': product.pk}
+
+
+class _Recorder:
+    """connection.execute_wrapper that keeps every SELECT with its parameters."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def capture_queries():
+    """Returns {endpoint name: [(sql, params), ...]} without leaving any rows behind."""
+    captured = {}
+    dummy_cache = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    with override_settings(ALLOWED_HOSTS=['testserver'], CACHES=dummy_cache), transaction.atomic():
+        users, ids = _fixture()
+        for name, actor, path in ENDPOINTS:
+            client = APIClient()
+            if actor != 'anonymous':
+                token = RefreshToken.for_user(users[actor]).access_token
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            recorder = _Recorder()
+            with connection.execute_wrapper(recorder):
+                response = client.get(path.format(**ids))
+            if response.status_code != 200:
+                raise RuntimeError(f"{name}: GET {path} returned {response.status_code}")
+            captured[name] = recorder.queries
+        transaction.set_rollback(True)
+    return captured
+
+
+# -----------------------------------------------
+# Plans
+# -----------------------------------------------
+def explain(sql, params):
+    """Problems in the query's plan as strings: 'SCAN <table>' and 'SORT <table>'."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            return sorted(set(_postgres_problems(cursor.fetchone()[0][0]['Plan'], sql)))
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return sorted(set(_sqlite_problems([row[-1] for row in cursor.fetchall()], sql)))
+
+
+def _aliases(sql):
+    # Django aliases repeated joins and subqueries as T2, U0, ...
+    return {alias: table for table, alias in re.findall(r'"(\w+)" ([TU]\d+)\b', sql)}
+
+
+def _main_table(sql):
+    match = re.search(r'\bFROM "(\w+)"', sql)
+    return match.group(1) if match else '?'
+
+
+def _sqlite_problems(details, sql):
+    aliases = _aliases(sql)
+    for detail in details:
+        # "SCAN accounts_order" (older SQLite: "SCAN TABLE accounts_order"); "USING INDEX" scans are fine.
+        match = re.match(r'SCAN (?:TABLE )?(\w+)(?: AS (\w+))?$', detail)
+        if match:
+            yield f"SCAN {aliases.get(match.group(1), match.group(1))}"
+        elif detail.startswith('USE TEMP B-TREE FOR') and 'ORDER BY' in detail:
+            yield f"SORT {_main_table(sql)}"
+
+
+def _postgres_problems(node, sql):
+    if node['Node Type'] == 'Seq Scan':
+        yield f"SCAN {node['Relation Name']}"
+    elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+        yield f"SORT {_main_table(sql)}"
+    for child in node.get('Plans', ()):
+        yield from _postgres_problems(child, sql)
+
+
+def check_plans(captured):
+    """{endpoint name: {problem: first offending (sql, params)}}"""
+    findings = {}
+    for name, queries in captured.items():
+        problems = {}
+        for sql, params in queries:
+            for problem in explain(sql, params):
+                problems.setdefault(problem, (sql, params))
+        findings[name] = problems
+    return findings
+
+
+# -----------------------------------------------
+# Index advice
+# -----------------------------------------------
+def _model_for_table(table):
+    for model in apps.get_models():
+        if model._meta.db_table == table:
+            return model
+    return None
+
+
+def _top_level_clause(sql, keyword, stops):
+    """Text of the outermost `keyword` clause (WHERE / ORDER BY), ignoring subqueries."""
+    depth, start = 0, None
+    upper = sql.upper()
+    for i, char in enumerate(sql):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif depth == 0:
+            if start is None and upper.startswith(f'{keyword} ', i) and (i == 0 or sql[i - 1] == ' '):
+                start = i + len(keyword) + 1
+            elif start is not None and any(upper.startswith(f' {stop} ', i) for stop in stops):
+                return sql[start:i]
+    return sql[start:] if start is not None else ''
+
+
+def _split_top_level(text):
+    depth, start, parts = 0, 0, []
+    for i, char in enumerate(text):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return parts
+
+
+def _order_by_terms(sql):
+    """[(expression, 'ASC'|'DESC')] with positional terms (ORDER BY 3 DESC) resolved to the select list."""
+    select = _split_top_level(_top_level_clause(sql, 'SELECT', ('FROM',)))
+    terms = []
+    for term in _split_top_level(_top_level_clause(sql, 'ORDER BY', ('LIMIT', 'OFFSET'))):
+        match = re.match(r'(.*?)(?: (ASC|DESC))?$', term)
+        expression, direction = match.group(1), match.group(2) or 'ASC'
+        if expression.isdigit() and int(expression) <= len(select):
+            expression = select[int(expression) - 1]
+        terms.append((expression, direction))
+    return terms
+
+
+def suggest_index(sql, table):
+    """
+    Index fields for `table` following the usual rule: columns compared with =
+    / IN / IS NULL first, then the first range column, then the ORDER BY
+    columns. Returns a list of field names (with '-' for descending), or None.
+    """
+    model = _model_for_table(table)
+    if model is None:
+        return None
+    columns = {field.column: field.name for field in model._meta.concrete_fields}
+    column = rf'"{table}"\."(\w+)"'
+    where = _top_level_clause(sql, 'WHERE', ('GROUP BY', 'ORDER BY', 'LIMIT', 'HAVING'))
+
+    fields = []
+    for name in re.findall(column + r' (?:= |IN \(|IS NULL)', where):
+        if name in columns and columns[name] not in fields:
+            fields.append(columns[name])
+    ranges = re.findall(column + r' (?:<|>|<=|>=|BETWEEN) ', where)
+    if ranges and ranges[0] in columns and columns[ranges[0]] not in fields:
+        fields.append(columns[ranges[0]])
+    else:
+        for expression, direction in _order_by_terms(sql):
+            match = re.match(column, expression)
+            if match is None:
+                break  # Ordering on another table or an expression: the index can't supply it
+            name = columns.get(match.group(1))
+            if name and name not in fields:
+                fields.append(('-' if direction == 'DESC' else '') + name)
+    return fields or None
+
+
+def _existing_indexes(model):
+    existing = [list(index.fields) for index in model._meta.indexes]
+    existing += [[field.name] for field in model._meta.concrete_fields if field.db_index or field.unique]
+    return existing
+
+
+def _covered(fields, existing):
+    bare = [field.lstrip('-') for field in fields]
+    return any([field.lstrip('-') for field in index[:len(bare)]] == bare for index in existing)
+
+
+def advise(findings):
+    """{model: [index field lists]} for the scans and sorts an index would remove."""
+    proposals = {}
+    for problems in findings.values():
+        for problem, (sql, _) in problems.items():
+            table = problem.split(' ', 1)[1]
+            fields = suggest_index(sql, table)
+            model = _model_for_table(table)
+            if not fields or model is None or _covered(fields, _existing_indexes(model)):
+                continue
+            if fields not in proposals.setdefault(model, []):
+                proposals[model].append(fields)
+    return proposals
+
+
+def index_name(model, fields):
+    """A name like order_user_orderdate_idx, shortened to Django's 30 character limit."""
+    columns = [field.lstrip('-').replace('_', '') for field in fields]
+    for width in (30, 10, 8, 6, 4):
+        name = '_'.join([model._meta.model_name[:width]] + [column[:width] for column in columns] + ['idx'])
+        if len(name) <= 30:
+            return name
+    return name[:30]
+
+
+# -----------------------------------------------
+# Baseline
+# -----------------------------------------------
+def load_baseline(path=BASELINE_PATH):
+    """The accepted findings for the current database vendor (plans differ between SQLite and Postgres)."""
+    if not Path(path).exists():
+        return {}
+    return json.loads(Path(path).read_text()).get(connection.vendor, {})
+
+
+def write_baseline(findings, path=BASELINE_PATH):
+    data = json.loads(Path(path).read_text()) if Path(path).exists() else {}
+    data[connection.vendor] = {name: sorted(problems) for name, problems in findings.items()}
+    Path(path).write_text(json.dumps(data, indent=2, sort_keys=True) + '\n')
+
+
+def regressions(findings, baseline):
+    """{endpoint name: [problems not in the baseline]}"""
+    result = {}
+    for name, problems in findings.items():
+        new = sorted(set(problems) - set(baseline.get(name, ())))
+        if new:
+            result[name] = new
+    return result
@@ -1,8 +1,114 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError as DjangoValidationError
 # ✅ PetProfile, Feedback, and Appointment added to imports
-from .models import LoginActivity, Service, UserProfile, Order, Product, PetProfile, Feedback, Appointment 
+from . import hot_objects
+from .concurrency import VersionConflict
+from .models import LoginActivity, Service, UserProfile, Order, Product, PetProfile, PetVisit, Feedback, Appointment 
+
+
+# ===============================================
+# SPARSE FIELDSETS & EXPANSION (?fields= / ?expand=)
+# ===============================================
+def sparse_params(request):
+    """Reads ?fields=a,b and ?expand=rel from a GET request as (fields, expand)."""
+    def split(name):
+        raw = request.query_params.get(name) if hasattr(request, 'query_params') else request.GET.get(name)
+        return [part.strip() for part in raw.split(',') if part.strip()] if raw else None
+
+    return split('fields'), split('expand') or []
+
+
+class SparseFieldsMixin:
+    """
+    Lets callers trim a read serializer to `fields` and inline the related
+    objects named in `expand` (see `expandable`). optimize_queryset() turns
+    the same choice into select_related()/only() so the SQL shrinks with the
+    JSON. Writes are unaffected because views only pass these on GET.
+    Unknown names in `fields` raise a ValidationError (a 400 from the views).
+    """
+    expandable = {}  # field name -> serializer class used when expanded
+    # field name -> extra model columns its output reads; required for a
+    # SerializerMethodField (or source='*') to be optimised at all
+    column_dependencies = {}
+    always_load = ()  # columns the view needs whatever `fields` keeps (e.g. 'version' for the ETag)
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in expand:
+            if name in self.expandable:
+                self.fields[name] = self.expandable[name](read_only=True)
+        if fields is not None:
+            unknown = [name for name in fields if name not in self.fields]
+            if unknown:
+                raise serializers.ValidationError({"fields": [
+                    f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(self.fields)}."
+                ]})
+            keep = set(fields) | set(expand)
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fields=None, expand=()):
+        serializer = cls(fields=fields, expand=expand)
+        columns = set(cls.always_load)
+        for name, field in serializer.fields.items():
+            path = field.source.replace('.', '__')
+            if isinstance(field, serializers.BaseSerializer):
+                columns.update(f"{path}__{sub.source}" for sub in field.fields.values())
+                continue
+            dependencies = cls.column_dependencies.get(name)
+            if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+                if dependencies is None:
+                    return queryset  # Can't tell which columns it reads
+                columns.update(dependencies)
+                continue
+            columns.update(dependencies or ())
+            columns.add(path)
+        joins = {column.rsplit('__', 1)[0] for column in columns if '__' in column}
+        return queryset.select_related(*joins).only(*columns)
+
+
+class ChangedFieldsUpdateMixin:
+    """
+    update() that writes only the columns whose value actually changed, via
+    save(update_fields=...), and skips the UPDATE entirely when none did. A
+    PUT from an edit form resends every field; only the edited ones hit disk.
+    """
+
+    def update(self, instance, validated_data):
+        # Versioned models: context['expected_version'] holds the If-Match versions.
+        expected = self.context.get('expected_version')
+        changed = []
+        for name, value in validated_data.items():
+            field = instance._meta.get_field(name)
+            current = getattr(instance, field.attname)
+            new = value.pk if field.is_relation and value is not None else value
+            if current != new:
+                setattr(instance, name, value)
+                changed.append(name)
+        if changed and expected is not None:
+            instance.save(update_fields=changed, expected_version=expected)
+        elif changed:
+            instance.save(update_fields=changed)
+        elif expected is not None and instance.version not in expected:
+            raise VersionConflict(f"{instance._meta.object_name} {instance.pk} was modified by someone else.")
+        return instance
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'username']
+
+
+class ServiceSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Service
+        fields = ['id', 'name', 'cost']
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -36,10 +142,11 @@ class LoginSerializer(serializers.Serializer):
         raise serializers.ValidationError("Invalid credentials")
 
 
-class LoginActivitySerializer(serializers.ModelSerializer):
+class LoginActivitySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     role = serializers.SerializerMethodField()
     status = serializers.SerializerMethodField()
+    column_dependencies = {'role': ('user__userprofile__role',), 'status': ('user__is_active',)}
 
     class Meta:
         model = LoginActivity
@@ -55,13 +162,16 @@ class LoginActivitySerializer(serializers.ModelSerializer):
 
 
 # Service Serializer (Your existing serializer)
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(SparseFieldsMixin, ChangedFieldsUpdateMixin, serializers.ModelSerializer):
+    expandable = {'created_by': UserSummarySerializer}
+    always_load = ('version',)  # The detail view's ETag
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
 
     class Meta:
         model = Service
-        fields = ['id', 'name', 'description', 'included', 'duration', 'cost', 'availability', 'created_by', 'created_by_username', 'created_at']
-        read_only_fields = ['created_by', 'created_at'] 
+        fields = ['id', 'name', 'description', 'included', 'duration', 'cost', 'availability', 'created_by', 'created_by_username', 'created_at',
+                  'order_count', 'booking_count', 'version']
+        read_only_fields = ['created_by', 'created_at', 'order_count', 'booking_count', 'version'] 
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -70,15 +180,46 @@ class ServiceSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+# ===============================================
+# CACHED PRIMARY KEY LOOKUPS
+# ===============================================
+class HotPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves the pk through accounts.hot_objects instead of a query per
+    request. The result is branch-scoped like `objects` and carries only the
+    snapshot's columns; the rest load lazily if something reads them.
+    """
+
+    def __init__(self, model, **kwargs):
+        self.model = model
+        kwargs.setdefault('queryset', model.objects.all())  # Still used by the browsable API/OPTIONS
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = self.model._meta.pk.to_python(data)
+        except DjangoValidationError:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        instance = hot_objects.get(self.model, pk)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
+
+
 # Order Serializer (From previous step)
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    expandable = {'user': UserSummarySerializer, 'service': ServiceSummarySerializer}
     username = serializers.CharField(source='user.username', read_only=True)
+    service = HotPrimaryKeyRelatedField(Service)
     service_name = serializers.CharField(source='service.name', read_only=True)
 
     class Meta:
         model = Order
         fields = ['id', 'user', 'username', 'service', 'service_name', 'order_date', 'status', 'total_cost']
-        read_only_fields = ['user', 'total_cost']
+        # Status only changes through accounts.transitions (orders/status/).
+        read_only_fields = ['user', 'status', 'total_cost']
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -91,13 +232,16 @@ class OrderSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 # Product Serializer
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsMixin, ChangedFieldsUpdateMixin, serializers.ModelSerializer):
+    expandable = {'created_by': UserSummarySerializer}
+    always_load = ('version',)  # The detail view's ETag
     created_by_username = serializers.CharField(source='created_by.username', read_only=True) 
 
     class Meta:
         model = Product
-        fields = ['id', 'name', 'description', 'category', 'unit_of_measure', 'stocks', 'price', 'is_available', 'created_by', 'created_by_username', 'created_at']
-        read_only_fields = ['created_by', 'created_at'] 
+        fields = ['id', 'name', 'description', 'category', 'unit_of_measure', 'stocks', 'price', 'is_available', 'reorder_point',
+                  'created_by', 'created_by_username', 'created_at', 'version']
+        read_only_fields = ['created_by', 'created_at', 'version'] 
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -105,15 +249,38 @@ class ProductSerializer(serializers.ModelSerializer):
             validated_data['created_by'] = request.user
         return super().create(validated_data)
 
+    def update(self, instance, validated_data):
+        request = self.context.get('request')
+        if request and hasattr(request, 'user'):
+            instance._changed_by_id = request.user.pk  # Credited on the stock ledger (accounts/stock.py)
+        return super().update(instance, validated_data)
+
 
 # Pet Profile Serializer (From previous step)
-class PetProfileSerializer(serializers.ModelSerializer):
+class PetProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    expandable = {'created_by': UserSummarySerializer, 'owner': UserSummarySerializer}
+    column_dependencies = {'age': ('birthdate',)}
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
+    owner_username = serializers.CharField(source='owner.username', read_only=True)
+    owner = serializers.PrimaryKeyRelatedField(queryset=User.objects.filter(is_staff=False), required=False, allow_null=True)
     
     class Meta:
         model = PetProfile
-        fields = ['id', 'pet_name', 'pet_breed', 'age', 'allergies', 'notes', 'pet_picture', 'created_by', 'created_by_username', 'created_at']
+        fields = ['id', 'pet_name', 'pet_breed', 'age', 'birthdate', 'allergies', 'notes', 'pet_picture', 'owner', 'owner_username',
+                  'created_by', 'created_by_username', 'created_at']
         read_only_fields = ['created_by', 'created_at']
+
+    def validate(self, data):
+        if not data.get('age') and not data.get('birthdate') and self.instance is None:
+            raise serializers.ValidationError({"age": "Provide the pet's birthdate or age."})
+        return data
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if 'age' in data and instance.birthdate:
+            # Computed, so it never goes stale like the stored text does
+            data['age'] = instance.age_on()
+        return data
         
     def create(self, validated_data):
         # Automatically set the user who created the pet profile
@@ -123,8 +290,49 @@ class PetProfileSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class CustomerImportRowSerializer(serializers.Serializer):
+    """One row of the bulk customer/pet CSV (accounts/imports.py). The pet columns are optional."""
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField(required=False, allow_blank=True)
+    password = serializers.CharField(required=False, allow_blank=True, trim_whitespace=False)
+    pet_name = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    pet_breed = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    birthdate = serializers.DateField(required=False, allow_null=True)
+    age = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    allergies = serializers.CharField(required=False, allow_blank=True)
+    notes = serializers.CharField(required=False, allow_blank=True)
+
+    PET_FIELDS = ('pet_breed', 'birthdate', 'age', 'allergies', 'notes')
+
+    def validate(self, data):
+        if data.get('pet_name'):
+            if not data.get('pet_breed'):
+                raise serializers.ValidationError({"pet_breed": "Required when pet_name is given."})
+            if not data.get('age') and not data.get('birthdate'):
+                raise serializers.ValidationError({"age": "Provide the pet's birthdate or age."})
+        elif any(data.get(field) for field in self.PET_FIELDS):
+            raise serializers.ValidationError({"pet_name": "Required when other pet columns are filled in."})
+        return data
+
+
+class PetVisitSerializer(serializers.ModelSerializer):
+    recorded_by_username = serializers.CharField(source='recorded_by.username', read_only=True)
+
+    class Meta:
+        model = PetVisit
+        fields = ['id', 'pet', 'appointment', 'kind', 'visited_at', 'weight_kg', 'notes', 'recorded_by', 'recorded_by_username', 'created_at']
+        read_only_fields = ['pet', 'recorded_by', 'created_at']
+
+    def validate_appointment(self, appointment):
+        pet = self.context.get('pet')
+        if appointment and pet and pet.owner_id and appointment.user_id != pet.owner_id:
+            raise serializers.ValidationError("The appointment belongs to a different customer.")
+        return appointment
+
+
 # Feedback Serializer (From previous step)
-class FeedbackSerializer(serializers.ModelSerializer):
+class FeedbackSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    expandable = {'user': UserSummarySerializer}
     # This field is used by the Gallery view to display who left the feedback
     username = serializers.CharField(source='user.username', read_only=True) 
 
@@ -148,21 +356,20 @@ class FeedbackSerializer(serializers.ModelSerializer):
 
 
 # Staff Management Serializer
-class StaffProfileSerializer(serializers.ModelSerializer):
+class StaffProfileSerializer(SparseFieldsMixin, ChangedFieldsUpdateMixin, serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     email = serializers.CharField(source='user.email', read_only=True)
     
     class Meta:
         model = UserProfile
         # Ensure all fields are explicitly listed
-        fields = ['id', 'username', 'email', 'role', 'status', 'branch']
+        fields = ['id', 'username', 'email', 'role', 'status', 'branch', 'pet_count', 'order_count', 'appointment_count', 'version']
+        read_only_fields = ['pet_count', 'order_count', 'appointment_count', 'version']
         
     def update(self, instance, validated_data):
-        # Update UserProfile fields (role and branch are primary targets)
-        instance.role = validated_data.get('role', instance.role)
-        instance.branch = validated_data.get('branch', instance.branch)
-        instance.status = validated_data.get('status', instance.status)
-        instance.save()
+        # Update UserProfile fields (role and branch are primary targets). Only the
+        # changed columns are written, so the counters are never overwritten.
+        instance = super().update(instance, validated_data)
         
         # IMPORTANT LOGIC: Synchronize Django's built-in is_staff flag
         user = instance.user
@@ -184,8 +391,10 @@ class StaffProfileSerializer(serializers.ModelSerializer):
 # ✅ NEW: APPOINTMENT SERIALIZER
 # ===============================================
 
-class AppointmentSerializer(serializers.ModelSerializer):
+class AppointmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    expandable = {'user': UserSummarySerializer, 'service': ServiceSummarySerializer}
     user_username = serializers.CharField(source='user.username', read_only=True)
+    service = HotPrimaryKeyRelatedField(Service)
     service_name = serializers.CharField(source='service.name', read_only=True)
     
     class Meta:
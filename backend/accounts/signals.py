@@ -0,0 +1,67 @@
+from decimal import Decimal
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from . import events
+from .models import Product, Service, Appointment
+
+
+# ===============================================
+# CHANGE TRACKING FOR LIVE DASHBOARD EVENTS
+# ===============================================
+# Only the fields the dashboards and calendar react to are tracked. Values
+# are read from __dict__ so deferred fields never trigger extra queries, and
+# the stored values are fetched in pre_save (one query, only when a save
+# writes a tracked field) rather than remembered for every row loaded.
+TRACKED_FIELDS = {
+    Product: ('product', ('name', 'stocks', 'price', 'is_available')),
+    Service: ('service', ('name', 'cost', 'availability')),
+    Appointment: ('appointment', ('service_id', 'appointment_date', 'status')),
+}
+
+
+def _json_value(value):
+    return str(value) if isinstance(value, Decimal) else value
+
+
+def _snapshot(instance, fields):
+    values = instance.__dict__
+    return {name: _json_value(values[name]) for name in fields if name in values}
+
+
+def _read_before(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    instance._tracked_values = None
+    if raw or instance._state.adding:
+        return
+    fields = [name for name in _snapshot(instance, TRACKED_FIELDS[sender][1])
+              if update_fields is None or name in update_fields or name.removesuffix('_id') in update_fields]
+    if fields:
+        stored = sender._base_manager.using(using).filter(pk=instance.pk).values(*fields).first()
+        instance._tracked_values = stored and {name: _json_value(value) for name, value in stored.items()}
+
+
+def _publish_save(sender, instance, created, **kwargs):
+    channel, fields = TRACKED_FIELDS[sender]
+    current = _snapshot(instance, fields)
+    if created:
+        op, changes = 'created', current
+    else:
+        previous, instance._tracked_values = getattr(instance, '_tracked_values', None), None
+        changes = {k: current[k] for k in previous or () if previous[k] != current[k]}
+        op = 'updated'
+        if not changes:
+            return
+    transaction.on_commit(partial(events.publish, channel, op, instance.pk, changes, instance.branch))
+
+
+def _publish_delete(sender, instance, **kwargs):
+    channel = TRACKED_FIELDS[sender][0]
+    transaction.on_commit(partial(events.publish, channel, 'deleted', instance.pk, None, instance.branch))
+
+
+for model in TRACKED_FIELDS:
+    pre_save.connect(_read_before, sender=model)
+    post_save.connect(_publish_save, sender=model)
+    post_delete.connect(_publish_delete, sender=model)
@@ -0,0 +1,109 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save
+
+from .models import Product, StockMovement
+
+
+# ===============================================
+# STOCK LEDGER & REORDER ALERTS
+# ===============================================
+# Every change to Product.stocks appends a StockMovement. Product saves are
+# caught by the signals below; the coalesced inventory changes
+# (accounts/inventory.py) record their own because .update() skips them.
+# Once the change commits, only the products that moved are checked against
+# their reorder point. A product that just got worse (ok -> low, or -> out of
+# stock) gets an alert job on the 'alerts' queue; one that stays low doesn't
+# alert again on every further sale.
+
+STATE_SEVERITY = {'ok': 0, 'low_stock': 1, 'out_of_stock': 2}
+
+
+def stock_state(stocks, reorder_point):
+    if stocks <= 0:
+        return 'out_of_stock'
+    if stocks <= reorder_point:
+        return 'low_stock'
+    return 'ok'
+
+
+def check_reorder_points(changes):
+    """
+    `changes` is a list of (product_id, (stocks, reorder_point) before,
+    (stocks, reorder_point) after). Queues an alert for every product whose
+    state got worse and returns them as (product_id, state) pairs.
+    """
+    from .tasks import send_stock_alert  # Only once something moved, not at startup
+
+    alerts = []
+    for product_id, before, after in changes:
+        state = stock_state(*after)
+        if STATE_SEVERITY[state] > STATE_SEVERITY[stock_state(*before)]:
+            send_stock_alert.delay(product_id, state)
+            alerts.append((product_id, state))
+    return alerts
+
+
+def record(movements, changes):
+    """Appends unsaved StockMovement rows and checks `changes` after commit."""
+    if movements:
+        StockMovement.all_branches.bulk_create(movements)
+    if changes:
+        transaction.on_commit(partial(check_reorder_points, changes))
+
+
+# --- Product saves ---
+# The level before the save is re-read with the row locked, inside the save's
+# own transaction (VersionedModel.save), rather than taken from when the
+# instance was loaded: an inventory change may have moved it since.
+
+TRACKED = {'stocks', 'reorder_point'}
+
+
+def _loaded_values(instance):
+    # Read from __dict__ so deferred columns never trigger a query.
+    values = instance.__dict__
+    return values.get('stocks'), values.get('reorder_point')
+
+
+def _lock_before(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    instance._stock_before = None
+    if raw or instance._state.adding or (update_fields is not None and not TRACKED & set(update_fields)):
+        return
+    if not all(isinstance(value, int) for value in _loaded_values(instance)):
+        return  # Not loaded or an F() expression: nothing the ledger can price
+    instance._stock_before = (
+        Product._base_manager.using(using).select_for_update()
+        .filter(pk=instance.pk).values_list('stocks', 'reorder_point').first()
+    )
+
+
+def _record_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    after = _loaded_values(instance)
+    if created:
+        before = (0, after[1])
+    else:
+        before, instance._stock_before = getattr(instance, '_stock_before', None), None
+        if before is None:
+            return
+        # Columns outside update_fields kept their stored values.
+        after = tuple(new if update_fields is None or name in update_fields else old
+                      for name, old, new in zip(('stocks', 'reorder_point'), before, after))
+    if raw or not all(isinstance(value, int) for value in before + after) or before == after:
+        return
+    movements = []
+    if after[0] != before[0]:
+        movements.append(StockMovement(
+            product_id=instance.pk,
+            delta=after[0] - before[0],
+            stocks_after=after[0],
+            reason='initial' if created else 'edit',
+            created_by_id=instance.created_by_id if created else getattr(instance, '_changed_by_id', None),
+            branch=instance.branch,
+        ))
+    record(movements, [(instance.pk, before, after)])
+
+
+pre_save.connect(_lock_before, sender=Product)
+post_save.connect(_record_save, sender=Product)
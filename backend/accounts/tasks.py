@@ -0,0 +1,132 @@
+import csv
+import io
+import logging
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from . import counters, events, gallery
+from .imports import import_customers, CustomerImportError
+from .jobs import job, set_progress
+from .models import (
+    UserProfile,
+    LoginActivity,
+    LoginLog,
+    Service,
+    Order,
+    Product,
+    PetProfile,
+    PetVisit,
+    Feedback,
+    Appointment,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ===============================================
+# ACCOUNT PURGE (SOFT-DELETE CASCADE)
+# ===============================================
+PURGE_BATCH_SIZE = 1000
+
+
+def _delete_in_batches(queryset, batch_size):
+    """Deletes matching rows a batch per transaction so the write lock is short."""
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            counters.bulk_delete(model, ids)
+        deleted += len(ids)
+
+
+def _detach_in_batches(queryset, field, batch_size):
+    """Nulls a SET_NULL foreign key a batch at a time."""
+    model = queryset.model
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            model._base_manager.filter(pk__in=ids).update(**{field: None})
+
+
+@job(queue='maintenance', priority=5)
+def purge_user(user_id, batch_size=PURGE_BATCH_SIZE):
+    """
+    Removes a soft-deleted user and everything that cascaded from them, in
+    bounded batches. Safe to re-run: each step resumes where it stopped.
+    """
+    profile = UserProfile.objects.filter(user_id=user_id).first()
+    if profile is not None and profile.deleted_at is None:
+        return  # Restored in the meantime.
+    if User.objects.filter(pk=user_id, is_active=True).exists():
+        return  # Re-activated some other way (e.g. the admin site); leave it alone.
+
+    services = Service._base_manager.filter(created_by_id=user_id)
+    # Same rows the ORM cascade would remove, largest tables first.
+    _delete_in_batches(Order._base_manager.filter(user_id=user_id), batch_size)
+    _delete_in_batches(Appointment._base_manager.filter(user_id=user_id), batch_size)
+    _delete_in_batches(Order._base_manager.filter(service__in=services), batch_size)
+    _delete_in_batches(Appointment._base_manager.filter(service__in=services), batch_size)
+    _delete_in_batches(LoginActivity.objects.filter(user_id=user_id), batch_size)
+    _delete_in_batches(LoginLog.objects.filter(user_id=user_id), batch_size)
+    _delete_in_batches(services, batch_size)
+    _delete_in_batches(Product._base_manager.filter(created_by_id=user_id), batch_size)
+    _detach_in_batches(Feedback.objects.filter(user_id=user_id), 'user', batch_size)
+    _delete_in_batches(PetVisit._base_manager.filter(pet__owner_id=user_id), batch_size)
+    _delete_in_batches(PetProfile._base_manager.filter(owner_id=user_id), batch_size)
+    _detach_in_batches(PetProfile._base_manager.filter(created_by_id=user_id), 'created_by', batch_size)
+
+    # Whatever is left is a handful of rows.
+    User.objects.filter(pk=user_id).delete()
+    # Cached gallery entries may still show the username.
+    gallery.refresh_cache()
+
+
+# ===============================================
+# LOW-STOCK ALERTS (queued by accounts/stock.py)
+# ===============================================
+@job(queue='alerts', priority=3)
+def send_stock_alert(product_id, state):
+    """Tells staff a product ran low or out, unless that stopped being true before the job ran."""
+    from .stock import stock_state
+
+    product = Product._base_manager.filter(pk=product_id).values('name', 'branch', 'stocks', 'reorder_point').first()
+    if product is None or stock_state(product['stocks'], product['reorder_point']) != state:
+        return
+    logger.warning("Stock alert (%s): %s has %s left, reorder point %s", state, product['name'],
+                   product['stocks'], product['reorder_point'])
+    events.publish('product', 'stock_alert', product_id, {
+        'state': state, 'name': product['name'], 'stocks': product['stocks'], 'reorder_point': product['reorder_point'],
+    }, product['branch'])
+
+
+# ===============================================
+# BULK CUSTOMER IMPORT (queued by CustomerImportView)
+# ===============================================
+@job(queue='imports', max_attempts=1)
+def import_customer_file(path, created_by_id=None, branch=None):
+    """
+    Imports the CSV the view saved at `path` in default_storage, then deletes
+    it. The ImportReport (counts and row errors) is stored on the Job after
+    every chunk. Not retried: a second run would only report the customers
+    the first one created as duplicates.
+    """
+    try:
+        with default_storage.open(path, 'rb') as upload:
+            report = import_customers(
+                io.TextIOWrapper(upload, encoding='utf-8-sig', newline=''),
+                created_by=User.objects.filter(pk=created_by_id).first(), branch=branch,
+                progress=lambda report: set_progress(report.as_dict()),
+            )
+    except (CustomerImportError, UnicodeDecodeError, csv.Error) as exc:
+        set_progress({'file': [str(exc)]})  # The file itself is unusable; nothing to retry
+        return
+    finally:
+        default_storage.delete(path)
+    set_progress(report.as_dict())
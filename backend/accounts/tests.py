@@ -1,3 +1,1355 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from django.db import IntegrityError
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+import serve
+from benchmarks import startup
+
+from .branching import get_current_branch, reset_current_branch, set_current_branch
+from . import counters, dashboard, events, hot_objects, query_plans
+from .checks import check_branch_databases, check_shared_caches
+from . import middleware
+from .fast_serializers import (FeedbackValuesSerializer, OrderValuesSerializer, PetVisitValuesSerializer,
+                               ProductValuesSerializer, ServiceValuesSerializer)
+from .imports import import_customers
+from .inventory import ChangeError, apply_changes, coalesce
+from .jobs import housekeeping, job, prune_finished_jobs, queue_stats, work
+from .middleware import CompressionMiddleware
+from .models import (Appointment, Feedback, FeedbackSummary, Job, LoginActivity, Order, PetProfile, PetVisit,
+                     Product, Service, StatusChangeLog, StockMovement, UserProfile)
+from .stock import check_reorder_points
+from . import transitions
+from .transitions import TransitionError, _move, apply_transition
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+from .serializers import (FeedbackSerializer, LoginActivitySerializer, OrderSerializer, PetVisitSerializer,
+                          ProductSerializer, ServiceSerializer)
+from .throttling import CacheBucketStore
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    return client
+
+
+def make_user(username, is_staff=False, role='user', branch=None):
+    user = User.objects.create_user(username, is_staff=is_staff)  # Unusable password: no hashing
+    UserProfile.objects.create(user=user, role=role, branch=branch)
+    return user
+
+
+# ===============================================
+# OPTIMISTIC CONCURRENCY (ETAG / IF-MATCH)
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class ServiceETagTests(TestCase):
+    def setUp(self):
+        self.admin = make_user('admin', is_staff=True, role='admin')
+        self.client = client_for(self.admin)
+        self.service = Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'),
+                                              created_by=self.admin)
+        self.url = f'/api/accounts/services/{self.service.pk}/'
+
+    def put(self, etag, **changes):
+        data = {'name': 'Bath', 'duration': '1 hour', 'cost': '250.00', **changes}
+        return self.client.put(self.url, data, format='json', HTTP_IF_MATCH=etag)
+
+    def test_detail_sends_version_as_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"1"')
+
+    def test_sparse_fields_still_load_version(self):
+        for query in ('?fields=name', '?fields=name,created_by&expand=created_by'):
+            with self.subTest(query=query), CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url + query)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['ETag'], '"1"')
+            self.assertNotIn('version', response.json())
+            service_reads = [q['sql'] for q in queries if 'FROM "accounts_service"' in q['sql']]
+            self.assertEqual(len(service_reads), 1, service_reads)  # No deferred load for the ETag
+
+    def test_matching_if_match_updates_and_bumps_version(self):
+        response = self.put('"1"', name='Full bath')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"2"')
+        self.service.refresh_from_db()
+        self.assertEqual((self.service.name, self.service.version), ('Full bath', 2))
+
+    def test_stale_if_match_is_refused_with_current_row(self):
+        self.assertEqual(self.put('"1"', name='Full bath').status_code, 200)
+        response = self.put('"1"', name='Quick bath')
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response['ETag'], '"2"')
+        self.assertEqual(response.json()['current']['name'], 'Full bath')
+        self.service.refresh_from_db()
+        self.assertEqual(self.service.name, 'Full bath')
+
+
+# ===============================================
+# ASYNC (ASGI) READ VIEWS
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class AsyncListTests(TestCase):
+    def setUp(self):
+        self.admin = make_user('admin', is_staff=True, role='admin')
+        self.client = client_for(self.admin)
+        Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'), created_by=self.admin)
+        Service.objects.create(name='Trim', duration='30 mins', cost=Decimal('150.00'))
+        Product.objects.create(name='Shampoo', price=Decimal('99.99'), stocks=10, created_by=self.admin)
+
+    def test_matches_the_synchronous_lists(self):
+        for name in ('services', 'products'):
+            with self.subTest(name=name):
+                expected = self.client.get(f'/api/accounts/{name}/').json()
+                response = self.client.get(f'/api/accounts/async/{name}/')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected)
+                self.assertEqual(response['X-Total-Count'], str(len(expected)))
+
+
+# ===============================================
+# FAST JSON RENDERING & VALUES SERIALIZERS
+# ===============================================
+class FastJSONTests(TestCase):
+    def assertSameBytes(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_renderer_matches_drf(self):
+        moment = datetime(2026, 3, 1, 8, 30, 15, 123456, tzinfo=dt_timezone.utc)
+        self.assertSameBytes([{
+            'price': Decimal('99.90'), 'big': Decimal('1E+3'), 'at': moment, 'naive': moment.replace(tzinfo=None),
+            'day': moment.date(), 'time': moment.time(), 'gap': timedelta(hours=1), 'id': uuid.UUID(int=1),
+            'none': None, 'flag': False, 'text': 'Señor\u2028Bath\u2029🐶', 1: 'int key',
+            'nested': {'list': [1.5, None]},
+        }])
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def rendered(self, data):
+        return JSONRenderer().render(data)
+
+    def test_values_serializers_match_the_model_serializers(self):
+        staff = make_user('staff', is_staff=True)
+        service = Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.50'), created_by=staff)
+        Service.objects.create(name='Trim', duration='30 mins', cost=Decimal('150.00'))
+        Product.objects.create(name='Shampoo', price=Decimal('99.99'), stocks=10, created_by=staff)
+        Order.objects.create(user=make_user('alice'), service=service, total_cost=Decimal('250.50'))
+        Feedback.objects.create(user=None, rating=4, feedback_text='Anonymous')  # Null relation: key left out
+        pet = PetProfile.objects.create(pet_name='Rex', pet_breed='Beagle', age='2 Years')
+        PetVisit.objects.create(pet=pet, kind='checkup', weight_kg=None)
+
+        cases = [
+            (ServiceValuesSerializer, ServiceSerializer, Service.objects.order_by('id'), {}),
+            (ProductValuesSerializer, ProductSerializer, Product.objects.order_by('id'), {}),
+            (OrderValuesSerializer, OrderSerializer, Order.objects.order_by('id'), {}),
+            (OrderValuesSerializer, OrderSerializer, Order.objects.order_by('id'),
+             {'fields': ['id', 'total_cost'], 'expand': ['service']}),
+            (FeedbackValuesSerializer, FeedbackSerializer, Feedback.objects.order_by('id'), {}),
+            (PetVisitValuesSerializer, PetVisitSerializer, PetVisit.objects.order_by('id'), {}),
+        ]
+        for values_class, model_class, queryset, sparse in cases:
+            with self.subTest(serializer=values_class.__name__, **sparse):
+                fast = values_class(sparse.get('fields'), sparse.get('expand', ())).serialize(queryset)
+                slow = model_class(queryset, many=True, **sparse).data
+                self.assertEqual(self.rendered(fast), self.rendered(slow))
+
+
+# ===============================================
+# RESPONSE COMPRESSION & FAST JSON PARSING
+# ===============================================
+class CompressionTests(TestCase):
+    body = b'{"name": "Bath", "cost": "250.00"}' * 100
+
+    def respond(self, accept, response=None):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response or HttpResponse(self.body))(request)
+
+    def test_gzip_is_negotiated(self):
+        response = self.respond('gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_preference_and_refusals(self):
+        best = 'br' if middleware.brotli is not None else 'gzip'
+        self.assertEqual(self.respond('*')['Content-Encoding'], best)
+        self.assertEqual(self.respond('br;q=0.5, gzip;q=1.0')['Content-Encoding'], 'gzip')
+        for accept in ('', 'identity', 'gzip;q=0', '*;q=0'):
+            with self.subTest(accept=accept):
+                response = self.respond(accept)
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertEqual(response.content, self.body)
+
+    def test_small_streaming_and_incompressible_bodies_pass_through(self):
+        self.assertFalse(self.respond('gzip', HttpResponse(b'{}')).has_header('Content-Encoding'))
+        stream = StreamingHttpResponse(iter([self.body]))
+        self.assertFalse(self.respond('gzip', stream).has_header('Content-Encoding'))
+        noise = os.urandom(4096)
+        self.assertEqual(self.respond('gzip', HttpResponse(noise)).content, noise)
+
+    def test_strong_etag_is_weakened(self):
+        response = HttpResponse(self.body)
+        response['ETag'] = '"3"'
+        self.assertEqual(self.respond('gzip', response)['ETag'], 'W/"3"')
+
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def test_api_responses_are_compressed(self):
+        for n in range(20):
+            Service.objects.create(name=f'Service {n}', duration='1 hour', cost=Decimal('250.00'))
+        client = client_for(make_user('staff', is_staff=True))
+        response = client.get('/api/accounts/services/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), client.get('/api/accounts/services/').content)
+
+
+class FastJSONParserTests(TestCase):
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser.parse(io.BytesIO(body), 'application/json', {'encoding': encoding})
+
+    def test_matches_the_stock_parser(self):
+        for body, encoding in ((b'{"a": [1, 2.5, null, true], "b": "\u00f1\ud83d\udc36"}', 'utf-8'),
+                               (b'{"big": 123456789012345678901234567890, "low": -9223372036854775809}', 'utf-8'),
+                               ('{"name": "Se\u00f1or"}'.encode('latin-1'), 'latin-1')):
+            with self.subTest(body=body):
+                self.assertEqual(self.parse(FastJSONParser(), body, encoding), self.parse(JSONParser(), body, encoding))
+
+    def test_errors_match_the_stock_parser(self):
+        errors = []
+        for parser in (FastJSONParser(), JSONParser()):
+            with self.assertRaises(ParseError) as caught:
+                self.parse(parser, b'{"a": ')
+            errors.append(str(caught.exception.detail))
+        self.assertEqual(errors[0], errors[1])
+
+
+# ===============================================
+# SPARSE FIELDSETS (?fields= / ?expand=)
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        self.admin = make_user('admin', is_staff=True, role='admin')
+        self.client = client_for(self.admin)
+        service = Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'), created_by=self.admin)
+        Order.objects.create(user=self.admin, service=service, total_cost=Decimal('250.00'))
+
+    def test_lists_keep_only_the_requested_fields(self):
+        self.assertEqual(self.client.get('/api/accounts/services/?fields=name').json(), [{'name': 'Bath'}])
+        response = self.client.get('/api/accounts/orders/?fields=id,service&expand=service')
+        self.assertEqual(set(response.json()[0]), {'id', 'service'})
+        self.assertEqual(response.json()[0]['service']['name'], 'Bath')
+
+    def test_unknown_fields_are_refused(self):
+        detail = f'services/{Service.objects.get().pk}/'
+        for path in ('services/', 'products/', 'orders/', 'pets/', 'users/staff/', detail):
+            with self.subTest(path=path):
+                response = self.client.get(f'/api/accounts/{path}?fields=name,nope')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('nope', response.json()['fields'][0])
+
+    def test_only_loads_the_columns_in_use(self):
+        queryset = ServiceSerializer.optimize_queryset(Service.objects.all(), ['name', 'created_by_username'])
+        self.assertEqual(queryset.query.deferred_loading, ({'name', 'version', 'created_by__username'}, False))
+        self.assertEqual(queryset.query.select_related, {'created_by': {}})
+
+    def test_method_fields_are_optimised_through_their_dependencies(self):
+        LoginActivity.objects.create(user=self.admin)
+        fields = ['username', 'role', 'status']
+        queryset = LoginActivitySerializer.optimize_queryset(LoginActivity.objects.all(), fields)
+        with self.assertNumQueries(1):
+            data = LoginActivitySerializer(queryset, many=True, fields=fields).data
+        self.assertEqual(data, [{'username': 'admin', 'role': 'admin', 'status': 'Active'}])
+
+        class Undeclared(LoginActivitySerializer):
+            column_dependencies = {}
+
+        unchanged = LoginActivity.objects.all()
+        self.assertIs(Undeclared.optimize_queryset(unchanged, ['role']), unchanged)
+
+
+# ===============================================
+# LIVE CHANGE EVENTS
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class ChangeEventTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.product = Product.objects.create(name='Shampoo', price=Decimal('99.99'), stocks=10)
+
+    def published(self, action):
+        with mock.patch.object(events, 'publish') as publish, self.captureOnCommitCallbacks(execute=True):
+            action()
+        return [call.args for call in publish.call_args_list]
+
+    def test_saves_publish_only_what_changed(self):
+        product = Product.objects.get(pk=self.product.pk)
+        product.price = Decimal('89.99')
+        product.description = 'Gentle'
+        self.assertEqual(self.published(product.save),
+                         [('product', 'updated', product.pk, {'price': '89.99'}, None)])
+        product.description = 'Gentler'
+        self.assertEqual(self.published(lambda: product.save(update_fields=['description'])), [])
+        self.assertEqual(self.published(product.delete), [('product', 'deleted', self.product.pk, None, None)])
+
+    def test_stale_copy_is_compared_with_the_stored_row(self):
+        stale = Product.objects.get(pk=self.product.pk)
+        Product.objects.filter(pk=self.product.pk).update(name='Dog shampoo')
+        self.assertEqual(self.published(stale.save)[0][3], {'name': 'Shampoo'})
+
+    async def test_broker_filters_by_channel_and_branch(self):
+        broker = events.InProcessBroker()
+        subscription = broker.subscribe(['product'], branch='A')
+        for channel, branch in (('service', None), ('product', 'B'), ('product', 'A'), ('product', None)):
+            broker.publish({'channel': channel, 'op': 'updated', 'id': 1, 'branch': branch, 'changes': {}})
+        received = [(await subscription.get(timeout=1))['branch'] for _ in range(2)]
+        self.assertEqual(received, ['A', None])
+        self.assertTrue(subscription.queue.empty())
+        subscription.close()
+
+    def test_ticket_needs_a_jwt(self):
+        self.assertEqual(self.client.post('/api/accounts/events/ticket/').status_code, 401)
+        response = client_for(make_user('staff', is_staff=True)).post('/api/accounts/events/ticket/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['expires_in'], 30)
+
+    async def test_stream_opens_once_per_ticket(self):
+        user = await User.objects.acreate(username='staff', is_staff=True)
+        token = str(RefreshToken.for_user(user).access_token)
+        response = await self.async_client.get(f'/api/accounts/events/?token={token}')
+        self.assertEqual(response.status_code, 401)  # JWTs don't go in URLs
+
+        ticket, _ = events.issue_ticket(user.pk)
+        response = await self.async_client.get(f'/api/accounts/events/?channels=product&ticket={ticket}')
+        self.assertEqual((response.status_code, response['Content-Type']), (200, 'text/event-stream'))
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+        await stream.aclose()
+
+        response = await self.async_client.get(f'/api/accounts/events/?ticket={ticket}')
+        self.assertEqual(response.status_code, 401)
+
+
+# ===============================================
+# RATE LIMITING
+# ===============================================
+class TokenBucketTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_workers_share_one_budget(self):
+        # Two stores stand in for two worker processes using the same cache.
+        workers = [CacheBucketStore(), CacheBucketStore()]
+        allowed = [workers[i % 2].consume('login:ip:1', 5, 10 / 60, now=1000.0) == 0 for i in range(8)]
+        self.assertEqual(allowed, [True] * 5 + [False] * 3)
+
+    def test_bucket_refills_at_rate(self):
+        store = CacheBucketStore()
+        for _ in range(5):
+            store.consume('login:ip:1', 5, 10 / 60, now=1000.0)
+        wait = store.consume('login:ip:1', 5, 10 / 60, now=1001.0)
+        self.assertGreater(wait, 0)
+        self.assertEqual(store.consume('login:ip:1', 5, 10 / 60, now=1001.0 + wait), 0)
+
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def test_login_returns_429_with_retry_after(self):
+        responses = [self.client.post('/api/accounts/login/', {'username': 'nobody', 'password': 'x'})
+                     for _ in range(6)]
+        self.assertNotEqual(responses[4].status_code, 429)
+        self.assertEqual(responses[5].status_code, 429)
+        self.assertIn('Retry-After', responses[5])
+
+    @override_settings(ALLOWED_HOSTS=['*'], PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_forwarded_for_does_not_pick_the_bucket(self):
+        codes = [self.client.post('/api/accounts/register/user/',
+                                  {'username': f'new{i}', 'email': f'new{i}@example.com', 'password': 'pw-12345'},
+                                  HTTP_X_FORWARDED_FOR=f'10.0.0.{i}').status_code
+                 for i in range(5)]
+        self.assertEqual(codes, [201] * 3 + [429] * 2)
+
+
+# ===============================================
+# IDEMPOTENCY KEYS
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class IdempotencyTests(TestCase):
+    url = '/api/accounts/orders/'
+
+    def setUp(self):
+        cache.clear()
+        self.customer = make_user('customer')
+        self.client = client_for(self.customer)
+        self.service = Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'))
+
+    def order(self, key, service=None):
+        return self.client.post(self.url, {'service': (service or self.service).pk}, format='json',
+                                HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_the_first_response(self):
+        first = self.order('retry-1')
+        replay = self.order('retry-1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_other_payload_with_same_key_is_refused(self):
+        self.order('retry-2')
+        other = Service.objects.create(name='Trim', duration='30 mins', cost=Decimal('150.00'))
+        response = self.order('retry-2', service=other)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_key_still_in_progress_is_refused(self):
+        # What a second worker sees while the first still holds the key.
+        digest = hashlib.sha256(f"{self.customer.pk}:{self.url}:retry-3".encode()).hexdigest()
+        cache.add(f"idem:lock:{digest}", 1, 30)
+        response = self.order('retry-3')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_deploy_check_refuses_a_process_local_cache(self):
+        self.assertIn('accounts.E002', [error.id for error in check_shared_caches(None)])
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                              'LOCATION': 'redis://127.0.0.1:6379/0'}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_shared_caches(None), [])
+
+
+# ===============================================
+# STOCK LEDGER
+# ===============================================
+class StockLedgerTests(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(name='Shampoo', price=Decimal('99.99'), stocks=10, reorder_point=5)
+
+    def movements(self):
+        return list(StockMovement.all_branches.filter(product=self.product).order_by('id')
+                    .values_list('reason', 'delta', 'stocks_after'))
+
+    def assertLedgerMatchesStock(self):
+        self.product.refresh_from_db()
+        self.assertEqual(sum(delta for _, delta, _ in self.movements()), self.product.stocks)
+
+    def test_create_and_inventory_changes_are_recorded(self):
+        apply_changes(Product, [{'id': self.product.pk, 'stocks_delta': -4}])
+        self.assertEqual(self.movements(), [('initial', 10, 10), ('adjustment', -4, 6)])
+        self.assertLedgerMatchesStock()
+
+    def test_edit_is_priced_from_the_stored_level(self):
+        stale = Product.objects.get(pk=self.product.pk)  # Loaded at 10
+        apply_changes(Product, [{'id': self.product.pk, 'stocks_delta': -4}])  # Now 6
+        stale.stocks = 20
+        stale.save()
+        self.assertEqual(self.movements()[-1], ('edit', 14, 20))
+        self.assertLedgerMatchesStock()
+
+    def test_saving_other_columns_records_nothing(self):
+        self.product.name = 'Dog shampoo'
+        self.product.save(update_fields=['name'])
+        self.assertEqual(len(self.movements()), 1)
+
+    def test_only_a_worse_state_alerts(self):
+        pk = self.product.pk
+        self.assertEqual(check_reorder_points([(pk, (10, 5), (3, 5))]), [(pk, 'low_stock')])
+        self.assertEqual(check_reorder_points([(pk, (3, 5), (2, 5))]), [])
+        self.assertEqual(check_reorder_points([(pk, (2, 5), (0, 5))]), [(pk, 'out_of_stock')])
+        self.assertEqual(check_reorder_points([(pk, (0, 5), (8, 5))]), [])
+
+
+# ===============================================
+# COALESCED INVENTORY CHANGES
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class InventoryChangesTests(TestCase):
+    url = '/api/accounts/inventory/changes/'
+
+    def setUp(self):
+        self.product = Product.objects.create(name='Shampoo', price=Decimal('99.99'), stocks=10, reorder_point=5)
+        self.client = client_for(make_user('admin', is_staff=True, role='admin'))
+
+    def stocks(self):
+        self.product.refresh_from_db()
+        return self.product.stocks
+
+    def test_changes_to_one_row_are_folded(self):
+        folded = coalesce(Product, [{'id': 1, 'stocks': 4}, {'id': 1, 'stocks_delta': 2},
+                                    {'id': 2, 'toggle': True}, {'id': 2, 'toggle': True}])
+        self.assertEqual(folded, {1: (('set', 6), None)})
+
+    def test_booleans_are_not_integers(self):
+        for change in ({'id': True, 'stocks': 1}, {'id': 1, 'stocks': True}, {'id': 1, 'stocks_delta': False}):
+            with self.assertRaises(ChangeError):
+                coalesce(Product, [change])
+
+    def test_stock_cannot_go_negative(self):
+        with self.assertRaises(ChangeError):
+            coalesce(Product, [{'id': self.product.pk, 'stocks': -1}])
+        with self.assertRaises(ChangeError):
+            apply_changes(Product, [{'id': self.product.pk, 'stocks_delta': -11}])
+        self.assertEqual(self.stocks(), 10)
+        self.assertEqual(StockMovement.all_branches.filter(product=self.product).count(), 1)  # Just 'initial'
+
+    def test_view_applies_and_rejects(self):
+        response = self.client.post(self.url, {'products': [{'id': self.product.pk, 'stocks_delta': -10}]},
+                                    format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['products']['updated'][0]['stocks'], 0)
+        for body in ([{'id': self.product.pk}], {'products': [{'id': self.product.pk, 'stocks_delta': -1}]},
+                     {'products': [{'id': self.product.pk, 'stocks': True}]}):
+            self.assertEqual(self.client.post(self.url, body, format='json').status_code, 400)
+        self.assertEqual(self.stocks(), 0)
+
+
+# ===============================================
+# ORDER / APPOINTMENT STATUS TRANSITIONS
+# ===============================================
+class TransitionTests(TestCase):
+    def setUp(self):
+        self.customer = make_user('customer')
+        self.service = Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'))
+
+    def orders(self, *statuses):
+        return [Order.objects.create(user=self.customer, service=self.service, total_cost=Decimal('250.00'),
+                                     status=status).pk for status in statuses]
+
+    def statuses(self, ids):
+        return list(Order.objects.filter(id__in=ids).order_by('id').values_list('status', flat=True))
+
+    def test_only_allowed_moves_are_applied_and_logged(self):
+        ids = self.orders('Pending', 'Confirmed', 'Completed', 'Cancelled')
+        result = apply_transition(Order, ids + [9999], 'Cancelled', reason='closing')
+        self.assertEqual(result['updated'], ids[:2])
+        self.assertEqual(result['skipped'], [{'id': ids[2], 'status': 'Completed'},
+                                             {'id': ids[3], 'status': 'Cancelled'}])
+        self.assertEqual(result['not_found'], [9999])
+        self.assertEqual(self.statuses(ids), ['Cancelled'] * 2 + ['Completed', 'Cancelled'])
+        log = StatusChangeLog.objects.get()
+        self.assertEqual((log.object_ids, log.from_counts), (ids[:2], {'Pending': 1, 'Confirmed': 1}))
+
+    def test_final_statuses_and_unknown_targets(self):
+        self.assertEqual(apply_transition(Order, self.orders('Completed'), 'Confirmed')['updated'], [])
+        self.assertFalse(StatusChangeLog.objects.exists())
+        with self.assertRaises(TransitionError):
+            apply_transition(Order, self.orders('Pending'), 'Shipped')
+
+    def test_stale_read_only_moves_rows_still_at_the_source(self):
+        ids = self.orders('Pending', 'Pending', 'Pending')
+        Order.objects.filter(pk=ids[1]).update(status='Cancelled')  # Changed after the caller's read
+        self.assertEqual(_move(Order, ids, 'Pending', 'Confirmed'), [ids[0], ids[2]])
+        self.assertEqual(self.statuses(ids), ['Confirmed', 'Cancelled', 'Confirmed'])
+
+    def test_log_and_result_follow_the_rows_the_update_matched(self):
+        ids = self.orders('Pending', 'Pending')
+
+        def move_after_concurrent_cancel(model, pks, source, target):
+            Order.objects.filter(pk=ids[0]).update(status='Cancelled')
+            return _move(model, pks, source, target)
+
+        with mock.patch.object(transitions, '_move', move_after_concurrent_cancel):
+            result = apply_transition(Order, ids, 'Confirmed')
+        self.assertEqual(result['updated'], [ids[1]])
+        self.assertEqual(result['skipped'], [{'id': ids[0], 'status': 'Cancelled'}])
+        log = StatusChangeLog.objects.get()
+        self.assertEqual((log.object_ids, log.from_counts), ([ids[1]], {'Pending': 1}))
+
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def test_bulk_view_validates_the_body(self):
+        client = client_for(make_user('staff', is_staff=True, role='admin'))
+        ids = self.orders('Pending')
+        for body in ([ids[0]], 'ids', {'ids': [True], 'status': 'Cancelled'}, {'ids': ids, 'status': ['Cancelled']},
+                     {'ids': ids, 'status': 'Shipped'}):
+            self.assertEqual(client.post('/api/accounts/orders/status/', body, format='json').status_code, 400)
+        response = client.post('/api/accounts/orders/status/', {'ids': ids, 'status': 'Cancelled'}, format='json')
+        self.assertEqual((response.status_code, response.data['updated']), (200, ids))
+
+
+# ===============================================
+# BACKGROUND JOBS
+# ===============================================
+calls = []
+
+
+@job(queue='tests', max_attempts=2)
+def record_call(value, fail=False):
+    if fail:
+        raise RuntimeError('boom')
+    calls.append(value)
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_queues_json_args_or_runs_eagerly(self):
+        row = record_call.delay(1, fail=False)
+        self.assertEqual((row.queue, row.name, row.payload), ('tests', 'accounts.tests.record_call',
+                                                              {'args': [1], 'kwargs': {'fail': False}}))
+        self.assertEqual(calls, [])
+        with self.settings(JOBS_EAGER=True):
+            self.assertIsNone(record_call.delay(2))
+        self.assertEqual(calls, [2])
+
+    def test_run_worker_burst(self):
+        record_call.delay(1)
+        record_call.delay(2)
+        out = io.StringIO()
+        call_command('run_worker', '--queues', 'tests', '--burst', stdout=out)
+        self.assertIn('Processed 2 job(s).', out.getvalue())
+        self.assertEqual(sorted(calls), [1, 2])
+        self.assertEqual(set(Job.objects.filter(queue='tests').values_list('status', flat=True)), {'done'})
+
+    def test_failures_back_off_then_fail(self):
+        row = record_call.delay(1, fail=True)
+        self.assertEqual(work(['tests'], burst=True), 1)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), ('queued', 1))
+        self.assertGreater(row.run_at, timezone.now())  # Backed off
+        self.assertIn('RuntimeError', row.last_error)
+
+        Job.objects.filter(pk=row.pk).update(run_at=timezone.now())
+        work(['tests'], burst=True)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), ('failed', 2))
+
+    def test_housekeeping_requeues_stale_and_schedules_one_prune(self):
+        long_ago = timezone.now() - timedelta(hours=2)
+        retry = record_call.delay(1)
+        spent = record_call.delay(2)
+        Job.objects.filter(pk=retry.pk).update(status='running', started_at=long_ago, attempts=1)
+        Job.objects.filter(pk=spent.pk).update(status='running', started_at=long_ago, attempts=2)
+        housekeeping()
+        housekeeping()
+        self.assertEqual(Job.objects.get(pk=retry.pk).status, 'queued')
+        self.assertEqual(Job.objects.get(pk=spent.pk).status, 'failed')
+        prune = Job.objects.get(name=prune_finished_jobs.job_name)
+        self.assertGreater(prune.run_at, timezone.now())
+
+    def test_prune_keeps_recent_and_unfinished_jobs(self):
+        old, recent, queued = (record_call.delay(n) for n in range(3))
+        Job.objects.filter(pk=old.pk).update(status='done', finished_at=timezone.now() - timedelta(days=8))
+        Job.objects.filter(pk=recent.pk).update(status='done', finished_at=timezone.now())
+        prune_finished_jobs()
+        self.assertEqual(sorted(Job.objects.values_list('pk', flat=True)), [recent.pk, queued.pk])
+
+    def test_queue_stats(self):
+        record_call.delay(1)
+        record_call.delay(2)
+        work(['tests'], burst=True, max_jobs=1)
+        stats = queue_stats()
+        self.assertEqual(stats['depth']['tests'], {'done': 1, 'queued': 1})
+        self.assertEqual(stats['sampled'], 1)
+        self.assertGreaterEqual(stats['run_p95'], 0)
+
+
+# ===============================================
+# DENORMALIZED COUNTERS
+# ===============================================
+class CounterTests(TestCase):
+    def setUp(self):
+        self.alice, self.bob = make_user('alice'), make_user('bob')
+        self.bath = Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'))
+        self.trim = Service.objects.create(name='Trim', duration='1 hour', cost=Decimal('150.00'))
+
+    def counts(self):
+        services = dict(Service.all_branches.values_list('name', 'order_count'))
+        profiles = dict(UserProfile.objects.values_list('user__username', 'order_count'))
+        return services, profiles
+
+    def test_orders_move_between_counters(self):
+        order = Order.objects.create(user=self.alice, service=self.bath, total_cost=Decimal('250.00'))
+        self.assertEqual(self.counts(), ({'Bath': 1, 'Trim': 0}, {'alice': 1, 'bob': 0}))
+
+        stale = Order.objects.get(pk=order.pk)
+        moved = Order.objects.get(pk=order.pk)
+        moved.user = self.bob
+        moved.save()
+        self.assertEqual(self.counts(), ({'Bath': 1, 'Trim': 0}, {'alice': 0, 'bob': 1}))
+        # The stale copy writes user=alice back; it is priced against the stored row (bob)
+        stale.service = self.trim
+        stale.save()
+        self.assertEqual(self.counts(), ({'Bath': 0, 'Trim': 1}, {'alice': 1, 'bob': 0}))
+
+        Order.objects.get(pk=order.pk).delete()
+        self.assertEqual(self.counts(), ({'Bath': 0, 'Trim': 0}, {'alice': 0, 'bob': 0}))
+
+    def test_loading_and_unrelated_saves_skip_the_lookup(self):
+        order = Order.objects.create(user=self.alice, service=self.bath, total_cost=Decimal('250.00'))
+        with CaptureQueriesContext(connection) as queries:
+            order = Order.objects.get(pk=order.pk)
+            order.status = 'Confirmed'
+            order.save(update_fields=['status'])
+        reads = [q for q in queries.captured_queries if q['sql'].startswith('SELECT "accounts_order"')]
+        self.assertEqual(len(reads), 1)  # Just the get(); the counters don't re-read the row
+
+    def test_pet_owner_and_feedback_rating(self):
+        pet = PetProfile.objects.create(pet_name='Rex', pet_breed='Beagle', age='2 Years', owner=self.alice)
+        pet.owner = self.bob
+        pet.save(update_fields=['owner'])
+        self.assertEqual(dict(UserProfile.objects.values_list('user__username', 'pet_count')), {'alice': 0, 'bob': 1})
+
+        feedback = Feedback.objects.create(user=self.alice, rating=2, feedback_text='Slow')
+        feedback.rating = 5
+        feedback.save()
+        summary = FeedbackSummary.load()
+        self.assertEqual((summary.feedback_count, summary.rating_total, summary.rating_2, summary.rating_5),
+                         (1, 5, 0, 1))
+
+    def test_reconcile_repairs_drift(self):
+        Order.objects.create(user=self.alice, service=self.bath, total_cost=Decimal('250.00'))
+        Feedback.objects.create(user=self.alice, rating=4, feedback_text='Good')
+        Service.all_branches.update(order_count=7)
+        FeedbackSummary.objects.update(rating_total=0)
+
+        drift = counters.reconcile(dry_run=True)
+        self.assertEqual((drift['Service.order_count'], drift['FeedbackSummary']), (2, 1))
+        self.assertEqual(Service.all_branches.get(pk=self.bath.pk).order_count, 7)
+
+        counters.reconcile()
+        self.assertEqual(self.counts()[0], {'Bath': 1, 'Trim': 0})
+        self.assertEqual(FeedbackSummary.load().rating_total, 4)
+        self.assertFalse(any(counters.reconcile(dry_run=True).values()))
+
+
+# ===============================================
+# STAFF LIST FILTERS
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class StaffListTests(TestCase):
+    url = '/api/accounts/users/staff/'
+
+    def setUp(self):
+        self.admin = make_user('admin', is_staff=True, role='admin')
+        make_user('manager_a', is_staff=True, role='manager', branch='A')
+        make_user('manager_b', is_staff=True, role='manager', branch='B')
+        make_user('customer')
+        gone = make_user('gone', is_staff=True, role='manager', branch='A')
+        UserProfile.objects.filter(user=gone).update(status='Deleted', deleted_at=timezone.now())
+        UserProfile.objects.filter(user__username='manager_b').update(status='Blocked')
+        self.client = client_for(self.admin)
+
+    def usernames(self, query=''):
+        response = self.client.get(self.url + query)
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['username'] for row in response.json())
+
+    def test_filters_combine(self):
+        self.assertEqual(self.usernames(), ['admin', 'customer', 'manager_a', 'manager_b'])
+        self.assertEqual(self.usernames('?role=admin,manager'), ['admin', 'manager_a', 'manager_b'])
+        self.assertEqual(self.usernames('?role=manager&branch=A'), ['manager_a'])
+        self.assertEqual(self.usernames('?role=manager&status=Blocked'), ['manager_b'])
+        self.assertEqual(self.usernames('?role=,&status='), self.usernames())  # Empty values are ignored
+
+    def test_count_and_access(self):
+        self.assertEqual(self.client.get(self.url + '?role=admin,manager&count=1').json(), {'count': 3})
+        self.assertEqual(client_for(User.objects.get(username='customer')).get(self.url).status_code, 403)
+
+
+# ===============================================
+# PUBLIC FEEDBACK GALLERY
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'], FEEDBACK_GALLERY={'PAGE_SIZE': 2, 'MAX_PAGE_SIZE': 3, 'CACHE_TTL': 300})
+class FeedbackGalleryTests(TestCase):
+    url = '/api/accounts/feedback/gallery/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = make_user('alice')
+        for rating in (5, 4, 3, 5, 1):
+            Feedback.objects.create(user=self.user, rating=rating, feedback_text=f'{rating} stars')
+        # Same timestamp for several rows: the id breaks the tie
+        Feedback.objects.filter(rating=5).update(submitted_at=Feedback.objects.get(rating=3).submitted_at)
+
+    def test_cursor_walks_every_row_once_newest_first(self):
+        seen, cursor = [], None
+        while True:
+            page = self.client.get(self.url + (f'?cursor={cursor}' if cursor else '')).json()
+            self.assertLessEqual(len(page['results']), 2)
+            self.assertEqual('summary' in page, cursor is None)  # First page only
+            seen += [row['id'] for row in page['results']]
+            cursor = page['next']
+            if cursor is None:
+                break
+        expected = list(Feedback.objects.order_by('-submitted_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_limit_and_bad_cursor(self):
+        self.assertEqual(len(self.client.get(self.url + '?limit=50').json()['results']), 3)
+        self.assertEqual(self.client.get(self.url + '?cursor=nope').status_code, 400)
+        self.assertEqual(self.client.get(self.url + '?limit=x').status_code, 400)
+
+    def test_first_page_and_summary_come_from_the_cache(self):
+        first = self.client.get(self.url).json()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).json(), first)
+            summary = self.client.get('/api/accounts/feedback/summary/').json()
+        self.assertEqual((summary['count'], summary['average_rating']), (5, 3.6))
+        self.assertEqual(summary['histogram'], {'1': 1, '2': 0, '3': 1, '4': 1, '5': 2})
+
+    def test_a_new_feedback_rewrites_the_cache(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            newest = Feedback.objects.create(user=self.user, rating=2, feedback_text='Late')
+        page = self.client.get(self.url).json()
+        self.assertEqual(page['results'][0]['id'], newest.pk)
+        self.assertEqual(page['summary']['count'], 6)
+
+
+# ===============================================
+# API-ONLY SETTINGS PROFILE
+# ===============================================
+class ApiSettingsProfileTests(SimpleTestCase):
+    # Each case runs in a fresh interpreter, the way a worker starts
+
+    def test_first_request_and_system_check(self):
+        startup._run(['-c', startup.FIRST_REQUEST], 'backend.settings_api')
+        _, result = startup._run(['manage.py', 'check'], 'backend.settings_api')
+        self.assertIn('no issues', result.stdout)
+
+    def test_admin_sessions_and_browsable_api_are_left_out(self):
+        script = (
+            "import django; django.setup()\n"
+            "from django.conf import settings\n"
+            "from django.urls import Resolver404, resolve\n"
+            "assert 'django.contrib.admin' not in settings.INSTALLED_APPS\n"
+            "assert not any('sessions' in m or 'csrf' in m for m in settings.MIDDLEWARE)\n"
+            "assert settings.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] == ('accounts.renderers.FastJSONRenderer',)\n"
+            "assert resolve('/api/accounts/services/')\n"
+            "try:\n    resolve('/admin/')\nexcept Resolver404:\n    pass\n"
+            "else:\n    raise AssertionError('admin is mounted')\n"
+        )
+        startup._run(['-c', script], 'backend.settings_api')
+
+
+# ===============================================
+# PRODUCTION LAUNCHER (serve.py)
+# ===============================================
+@mock.patch.dict(os.environ)
+@mock.patch('serve.os.cpu_count', return_value=4)
+@mock.patch('serve.importlib.util.find_spec', return_value=object())
+class ServeLauncherTests(SimpleTestCase):
+
+    def dry_run(self, *args):
+        out = io.StringIO()
+        with mock.patch('serve.os.name', 'posix'), mock.patch('sys.stdout', out):
+            serve.main(['--dry-run', *args])
+        return out.getvalue().split()
+
+    def option(self, command, name):
+        return command[command.index(name) + 1]
+
+    def test_wsgi_defaults(self, *mocks):
+        command = self.dry_run()
+        self.assertIn('backend.wsgi:application', command)
+        self.assertIn('--preload', command)
+        self.assertEqual(self.option(command, '--worker-class'), 'gthread')
+        self.assertEqual(self.option(command, '--workers'), '5')  # One per core plus one
+        self.assertEqual(self.option(command, '--threads'), '4')
+        self.assertEqual(self.option(command, '--max-requests-jitter'), '100')
+        self.assertEqual(os.environ['DJANGO_SETTINGS_MODULE'], 'backend.settings_production')
+
+    def test_asgi_and_overrides(self, *mocks):
+        command = self.dry_run('--asgi', '--max-requests', '0')
+        self.assertIn('backend.asgi:application', command)
+        self.assertEqual(self.option(command, '--worker-class'), 'uvicorn.workers.UvicornWorker')
+        self.assertEqual(self.option(command, '--workers'), '4')
+        self.assertEqual(self.option(command, '--threads'), '1')
+        self.assertEqual(self.option(command, '--max-requests-jitter'), '0')
+        self.assertEqual(self.option(self.dry_run('--workers', '2'), '--workers'), '2')
+
+    def test_missing_server_package(self, find_spec, cpu_count):
+        find_spec.return_value = None
+        with self.assertRaisesMessage(SystemExit, 'pip install gunicorn'):
+            self.dry_run()
+
+    def test_refuses_to_start_when_the_deploy_check_fails(self, *mocks):
+        with mock.patch('serve.os.name', 'posix'), mock.patch('serve.os.chdir'), \
+                mock.patch('serve.subprocess.run', return_value=mock.Mock(returncode=1)) as run, \
+                mock.patch('serve.os.execv') as execv:
+            with self.assertRaises(SystemExit):
+                serve.main([])
+        self.assertIn('--deploy', run.call_args.args[0])
+        execv.assert_not_called()
+
+
+# ===============================================
+# QUERY PLAN GUARD
+# ===============================================
+class QueryPlanTests(TestCase):
+
+    def test_current_schema_matches_the_baseline(self):
+        out = io.StringIO()
+        call_command('explain_queries', '--check', stdout=out)
+        self.assertIn('No query plan regressions.', out.getvalue())
+
+    def test_dropped_index_fails_the_check(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX loginactivity_time_idx')  # Rolled back with the test
+        expected = 'login activity: SCAN accounts_loginactivity, SORT accounts_loginactivity'
+        with self.assertRaisesMessage(CommandError, expected):
+            call_command('explain_queries', '--check', stdout=io.StringIO())
+
+    def test_index_advice(self):
+        sql = ('SELECT "accounts_order"."id" FROM "accounts_order" WHERE ("accounts_order"."status" = %s '
+               'AND "accounts_order"."order_date" > %s) ORDER BY "accounts_order"."order_date" DESC')
+        self.assertEqual(query_plans.suggest_index(sql, 'accounts_order'), ['status', 'order_date'])
+        sql = 'SELECT "accounts_order"."id" FROM "accounts_order" ORDER BY "accounts_order"."order_date" DESC'
+        self.assertEqual(query_plans.suggest_index(sql, 'accounts_order'), ['-order_date'])
+        self.assertEqual(query_plans.explain(sql, ()), [])  # order_date_idx
+        self.assertLessEqual(len(query_plans.index_name(Order, ['user', 'service', '-order_date', 'status'])), 30)
+
+    def test_only_new_problems_are_regressions(self):
+        findings = {'orders': {'SORT accounts_order': None, 'SCAN accounts_service': None}, 'pets': {}}
+        baseline = {'orders': ['SORT accounts_order']}
+        self.assertEqual(query_plans.regressions(findings, baseline), {'orders': ['SCAN accounts_service']})
+
+
+# ===============================================
+# HOT-OBJECT CACHE
+# ===============================================
+class HotObjectTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        hot_objects.clear()
+        self.addCleanup(hot_objects.clear)
+        self.service = Service.all_branches.create(name='Bath', duration='1 hour', cost=Decimal('10.00'), branch='A')
+
+    def test_repeat_lookups_skip_the_database(self):
+        first = hot_objects.get(Service, self.service.pk)
+        with self.assertNumQueries(0):
+            second = hot_objects.get(Service, self.service.pk)
+        self.assertIsNot(first, second)  # Fresh instance per call
+        self.assertEqual((second.name, second.cost), ('Bath', Decimal('10.00')))
+        self.assertIsNone(hot_objects.get(Service, self.service.pk + 100))
+
+    def test_saves_invalidate_once_committed(self):
+        hot_objects.get(Service, self.service.pk)
+        self.service.cost = Decimal('12.50')
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.service.save()
+        self.assertEqual(hot_objects.get(Service, self.service.pk).cost, Decimal('10.00'))  # Not committed yet
+        for callback in callbacks:
+            callback()
+        self.assertEqual(hot_objects.get(Service, self.service.pk).cost, Decimal('12.50'))
+
+    def test_bulk_inventory_changes_invalidate(self):
+        hot_objects.get(Service, self.service.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_changes(Service, [{'id': self.service.pk, 'availability': False}])
+        self.assertFalse(hot_objects.get(Service, self.service.pk).availability)
+
+    def test_branch_scoping(self):
+        head_office = Service.all_branches.create(name='Trim', duration='1 hour', cost=Decimal('5.00'))
+        token = set_current_branch('B')
+        try:
+            self.assertIsNone(hot_objects.get(Service, self.service.pk))
+            self.assertEqual(hot_objects.get(Service, head_office.pk).name, 'Trim')
+        finally:
+            reset_current_branch(token)
+        self.assertEqual(hot_objects.get(Service, self.service.pk).name, 'Bath')
+
+    @override_settings(HOT_OBJECT_CACHE={'MAX_ENTRIES': 2})
+    def test_least_recently_used_entry_is_evicted(self):
+        others = [Service.all_branches.create(name=f'S{i}', duration='1 hour', cost=Decimal('1.00')) for i in range(2)]
+        for service in (self.service, *others):
+            hot_objects.get(Service, service.pk)
+        with self.assertNumQueries(0):
+            hot_objects.get(Service, others[1].pk)
+        with self.assertNumQueries(1):
+            hot_objects.get(Service, self.service.pk)
+
+
+# ===============================================
+# DASHBOARD SUMMARY
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class DashboardSummaryTests(TestCase):
+    url = '/api/accounts/dashboard/summary/'
+
+    def setUp(self):
+        cache.clear()
+        self.admin = make_user('admin', is_staff=True, role='admin')
+        self.manager = make_user('manager', is_staff=True, role='manager', branch='A')
+        self.customer = make_user('carol')
+        today = timezone.localdate().isoformat()
+        tomorrow = (timezone.localdate() + timedelta(days=1)).isoformat()
+        bath = Service.all_branches.create(name='Bath', duration='1 hour', cost=Decimal('10.00'), branch='A')
+        trim = Service.all_branches.create(name='Trim', duration='1 hour', cost=Decimal('5.00'), branch='B')
+        for service, status_ in ((bath, 'Confirmed'), (bath, 'Completed'), (bath, 'Cancelled'), (trim, 'Confirmed')):
+            Appointment.all_branches.create(user=self.customer, service=service, appointment_date=today, status=status_)
+        Appointment.all_branches.create(user=self.customer, service=bath, appointment_date=tomorrow)
+        Order.all_branches.create(user=self.customer, service=bath, total_cost=Decimal('10.00'), status='Completed')
+        Order.all_branches.create(user=self.customer, service=trim, total_cost=Decimal('5.00'), status='Completed')
+        Order.all_branches.create(user=self.customer, service=trim, total_cost=Decimal('5.00'))
+        Product.all_branches.create(name='Shampoo', price=Decimal('3.00'), stocks=2, branch='A')
+        Product.all_branches.create(name='Brush', price=Decimal('4.00'), stocks=0, branch='B')
+        Product.all_branches.create(name='Collar', price=Decimal('6.00'), stocks=40, branch='B')
+        Feedback.objects.create(user=self.customer, rating=4, feedback_text='Good')
+
+    def test_staff_only(self):
+        self.assertEqual(client_for(self.customer).get(self.url).status_code, 403)
+
+    def test_all_branches(self):
+        data = client_for(self.admin).get(self.url).json()
+        self.assertEqual(data['bookings'], {'today': 3, 'today_completed': 1, 'today_cancelled': 1, 'upcoming': 1})
+        self.assertEqual(data['orders'], {'pending': 1, 'today': 3, 'revenue_today': '15.00'})
+        self.assertEqual(data['products'], {'total': 3, 'low_stock': 1, 'out_of_stock': 1})
+        self.assertEqual(data['users'], {'customers': 1, 'new_today': 1, 'new_this_week': 1})
+        self.assertEqual(data['feedback'], {'count': 1, 'average_rating': 4.0})
+
+    def test_branch_staff_get_their_branch(self):
+        data = client_for(self.manager).get(self.url).json()
+        self.assertEqual(data['bookings'], {'today': 2, 'today_completed': 1, 'today_cancelled': 1, 'upcoming': 1})
+        self.assertEqual(data['orders'], {'pending': 0, 'today': 1, 'revenue_today': '10.00'})
+        self.assertEqual(data['products'], {'total': 1, 'low_stock': 1, 'out_of_stock': 0})
+
+    def test_one_query_per_table(self):
+        with self.assertNumQueries(5):
+            dashboard.compute()
+
+    def test_cached_per_branch(self):
+        admin, manager = client_for(self.admin), client_for(self.manager)
+        self.assertEqual(admin.get(self.url).json()['orders']['pending'], 1)
+        self.assertEqual(manager.get(self.url).json()['orders']['pending'], 0)
+        Order.all_branches.create(user=self.customer, service=Service.all_branches.get(name='Bath'),
+                                  total_cost=Decimal('10.00'))
+        self.assertEqual(admin.get(self.url).json()['orders']['pending'], 1)  # Served from the cache
+        cache.clear()
+        self.assertEqual(admin.get(self.url).json()['orders']['pending'], 2)
+
+
+# ===============================================
+# ACCOUNT SOFT DELETE, PURGE & BLOCKING
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class AccountDeletionTests(TestCase):
+    def setUp(self):
+        self.admin = client_for(make_user('admin', is_staff=True, role='admin'))
+        self.customer = make_user('customer')
+        service = Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'))
+        Order.objects.create(user=self.customer, service=service, total_cost=Decimal('250.00'))
+        PetProfile.objects.create(pet_name='Rex', pet_breed='Beagle', age='2 Years', owner=self.customer)
+        self.feedback = Feedback.objects.create(user=self.customer, rating=5, feedback_text='Great')
+
+    def delete_customer(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.admin.delete(f'/api/accounts/users/{self.customer.pk}/')
+        self.assertEqual(response.status_code, 202)
+
+    def test_delete_tombstones_then_purges(self):
+        self.delete_customer()
+        self.customer.refresh_from_db()
+        self.assertFalse(self.customer.is_active)
+        self.assertEqual(self.customer.userprofile.status, 'Deleted')
+        self.assertTrue(Order.objects.filter(user=self.customer).exists())  # Still there until the job runs
+
+        self.assertEqual(work(['maintenance'], burst=True), 1)
+        self.assertFalse(User.objects.filter(pk=self.customer.pk).exists())
+        self.assertFalse(Order.all_branches.exists())
+        self.assertFalse(PetProfile.all_branches.exists())
+        self.feedback.refresh_from_db()
+        self.assertIsNone(self.feedback.user_id)  # Kept, detached
+
+    def test_deleted_user_cannot_be_blocked_or_unblocked(self):
+        self.delete_customer()
+        response = self.admin.post('/api/accounts/block-user/customer/')
+        self.assertEqual(response.status_code, 409)
+        self.customer.refresh_from_db()
+        self.assertFalse(self.customer.is_active)
+
+    def test_purge_skips_a_reactivated_user(self):
+        self.delete_customer()
+        User.objects.filter(pk=self.customer.pk).update(is_active=True)
+        work(['maintenance'], burst=True)
+        self.assertTrue(User.objects.filter(pk=self.customer.pk).exists())
+        self.assertTrue(Order.all_branches.exists())
+
+    def test_block_toggles(self):
+        self.assertEqual(self.admin.post('/api/accounts/block-user/customer/').status_code, 200)
+        self.assertEqual(UserProfile.objects.get(user=self.customer).status, 'Blocked')
+        self.admin.post('/api/accounts/block-user/customer/')
+        self.customer.refresh_from_db()
+        self.assertTrue(self.customer.is_active)
+
+
+# ===============================================
+# PET PROFILES & VISIT HISTORY
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class PetProfileTests(TestCase):
+    def setUp(self):
+        self.staff = make_user('staff', is_staff=True, role='admin')
+        self.alice, self.bob = make_user('alice'), make_user('bob')
+        self.rex = PetProfile.objects.create(pet_name='Rex', pet_breed='Beagle', age='2 Years', owner=self.alice)
+        PetProfile.objects.create(pet_name='Tom', pet_breed='Persian', age='1 Year', owner=self.bob)
+
+    def names(self, client, query=''):
+        response = client.get(f'/api/accounts/pets/{query}')
+        if response.status_code != 200:
+            return response.status_code, None
+        return 200, sorted(pet['pet_name'] for pet in response.data)
+
+    def test_owner_filter(self):
+        staff = client_for(self.staff)
+        self.assertEqual(self.names(staff), (200, ['Rex', 'Tom']))
+        self.assertEqual(self.names(staff, f'?owner={self.bob.pk}'), (200, ['Tom']))
+        self.assertEqual(self.names(staff, '?owner=abc'), (400, None))
+        # Customers always get their own pets, whatever they ask for
+        self.assertEqual(self.names(client_for(self.alice), f'?owner={self.bob.pk}'), (200, ['Rex']))
+
+    def test_age_follows_the_birthdate(self):
+        pet = PetProfile(pet_name='Kit', pet_breed='Siamese', age='3 Months', birthdate=date(2024, 3, 15))
+        self.assertEqual(pet.age_on(date(2024, 4, 15)), '1 Month')
+        self.assertEqual(pet.age_on(date(2025, 3, 14)), '11 Months')
+        self.assertEqual(pet.age_on(date(2027, 3, 15)), '3 Years')
+        pet.birthdate = None
+        self.assertEqual(pet.age_on(date(2027, 3, 15)), '3 Months')  # Stored text as the fallback
+
+    def test_visits_page_newest_first_and_are_append_only(self):
+        start = timezone.now()
+        for day in range(3):
+            PetVisit.objects.create(pet=self.rex, kind='checkup', visited_at=start - timedelta(days=day))
+        client = client_for(self.alice)
+        first = client.get(f'/api/accounts/pets/{self.rex.pk}/visits/?limit=2').data
+        rest = client.get(f'/api/accounts/pets/{self.rex.pk}/visits/?limit=2&cursor={first["next"]}').data
+        visits = [row['id'] for row in first['results'] + rest['results']]
+        self.assertEqual(visits, list(PetVisit.objects.order_by('-visited_at').values_list('id', flat=True)))
+        self.assertIsNone(rest['next'])
+        self.assertEqual(client_for(self.bob).get(f'/api/accounts/pets/{self.rex.pk}/visits/').status_code, 404)
+        with self.assertRaises(ValueError):
+            PetVisit.objects.first().save()
+
+    def test_visit_appointment_must_be_the_owners(self):
+        service = Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'))
+        theirs = Appointment.objects.create(user=self.bob, service=service, appointment_date='2026-01-01')
+        staff = client_for(self.staff)
+        url = f'/api/accounts/pets/{self.rex.pk}/visits/'
+        self.assertEqual(staff.post(url, {'kind': 'checkup', 'appointment': theirs.pk}).status_code, 400)
+        self.assertEqual(client_for(self.alice).post(url, {'kind': 'checkup'}).status_code, 403)
+        response = staff.post(url, {'kind': 'checkup', 'weight_kg': '12.50'})
+        self.assertEqual((response.status_code, response.data['recorded_by']), (201, self.staff.pk))
+
+
+# ===============================================
+# BULK CUSTOMER & PET IMPORT
+# ===============================================
+IMPORT_HEADER = 'username,email,password,pet_name,pet_breed,birthdate,age,allergies,notes\n'
+
+
+@override_settings(ALLOWED_HOSTS=['*'], PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+                   CUSTOMER_IMPORT={'CHUNK_SIZE': 2, 'PROCESSES': 1})
+class CustomerImportTests(TestCase):
+    def setUp(self):
+        self.admin = make_user('admin', is_staff=True, role='admin')
+
+    def run_import(self, body):
+        return import_customers(io.StringIO(IMPORT_HEADER + body), created_by=self.admin).as_dict()
+
+    def test_valid_rows_create_customers_and_pets(self):
+        report = self.run_import(
+            'ana,ana@example.com,s3cret,Brownie,Aspin,2022-01-05,,,\n'
+            'ana,,,Whitey,Shih Tzu,,2 years,,\n'  # Second pet, next chunk
+            'ben,,s3cret,,,,,,\n'
+        )
+        self.assertEqual((report['rows'], report['customers_created'], report['pets_created'],
+                          report['error_count']), (3, 2, 2, 0))
+        ana = User.objects.get(username='ana')
+        self.assertTrue(ana.check_password('s3cret'))
+        self.assertEqual(ana.userprofile.pet_count, 2)
+        self.assertEqual(sorted(PetProfile.all_branches.filter(owner=ana).values_list('pet_name', flat=True)),
+                         ['Brownie', 'Whitey'])
+
+    def test_bad_rows_are_reported_by_line_and_skipped(self):
+        report = self.run_import(
+            'admin,,s3cret,,,,,,\n'       # Line 2: username taken
+            'cara,,,,,,,,\n'              # Line 3: new customer without a password
+            'dan,,s3cret,Rex,,,,,\n'      # Line 4: pet without a breed
+            'eve,,s3cret,,,,,,\n'
+        )
+        self.assertEqual(report['customers_created'], 1)
+        self.assertEqual([(error['line'], list(error['errors'])) for error in report['errors']],
+                         [(2, ['username']), (3, ['password']), (4, ['pet_breed'])])
+        self.assertFalse(User.objects.filter(username__in=['cara', 'dan']).exists())
+
+    def test_integrity_error_reports_the_whole_chunk(self):
+        with mock.patch.object(User.objects, 'bulk_create', side_effect=IntegrityError('UNIQUE constraint failed')):
+            report = self.run_import('fay,,s3cret,,,,,,\ngus,,s3cret,,,,,,\n')
+        self.assertEqual(report['customers_created'], 0)
+        self.assertEqual([error['line'] for error in report['errors']], [2, 3])
+        self.assertIn('UNIQUE constraint failed', report['errors'][0]['errors']['non_field_errors'][0])
+
+
+@override_settings(ALLOWED_HOSTS=['*'], PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+                   CUSTOMER_IMPORT={'CHUNK_SIZE': 2, 'PROCESSES': 1})
+class CustomerImportViewTests(TestCase):
+    url = '/api/accounts/import/customers/'
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media))
+        self.media = media
+        self.client = client_for(make_user('admin', is_staff=True, role='admin'))
+
+    def upload(self, body):
+        return self.client.post(self.url, {'file': SimpleUploadedFile('customers.csv', body.encode())},
+                                format='multipart')
+
+    def test_upload_is_queued_and_progress_recorded_on_the_job(self):
+        response = self.upload(IMPORT_HEADER + 'ana,,s3cret,,,,,,\nadmin,,s3cret,,,,,,\n')
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['job']
+        self.assertFalse(User.objects.filter(username='ana').exists())  # Nothing ran in the request
+
+        self.assertEqual(work(['imports'], burst=True), 1)
+        status = self.client.get(f'{self.url}{job_id}/').json()
+        self.assertEqual(status['status'], 'done')
+        self.assertEqual((status['progress']['customers_created'], status['progress']['error_count']), (1, 1))
+        self.assertTrue(User.objects.filter(username='ana').exists())
+        self.assertEqual(list(Job.objects.filter(pk=job_id).values_list('queue', flat=True)), ['imports'])
+        self.assertEqual(os.listdir(os.path.join(self.media, 'imports')), [])  # Upload removed afterwards
+
+    def test_wrong_header_is_refused_before_queueing(self):
+        response = self.upload('name,email\nana,ana@example.com\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+
+# ===============================================
+# BRANCH SCOPING
+# ===============================================
+@override_settings(ALLOWED_HOSTS=['*'])
+class BranchScopingTests(TestCase):
+    def setUp(self):
+        cache.clear()  # Hot-object snapshots from other tests
+        self.admin = make_user('admin', is_staff=True, role='admin')
+        self.staff_a = make_user('staff_a', is_staff=True, role='manager', branch='A')
+        self.staff_b = make_user('staff_b', is_staff=True, role='manager', branch='B')
+        self.customer = make_user('customer')
+        self.shared = Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'))
+        self.in_a = Service.objects.create(name='Trim', duration='30 mins', cost=Decimal('150.00'), branch='A')
+        self.in_b = Service.objects.create(name='Spa', duration='2 hours', cost=Decimal('900.00'), branch='B')
+
+    def names(self, user, path='services/'):
+        return sorted(row.get('name') or row.get('service_name') for row in
+                      client_for(user).get(f'/api/accounts/{path}').json())
+
+    def test_branch_staff_see_their_branch_and_head_office_rows(self):
+        self.assertEqual(self.names(self.staff_a), ['Bath', 'Trim'])
+        self.assertEqual(self.names(self.staff_b), ['Bath', 'Spa'])
+
+    def test_head_office_and_customers_are_unscoped(self):
+        self.assertEqual(self.names(self.admin), ['Bath', 'Spa', 'Trim'])
+        self.assertEqual(self.names(self.customer), ['Bath', 'Spa', 'Trim'])
+
+    def test_customer_order_takes_the_service_branch_and_stays_visible_to_them(self):
+        response = client_for(self.customer).post('/api/accounts/orders/', {'service': self.in_a.pk}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Order.all_branches.get(pk=response.json()['id']).branch, 'A')
+        self.assertEqual(self.names(self.customer, 'orders/'), ['Trim'])
+        self.assertEqual(self.names(self.staff_a, 'orders/'), ['Trim'])
+        self.assertEqual(self.names(self.staff_b, 'orders/'), [])
+
+    def test_branch_staff_cannot_use_another_branch_service(self):
+        response = client_for(self.staff_b).post('/api/accounts/orders/', {'service': self.in_a.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(client_for(self.staff_b).get(f'/api/accounts/services/{self.in_a.pk}/').status_code, 404)
+
+    def test_rows_created_in_a_branch_context_belong_to_it(self):
+        token = set_current_branch('B')
+        try:
+            service = Service.objects.create(name='Nails', duration='15 mins', cost=Decimal('80.00'))
+            self.assertEqual(service.branch, 'B')
+            self.assertEqual(sorted(Service.objects.values_list('name', flat=True)), ['Bath', 'Nails', 'Spa'])
+            self.assertEqual(Service.all_branches.count(), 4)
+        finally:
+            reset_current_branch(token)
+
+    def test_branch_is_cleared_after_each_request(self):
+        self.names(self.staff_a)
+        self.assertIsNone(get_current_branch())
+
+    def test_branch_databases_setting_is_refused(self):
+        self.assertEqual(check_branch_databases(None), [])
+        with override_settings(BRANCH_DATABASES={'A': 'branch_a'}):
+            self.assertEqual([error.id for error in check_branch_databases(None)], ['accounts.E003'])
+
+
+# ===============================================
+# BATCH REQUESTS
+# ===============================================
+# TransactionTestCase: the sub-requests run on pool threads with their own
+# connections, which can't see rows inside a test transaction.
+@override_settings(ALLOWED_HOSTS=['*'])
+class BatchTests(TransactionTestCase):
+    url = '/api/accounts/batch/'
+
+    def setUp(self):
+        cache.clear()
+        self.staff_a = make_user('staff_a', is_staff=True, role='manager', branch='A')
+        self.alice, self.bob = make_user('alice'), make_user('bob')
+        Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'))
+        trim = Service.objects.create(name='Trim', duration='30 mins', cost=Decimal('150.00'), branch='A')
+        spa = Service.objects.create(name='Spa', duration='2 hours', cost=Decimal('900.00'), branch='B')
+        Order.objects.create(user=self.alice, service=trim, total_cost=Decimal('150.00'))
+        Order.objects.create(user=self.bob, service=spa, total_cost=Decimal('900.00'))
+
+    def batch(self, user, *paths):
+        response = client_for(user).post(self.url, {'requests': [{'path': p} for p in paths]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['responses']
+
+    def test_items_keep_the_callers_identity_and_branch(self):
+        services, orders = self.batch(self.staff_a, '/api/accounts/services/', '/api/accounts/orders/')
+        self.assertEqual(sorted(row['name'] for row in services['body']), ['Bath', 'Trim'])
+        self.assertEqual([row['service_name'] for row in orders['body']], ['Trim'])
+
+        orders, pets = self.batch(self.alice, '/api/accounts/orders/', '/api/accounts/pets/')
+        self.assertEqual([row['username'] for row in orders['body']], ['alice'])
+        self.assertEqual((pets['status'], pets['body']), (200, []))
+
+    def test_one_failing_item_does_not_abort_the_others(self):
+        responses = self.batch(self.staff_a, '/api/accounts/services/', '/api/accounts/pets/?owner=abc',
+                               '/api/accounts/nope/', '/api/accounts/events/', '/admin/', '/api/accounts/batch/')
+        self.assertEqual([r['status'] for r in responses], [200, 400, 404, 400, 400, 400])
+        self.assertEqual(len(responses[0]['body']), 2)  # Still served alongside the failures
+
+    def test_request_shape_and_limit(self):
+        client = client_for(self.staff_a)
+        too_many = {'requests': [{'path': '/api/accounts/services/'}] * 21}
+        self.assertEqual(client.post(self.url, too_many, format='json').status_code, 400)
+        self.assertEqual(len(self.batch(self.staff_a, *['/api/accounts/services/'] * 20)), 20)
+        for body in ({'requests': []}, [{'path': '/api/accounts/services/'}],
+                     {'requests': [{'path': '/api/accounts/orders/', 'method': 'POST'}]}):
+            self.assertEqual(client.post(self.url, body, format='json').status_code, 400)
+        self.assertEqual(APIClient().post(self.url, {'requests': ['/api/accounts/services/']},
+                                          format='json').status_code, 401)
 
-# Create your tests here.
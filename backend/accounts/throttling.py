@@ -0,0 +1,134 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import BaseThrottle
+
+
+# ===============================================
+# TOKEN-BUCKET RATE LIMITING
+# ===============================================
+# Budgets live in settings.RATE_LIMITS as {scope: {'rate': '10/min', 'burst': 5}}:
+# a client may send up to `burst` requests at once and then `rate` on average.
+# The counts live in the RATE_LIMIT_CACHE cache, so every worker sharing it
+# enforces one budget (production settings require a shared backend).
+#
+# A bucket is kept as a sliding window counter: windows last as long as an
+# empty bucket takes to refill (burst / rate), and a request is allowed while
+# the current window's count plus the overlapping share of the previous one
+# stays within `burst`. Counts only change through cache.add() and
+# cache.incr()/decr(), which are atomic on the shared backends, so concurrent
+# requests never overwrite each other's tokens.
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (10, 60). Same format as DRF's DEFAULT_THROTTLE_RATES."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+class CacheBucketStore:
+    """Bucket counts kept in a Django cache (settings.RATE_LIMIT_CACHE)."""
+
+    def __init__(self, alias=None):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias or getattr(settings, 'RATE_LIMIT_CACHE', 'default')]
+
+    def consume(self, key, capacity, refill_per_second, now=None):
+        """Takes one token. Returns 0 on success, else seconds until one is available."""
+        now = time.time() if now is None else now  # Wall clock: shared by every worker
+        window = capacity / refill_per_second
+        index, offset = divmod(now, window)
+        current, previous = f"throttle:{key}:{int(index)}", f"throttle:{key}:{int(index) - 1}"
+        cache = self.cache
+        timeout = math.ceil(2 * window) + 1  # Still there while it is the previous window
+        cache.add(current, 0, timeout)
+        try:
+            count = cache.incr(current)
+        except ValueError:  # Evicted between add() and incr()
+            cache.add(current, 1, timeout)
+            count = 1
+        carried = cache.get(previous, 0) * (1 - offset / window)
+        if count + carried <= capacity:
+            return 0
+        try:
+            cache.decr(current)  # Refused requests don't spend the budget
+        except ValueError:
+            pass
+        return self._wait(count - 1, cache.get(previous, 0), capacity, window, offset)
+
+    @staticmethod
+    def _wait(count, previous, capacity, window, offset):
+        # Until the previous window's share has shrunk enough for one more
+        # request, or failing that into the next window.
+        if count < capacity and previous:
+            return max((1 - (capacity - count - 1) / previous) * window - offset, 0) or 1
+        share = 1 - (capacity - 1) / count if count > capacity - 1 else 0
+        return window - offset + max(share, 0) * window
+
+
+bucket_store = CacheBucketStore()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Per-scope token bucket keyed by client IP and, when known, by user.
+    A request must find a token in every bucket it maps to; DRF turns the
+    returned wait() into a 429 with a Retry-After header.
+    """
+    scope = None
+    store = bucket_store
+
+    def __init__(self):
+        limits = getattr(settings, 'RATE_LIMITS', {})
+        if self.scope not in limits:
+            raise ImproperlyConfigured(f"No RATE_LIMITS entry for throttle scope '{self.scope}'.")
+        count, seconds = parse_rate(limits[self.scope]['rate'])
+        self.refill_per_second = count / seconds
+        self.capacity = limits[self.scope].get('burst', count)
+        self._wait = 0
+
+    def get_user_ident(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return str(user.pk)
+        return None
+
+    def allow_request(self, request, view):
+        keys = [f"{self.scope}:ip:{self.get_ident(request)}"]
+        user_ident = self.get_user_ident(request)
+        if user_ident:
+            keys.append(f"{self.scope}:user:{user_ident}")
+        self._wait = max(self.store.consume(key, self.capacity, self.refill_per_second) for key in keys)
+        return self._wait == 0
+
+    def wait(self):
+        return self._wait or None
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    """Also buckets by the username being tried, to slow credential stuffing."""
+    scope = 'login'
+
+    def get_user_ident(self, request):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not username:
+            return None
+        # Hashed: the username is untrusted input and ends up in a cache key.
+        return f"name:{hashlib.sha256(str(username).lower().encode()).hexdigest()}"
+
+
+class RegisterRateThrottle(TokenBucketThrottle):
+    scope = 'register'
+
+
+class FeedbackRateThrottle(TokenBucketThrottle):
+    scope = 'feedback'
@@ -0,0 +1,111 @@
+from functools import partial
+
+from django.db import transaction
+
+from . import events
+from .models import Order, Appointment, StatusChangeLog
+
+
+# ===============================================
+# ORDER / APPOINTMENT STATUS TRANSITIONS
+# ===============================================
+# Allowed moves between the STATUS_CHOICES shared by Order and Appointment.
+# Cancelled and Completed are final.
+TRANSITIONS = {
+    'Pending': {'Confirmed', 'Cancelled'},
+    'Confirmed': {'Completed', 'Cancelled'},
+    'Cancelled': set(),
+    'Completed': set(),
+}
+
+# model -> (audit name, event channel or None)
+TRACKED_MODELS = {
+    Order: ('order', None),
+    Appointment: ('appointment', 'appointment'),
+}
+
+
+class TransitionError(ValueError):
+    pass
+
+
+def allowed_sources(target):
+    """Statuses that may move to `target`."""
+    if target not in TRANSITIONS:
+        raise TransitionError(f"Unknown status '{target}'.")
+    return [source for source, targets in TRANSITIONS.items() if target in targets]
+
+
+class _Stale(Exception):
+    pass
+
+
+def _move(model, ids, source, target):
+    """
+    Moves the rows in `ids` that are still at `source` to `target`; returns
+    the ids the UPDATE matched. One UPDATE for the group, or when it matches
+    fewer rows than expected (the read was stale) one per row, so the result
+    is always exactly the rows that changed.
+    """
+    rows = model.all_branches.filter(status=source)
+    try:
+        with transaction.atomic():
+            if rows.filter(id__in=ids).update(status=target) != len(ids):
+                raise _Stale
+        return ids
+    except _Stale:
+        return [pk for pk in ids if rows.filter(id=pk).update(status=target)]
+
+
+def apply_transition(model, ids, target, actor=None, reason='', queryset=None):
+    """
+    Moves every row in `ids` whose current status allows it to `target` with
+    one UPDATE ... WHERE id IN (...) AND status = <from status> per from
+    status, then writes one StatusChangeLog row and one change event per
+    branch for the rows those UPDATEs matched. `queryset` narrows which rows
+    the caller may touch (e.g. only their own). Returns {'status', 'updated',
+    'skipped', 'not_found'}.
+    """
+    sources = allowed_sources(target)
+    audit_name, channel = TRACKED_MODELS[model]
+    queryset = model.objects.all() if queryset is None else queryset
+    ids = list(dict.fromkeys(ids))
+
+    with transaction.atomic():
+        current = list(queryset.select_for_update().filter(id__in=ids).values_list('id', 'status', 'branch'))
+        by_source = {}
+        for pk, status, _ in current:
+            if status in sources:
+                by_source.setdefault(status, []).append(pk)
+        moved = {source: _move(model, pks, source, target) for source, pks in by_source.items()}
+        updated = {pk for pks in moved.values() for pk in pks}
+        if updated:
+            StatusChangeLog.objects.create(
+                model=audit_name,
+                to_status=target,
+                object_ids=[pk for pk in ids if pk in updated],
+                from_counts={source: len(pks) for source, pks in moved.items() if pks},
+                changed_by=actor,
+                reason=reason[:255],
+            )
+            if channel:
+                # .update() skips the post_save signals, so publish the batch here.
+                by_branch = {}
+                for pk, _, branch in current:
+                    if pk in updated:
+                        by_branch.setdefault(branch, []).append(pk)
+                for branch, pks in by_branch.items():
+                    transaction.on_commit(partial(
+                        events.publish, channel, 'bulk_updated', None, {'status': target, 'ids': pks}, branch,
+                    ))
+        # Rows that changed between the read and the UPDATE are reported with their status now.
+        missed = {pk for pks in by_source.values() for pk in pks} - updated
+        now = dict(model.all_branches.filter(id__in=missed).values_list('id', 'status')) if missed else {}
+
+    found = {row[0] for row in current}
+    return {
+        'status': target,
+        'updated': [pk for pk in ids if pk in updated],
+        'skipped': [{'id': pk, 'status': now.get(pk, status)} for pk, status, _ in current if pk not in updated],
+        'not_found': [pk for pk in ids if pk not in found],
+    }
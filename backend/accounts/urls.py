@@ -21,6 +21,8 @@ from .views import (
     ProductDetailView,
     toggle_product_availability,
     InventoryView,
+    InventoryChangesView,
+    StockMovementListView,
     
     # ✅ Staff
     StaffUserListView, 
@@ -30,16 +32,34 @@ from .views import (
     # ✅ Pet Profile
     PetProfileListView,
     PetProfileDetailView,
+    PetVisitListView,
+    CustomerImportView,
+    CustomerImportStatusView,
 
     # ✅ Feedback
     FeedbackCreateView, # FIX: Ensures the correct view name is imported
     FeedbackGalleryView,
+    FeedbackSummaryView,
     
     # ✅ Appointment
     AppointmentCreateView, # NEW: For POST requests
     AppointmentListView,   # NEW: For GET requests (booked slots)
+    AppointmentDetailView,
+
+    # Status transitions
+    OrderBulkStatusView,
+    AppointmentBulkStatusView,
+
+    # Dashboard
+    DashboardSummaryView,
+
+    # Batch
+    BatchView,
+
+    # Live events
+    EventStreamTicketView,
 )
-from . import views
+from . import async_views
 
 
 urlpatterns = [
@@ -55,16 +75,20 @@ urlpatterns = [
     # --- Service Management Paths ---
     path('services/', ServiceListView.as_view(), name='services'), 
     path('services/<int:pk>/', ServiceDetailView.as_view(), name='service-detail'), 
-    path('services/<int:pk>/toggle/', views.toggle_service_availability, name='toggle_service_availability'),
+    path('services/<int:pk>/toggle/', toggle_service_availability, name='toggle_service_availability'),
 
     # --- Order Management Paths ---
     path('orders/', OrderListView.as_view(), name='order-list-create'),
+    path('orders/status/', OrderBulkStatusView.as_view(), name='order-bulk-status'),
 
     # --- Product Management Paths ---
     path('products/', ProductListView.as_view(), name='products'), 
     path('products/<int:pk>/', ProductDetailView.as_view(), name='product-detail'), 
-    path('products/<int:pk>/toggle/', views.toggle_product_availability, name='toggle_product_availability'),
+    path('products/<int:pk>/toggle/', toggle_product_availability, name='toggle_product_availability'),
+    path('products/<int:pk>/movements/', StockMovementListView.as_view(), name='product-stock-movements'),
     path('inventory/', InventoryView.as_view(), name='inventory-list'),
+    # Handles POST /api/accounts/inventory/changes/ (buffered stock/availability edits)
+    path('inventory/changes/', InventoryChangesView.as_view(), name='inventory-changes'),
     
     # --- Staff Management Paths ---
     path('users/staff/', StaffUserListView.as_view(), name='staff-list'),
@@ -74,12 +98,18 @@ urlpatterns = [
     # --- Pet Profile Paths ---
     path('pets/', PetProfileListView.as_view(), name='petprofile-list-create'),
     path('pets/<int:pk>/', PetProfileDetailView.as_view(), name='petprofile-detail'),
+    path('pets/<int:pk>/visits/', PetVisitListView.as_view(), name='petvisit-list-create'),
+    # Handles POST /api/accounts/import/customers/ (CSV of customers and pets)
+    path('import/customers/', CustomerImportView.as_view(), name='customer-import'),
+    path('import/customers/<int:job_id>/', CustomerImportStatusView.as_view(), name='customer-import-status'),
 
     # --- Feedback Paths ---
     # Handles POST /api/accounts/feedback/
     path('feedback/', FeedbackCreateView.as_view(), name='feedback-create'), 
     # Handles GET /api/accounts/feedback/gallery/
     path('feedback/gallery/', FeedbackGalleryView.as_view(), name='feedback-gallery'), 
+    # Handles GET /api/accounts/feedback/summary/ (count + average rating)
+    path('feedback/summary/', FeedbackSummaryView.as_view(), name='feedback-summary'),
     
     # ===============================================
     # ✅ NEW: APPOINTMENT PATHS
@@ -88,4 +118,28 @@ urlpatterns = [
     path('appointments/', AppointmentCreateView.as_view(), name='appointment-create'), 
     # Handles GET /api/accounts/appointments/booked/ (Calendar data)
     path('appointments/booked/', AppointmentListView.as_view(), name='appointment-list'), 
+    # Handles DELETE /api/accounts/appointments/<id>/ (Cancels the booking)
+    path('appointments/<int:pk>/', AppointmentDetailView.as_view(), name='appointment-detail'),
+    # Handles POST /api/accounts/appointments/status/ (Staff bulk complete/cancel)
+    path('appointments/status/', AppointmentBulkStatusView.as_view(), name='appointment-bulk-status'),
+
+    # --- Dashboard Path ---
+    # Handles GET /api/accounts/dashboard/summary/ (admin overview cards)
+    path('dashboard/summary/', DashboardSummaryView.as_view(), name='dashboard-summary'),
+
+    # --- Batch Path ---
+    # Handles POST /api/accounts/batch/ (several GETs in one round trip)
+    path('batch/', BatchView.as_view(), name='batch'),
+
+    # ===============================================
+    # ASYNC READ PATHS (served efficiently under ASGI)
+    # ===============================================
+    path('async/services/', async_views.async_service_list, name='async-services'),
+    path('async/products/', async_views.async_product_list, name='async-products'),
+    path('async/feedback/gallery/', async_views.async_feedback_gallery, name='async-feedback-gallery'),
+    path('async/appointments/booked/', async_views.async_booked_appointments, name='async-appointment-list'),
+    # Server-sent events with product/service/appointment diffs
+    path('events/', async_views.event_stream, name='event-stream'),
+    # One-use ticket for opening the stream (EventSource can't send the JWT header)
+    path('events/ticket/', EventStreamTicketView.as_view(), name='event-stream-ticket'),
 ]
@@ -1,3 +1,11 @@
+import contextvars
+import csv
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -7,7 +15,12 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth import authenticate
+from django.core.files.storage import default_storage
 from django.shortcuts import get_object_or_404
+from django.db import connection, transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import resolve, Resolver404
+from django.utils import timezone
 from rest_framework.decorators import api_view
 
 from .serializers import (
@@ -19,25 +32,58 @@ from .serializers import (
     OrderSerializer,
     StaffProfileSerializer, 
     PetProfileSerializer,
+    PetVisitSerializer,
     FeedbackSerializer,
     AppointmentSerializer, # ✅ NEW: Appointment Serializer
+    sparse_params,
 )
 from .models import (
+    Job,
     LoginActivity, 
     UserProfile, 
     Service, 
     Product, 
     Order, 
     PetProfile,
-    Feedback,
+    PetVisit,
+    StockMovement,
     Appointment, # ✅ NEW: Appointment Model
 )
+from . import dashboard, events, gallery
+from .idempotency import idempotent
+from .transitions import apply_transition, TransitionError
+from .throttling import LoginRateThrottle, RegisterRateThrottle, FeedbackRateThrottle
+from .fast_serializers import (
+    ServiceValuesSerializer,
+    ProductValuesSerializer,
+    OrderValuesSerializer,
+    PetVisitValuesSerializer,
+    StockMovementValuesSerializer,
+)
+from .pagination import keyset_page
+from .branching import get_current_branch
+from .imports import REQUIRED_COLUMNS as IMPORT_COLUMNS
+from .inventory import apply_changes, ChangeError
+from .concurrency import VersionConflict, etag, parse_if_match
+
+
+def _precondition_failed(serializer_class, queryset, pk):
+    """412 for a stale If-Match, with the current row so the client can merge and retry."""
+    current = get_object_or_404(queryset, pk=pk)
+    response = Response(
+        {"detail": "This record was changed by someone else. Reload it and try again.",
+         "current": serializer_class(current).data},
+        status=status.HTTP_412_PRECONDITION_FAILED,
+    )
+    response['ETag'] = etag(current)
+    return response
 
 
 # ===============================================
 # AUTHENTICATION & USER MANAGEMENT VIEWS 
 # ===============================================
 class RegisterUserView(APIView):
+    throttle_classes = [RegisterRateThrottle]
     def post(self, request):
         serializer = RegisterSerializer(data=request.data, context={'is_staff': False})
         if serializer.is_valid():
@@ -56,6 +102,7 @@ class RegisterAdminView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class LoginView(APIView):
+    throttle_classes = [LoginRateThrottle]
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
@@ -100,7 +147,7 @@ class LoginActivityView(APIView):
         user = request.user
         if not user.is_staff:
             return Response({"message": "Unauthorized. Admins only."}, status=status.HTTP_403_FORBIDDEN)
-        logs = LoginActivity.objects.all().order_by('-login_time')
+        logs = LoginActivity.objects.select_related('user').order_by('-login_time')
         data = [{"id": log.id, "username": log.user.username, "login_time": log.login_time, 
                   "role": "admin" if log.user.is_staff else "user", 
                   "status": "Blocked" if not log.user.is_active else "Active"} for log in logs]
@@ -114,6 +161,9 @@ class BlockUserView(APIView):
         try:
             user = User.objects.get(username=username)
             profile = getattr(user, 'userprofile', None)
+            if profile and profile.deleted_at:
+                # Tombstoned and waiting for purge_user; unblocking would revive it.
+                return Response({"message": f"{username} has been deleted."}, status=status.HTTP_409_CONFLICT)
             is_blocking = user.is_active
             user.is_active = not user.is_active
             if profile:
@@ -133,13 +183,15 @@ class OrderListView(APIView):
             orders = Order.objects.all().order_by('-order_date')
         else:
             orders = Order.objects.filter(user=request.user).order_by('-order_date')
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fields, expand = sparse_params(request)
+        return Response(OrderValuesSerializer(fields, expand).serialize(orders), status=status.HTTP_200_OK)
 
+    @idempotent
     def post(self, request, format=None):
         serializer = OrderSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():  # Counters (accounts.counters) commit with the row
+                serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -150,8 +202,8 @@ class ServiceListView(APIView):
     permission_classes = [IsAuthenticated] 
     def get(self, request, format=None):
         services = Service.objects.all().order_by('-created_at')
-        serializer = ServiceSerializer(services, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fields, expand = sparse_params(request)
+        return Response(ServiceValuesSerializer(fields, expand).serialize(services), status=status.HTTP_200_OK)
     def post(self, request, format=None):
         if not request.user.is_staff:
             return Response({"detail": "Unauthorized. Admins only."}, status=status.HTTP_403_FORBIDDEN)
@@ -166,35 +218,42 @@ class ServiceDetailView(APIView):
     def get_object(self, pk):
         return get_object_or_404(Service, pk=pk)
     def get(self, request, pk, format=None):
-        service = self.get_object(pk)
-        serializer = ServiceSerializer(service)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fields, expand = sparse_params(request)
+        services = ServiceSerializer.optimize_queryset(Service.objects.all(), fields, expand)
+        service = get_object_or_404(services, pk=pk)
+        serializer = ServiceSerializer(service, fields=fields, expand=expand)
+        return Response(serializer.data, status=status.HTTP_200_OK, headers={'ETag': etag(service)})
     def put(self, request, pk, format=None):
         if not request.user.is_staff:
             return Response({"detail": "Unauthorized. Admins only."}, status=status.HTTP_403_FORBIDDEN)
         service = self.get_object(pk)
-        serializer = ServiceSerializer(service, data=request.data) 
+        # If-Match: "<version>" makes the write conditional (412 when stale)
+        context = {'expected_version': parse_if_match(request.headers.get('If-Match'))}
+        serializer = ServiceSerializer(service, data=request.data, context=context)
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            try:
+                serializer.save()
+            except VersionConflict:
+                return _precondition_failed(ServiceSerializer, Service.objects.all(), pk)
+            return Response(serializer.data, status=status.HTTP_200_OK, headers={'ETag': etag(service)})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     def delete(self, request, pk, format=None):
         if not request.user.is_staff:
             return Response({"detail": "Unauthorized. Admins only."}, status=status.HTTP_403_FORBIDDEN)
         service = self.get_object(pk)
-        service.delete()
+        with transaction.atomic():
+            service.delete()
         return Response({"message": "Service deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
 
 @api_view(['PATCH'])
 def toggle_service_availability(request, pk):
     if not request.user.is_staff:
         return Response({"detail": "Unauthorized. Admins only."}, status=status.HTTP_403_FORBIDDEN)
-    try:
+    # Flipped in SQL (availability = NOT availability): no read-modify-write race
+    with transaction.atomic():
+        if apply_changes(Service, [{'id': pk, 'toggle': True}])['not_found']:
+            return Response({"error": "Service not found"}, status=status.HTTP_404_NOT_FOUND)
         service = Service.objects.get(pk=pk)
-    except Service.DoesNotExist:
-        return Response({"error": "Service not found"}, status=status.HTTP_404_NOT_FOUND)
-    service.availability = not service.availability
-    service.save()
     return Response(ServiceSerializer(service).data, status=status.HTTP_200_OK)
 
 # ===============================================
@@ -204,8 +263,8 @@ class ProductListView(APIView):
     permission_classes = [IsAuthenticated] 
     def get(self, request, format=None):
         products = Product.objects.all().order_by('-created_at')
-        serializer = ProductSerializer(products, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fields, expand = sparse_params(request)
+        return Response(ProductValuesSerializer(fields, expand).serialize(products), status=status.HTTP_200_OK)
 
     def post(self, request, format=None):
         if not request.user.is_staff:
@@ -222,20 +281,26 @@ class ProductDetailView(APIView):
     def get_object(self, pk):
         return get_object_or_404(Product, pk=pk)
     def get(self, request, pk, format=None):
-        product = self.get_object(pk)
-        serializer = ProductSerializer(product)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fields, expand = sparse_params(request)
+        products = ProductSerializer.optimize_queryset(Product.objects.all(), fields, expand)
+        product = get_object_or_404(products, pk=pk)
+        serializer = ProductSerializer(product, fields=fields, expand=expand)
+        return Response(serializer.data, status=status.HTTP_200_OK, headers={'ETag': etag(product)})
 
     def put(self, request, pk, format=None):
         if not request.user.is_staff:
             return Response({"detail": "Unauthorized. Admins only."}, status=status.HTTP_403_FORBIDDEN)
             
         product = self.get_object(pk)
-        serializer = ProductSerializer(product, data=request.data) 
+        context = {'request': request, 'expected_version': parse_if_match(request.headers.get('If-Match'))}
+        serializer = ProductSerializer(product, data=request.data, context=context)
         
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            try:
+                serializer.save()
+            except VersionConflict:
+                return _precondition_failed(ProductSerializer, Product.objects.all(), pk)
+            return Response(serializer.data, status=status.HTTP_200_OK, headers={'ETag': etag(product)})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk, format=None):
@@ -250,17 +315,18 @@ class ProductDetailView(APIView):
 def toggle_product_availability(request, pk):
     if not request.user.is_staff:
         return Response({"detail": "Unauthorized. Admins only."}, status=status.HTTP_403_FORBIDDEN)
-    try:
+    with transaction.atomic():
+        if apply_changes(Product, [{'id': pk, 'toggle': True}])['not_found']:
+            return Response({"error": "Product not found"}, status=status.HTTP_404_NOT_FOUND)
         product = Product.objects.get(pk=pk)
-    except Product.DoesNotExist:
-        return Response({"error": "Product not found"}, status=status.HTTP_404_NOT_FOUND)
-    product.is_available = not product.is_available
-    product.save()
     return Response(ProductSerializer(product).data, status=status.HTTP_200_OK)
 
 # ===============================================
 # 📦 NEW: INVENTORY VIEW
 # ===============================================
+STOCK_MOVEMENT_PAGE_SIZE = 50
+STOCK_MOVEMENT_MAX_PAGE_SIZE = 200
+
 class InventoryView(APIView):
     permission_classes = [IsAuthenticated] 
     
@@ -269,8 +335,61 @@ class InventoryView(APIView):
             return Response({"detail": "Unauthorized. Admins only."}, status=status.HTTP_403_FORBIDDEN)
         
         products = Product.objects.all().order_by('-created_at')
-        serializer = ProductSerializer(products, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fields, expand = sparse_params(request)
+        return Response(ProductValuesSerializer(fields, expand).serialize(products), status=status.HTTP_200_OK)
+
+
+# Handles GET /api/accounts/products/<pk>/movements/ (stock ledger)
+class StockMovementListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, format=None):
+        """One page of the product's stock movements, newest first; follow `next` with ?cursor=."""
+        if not request.user.is_staff:
+            return Response({"detail": "Unauthorized. Admins only."}, status=status.HTTP_403_FORBIDDEN)
+        product = get_object_or_404(Product.objects.all(), pk=pk)
+        try:
+            limit = min(max(int(request.query_params.get('limit', STOCK_MOVEMENT_PAGE_SIZE)), 1),
+                        STOCK_MOVEMENT_MAX_PAGE_SIZE)
+            page = keyset_page(StockMovement.objects.filter(product=product), StockMovementValuesSerializer(),
+                               'created_at', request.query_params.get('cursor'), limit)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(page, status=status.HTTP_200_OK)
+
+
+INVENTORY_CHANGES_MAX = 1000
+
+
+class InventoryChangesView(APIView):
+    """
+    POST {"products": [{"id": 4, "stocks_delta": -2}, {"id": 5, "is_available": false}],
+          "services": [{"id": 3, "toggle": true}]}
+    Applies a buffered batch of stock/availability edits in one transaction
+    (see accounts/inventory.py) and returns the resulting values.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        if not request.user.is_staff:
+            return Response({"detail": "Unauthorized. Admins only."}, status=status.HTTP_403_FORBIDDEN)
+        if not isinstance(request.data, dict):
+            return Response({"detail": "Expected an object with 'products' and/or 'services'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        batches = {'products': Product, 'services': Service}
+        payload = {key: request.data.get(key) or [] for key in batches}
+        if not all(isinstance(changes, list) for changes in payload.values()):
+            return Response({"detail": "'products' and 'services' must be lists."}, status=status.HTTP_400_BAD_REQUEST)
+        if sum(map(len, payload.values())) > INVENTORY_CHANGES_MAX:
+            return Response({"detail": f"At most {INVENTORY_CHANGES_MAX} changes per call."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                result = {key: apply_changes(model, payload[key], user=request.user) for key, model in batches.items()}
+        except ChangeError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
+
     
 # ===============================================
 # ✅ NEW: STAFF MANAGEMENT VIEWS 
@@ -285,8 +404,19 @@ class StaffUserListView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        profiles = UserProfile.objects.all().select_related('user')
-        serializer = StaffProfileSerializer(profiles, many=True)
+        profiles = UserProfile.objects.filter(deleted_at__isnull=True)
+        # ?role=admin,manager&status=Active&branch=... use the (role, branch, status) index
+        for param in ('role', 'branch', 'status'):
+            values = [v for v in request.query_params.get(param, '').split(',') if v]
+            if values:
+                profiles = profiles.filter(**{f'{param}__in': values})
+        # ?count=1 returns just the number, for dashboard badges
+        if request.query_params.get('count') in ('1', 'true'):
+            return Response({"count": profiles.count()}, status=status.HTTP_200_OK)
+
+        fields, expand = sparse_params(request)
+        profiles = StaffProfileSerializer.optimize_queryset(profiles, fields, expand)
+        serializer = StaffProfileSerializer(profiles, many=True, fields=fields, expand=expand)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 class StaffUpdateProfileView(APIView):
@@ -301,13 +431,18 @@ class StaffUpdateProfileView(APIView):
         
         user = get_object_or_404(User, pk=pk)
         profile = get_object_or_404(UserProfile, user=user)
-        serializer = StaffProfileSerializer(profile, data=request.data, partial=True)
+        context = {'expected_version': parse_if_match(request.headers.get('If-Match'))}
+        serializer = StaffProfileSerializer(profile, data=request.data, partial=True, context=context)
         
         print(f"*** PATCH DATA RECEIVED: {request.data}") 
 
         if serializer.is_valid():
-            updated_profile = serializer.save()
-            return Response(StaffProfileSerializer(updated_profile).data, status=status.HTTP_200_OK)
+            try:
+                updated_profile = serializer.save()
+            except VersionConflict:
+                return _precondition_failed(StaffProfileSerializer, UserProfile.objects.filter(user=user), profile.pk)
+            return Response(StaffProfileSerializer(updated_profile).data, status=status.HTTP_200_OK,
+                            headers={'ETag': etag(updated_profile)})
             
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
@@ -329,23 +464,46 @@ class UserDetailView(APIView):
         
         try:
             user_to_delete = User.objects.get(pk=pk)
-            user_to_delete.delete()
-            return Response({"message": f"User ID {pk} deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
         except User.DoesNotExist:
             return Response({"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        # Soft-delete: tombstone the account now, purge its history in the background.
+        with transaction.atomic():
+            user_to_delete.is_active = False
+            user_to_delete.set_unusable_password()
+            user_to_delete.save(update_fields=['is_active', 'password'])
+            UserProfile.objects.update_or_create(
+                user=user_to_delete,
+                defaults={'status': 'Deleted', 'deleted_at': timezone.now()},
+            )
+            # Imported here: only this path needs the job queue.
+            from .tasks import purge_user
+            transaction.on_commit(lambda: purge_user.delay(pk))
+        return Response({"message": f"User ID {pk} scheduled for deletion."}, status=status.HTTP_202_ACCEPTED)
             
 # ===============================================
 # ✅ NEW: PET PROFILE VIEWS 
 # ===============================================
+PET_VISIT_PAGE_SIZE = 20
+PET_VISIT_MAX_PAGE_SIZE = 100
+
+
 class PetProfileListView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request, format=None):
         if request.user.is_staff:
             pets = PetProfile.objects.all().order_by('-created_at')
+            if request.query_params.get('owner'):
+                try:
+                    pets = pets.filter(owner_id=int(request.query_params['owner']))
+                except ValueError:
+                    return Response({"detail": "'owner' must be a user id."}, status=status.HTTP_400_BAD_REQUEST)
         else:
-            pets = PetProfile.objects.filter(created_by=request.user).order_by('-created_at')
-        serializer = PetProfileSerializer(pets, many=True)
+            pets = PetProfile.objects.filter(owner=request.user).order_by('-created_at')
+        fields, expand = sparse_params(request)
+        pets = PetProfileSerializer.optimize_queryset(pets, fields, expand)
+        serializer = PetProfileSerializer(pets, many=True, fields=fields, expand=expand)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def post(self, request, format=None):
@@ -354,7 +512,8 @@ class PetProfileListView(APIView):
             
         serializer = PetProfileSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -369,16 +528,100 @@ class PetProfileDetailView(APIView):
             return Response({"detail": "Unauthorized. Staff privileges required."}, status=status.HTTP_403_FORBIDDEN)
 
         pet = self.get_object(pk)
-        pet.delete()
+        with transaction.atomic():
+            pet.delete()
         return Response({"message": "Pet profile deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
-        
+
+# Handles GET/POST /api/accounts/pets/<pk>/visits/ (medical history timeline)
+class PetVisitListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get_pet(self, request, pk):
+        pets = PetProfile.objects.all() if request.user.is_staff else PetProfile.objects.filter(owner=request.user)
+        return get_object_or_404(pets, pk=pk)
+
+    def get(self, request, pk, format=None):
+        """One page of the pet's visits, newest first; follow `next` with ?cursor=."""
+        pet = self.get_pet(request, pk)
+        try:
+            limit = min(max(int(request.query_params.get('limit', PET_VISIT_PAGE_SIZE)), 1), PET_VISIT_MAX_PAGE_SIZE)
+            page = keyset_page(PetVisit.objects.filter(pet=pet), PetVisitValuesSerializer(), 'visited_at',
+                               request.query_params.get('cursor'), limit)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(page, status=status.HTTP_200_OK)
+
+    def post(self, request, pk, format=None):
+        if not request.user.is_staff:
+            return Response({"detail": "Unauthorized. Staff privileges required."}, status=status.HTTP_403_FORBIDDEN)
+        pet = self.get_pet(request, pk)
+        serializer = PetVisitSerializer(data=request.data, context={'request': request, 'pet': pet})
+        if serializer.is_valid():
+            serializer.save(pet=pet, recorded_by=request.user)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+# Handles POST /api/accounts/import/customers/ (branch onboarding)
+class CustomerImportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        """
+        Queues an import of customers and their pets from a CSV uploaded as
+        multipart `file` (see accounts/imports.py) and answers 202 with the
+        job id; GET import/customers/<job>/ reports progress and row errors.
+        """
+        if not request.user.is_staff:
+            return Response({"detail": "Unauthorized. Staff privileges required."}, status=status.HTTP_403_FORBIDDEN)
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"file": ["Upload the CSV as 'file'."]}, status=status.HTTP_400_BAD_REQUEST)
+        # Catch the wrong file up front rather than in a job nobody is watching yet.
+        header = next(csv.reader([upload.readline().decode('utf-8-sig', errors='replace')]), [])
+        upload.seek(0)
+        missing = [column for column in IMPORT_COLUMNS if column not in header]
+        if missing:
+            return Response({"file": [f"Missing column(s): {', '.join(missing)}."]},
+                            status=status.HTTP_400_BAD_REQUEST)
+        # Branch staff import into their own branch; head office may name one.
+        branch = get_current_branch() or request.data.get('branch') or None
+        path = default_storage.save(f'imports/{uuid.uuid4().hex}.csv', upload)
+        from .tasks import import_customer_file
+        job_row = import_customer_file.delay(path, request.user.pk, branch)
+        if job_row is None:  # JOBS_EAGER: it already ran
+            return Response({"job": None, "status": "done"}, status=status.HTTP_200_OK)
+        return Response({"job": job_row.pk, "status": job_row.status}, status=status.HTTP_202_ACCEPTED)
+
+
+class CustomerImportStatusView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id, format=None):
+        """Status of a queued import; `progress` holds the import report so far."""
+        if not request.user.is_staff:
+            return Response({"detail": "Unauthorized. Staff privileges required."}, status=status.HTTP_403_FORBIDDEN)
+        job_row = get_object_or_404(Job, pk=job_id, name='accounts.tasks.import_customer_file')
+        # Branch staff only see their own imports; head office sees all.
+        if get_current_branch() and job_row.payload['args'][1] != request.user.pk:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            "job": job_row.pk,
+            "status": job_row.status,
+            "progress": job_row.progress,
+            "error": job_row.last_error.strip().splitlines()[-1] if job_row.last_error else None,
+            "enqueued_at": job_row.enqueued_at,
+            "finished_at": job_row.finished_at,
+        }, status=status.HTTP_200_OK)
+
 # ===============================================
 # ✅ NEW: FEEDBACK VIEWS
 # ===============================================
 # This view handles POST to /api/accounts/feedback/
 class FeedbackCreateView(APIView):
     permission_classes = [IsAuthenticated] # Only logged-in users can send feedback
+    throttle_classes = [FeedbackRateThrottle]
 
+    @idempotent
     def post(self, request, format=None):
         """Creates a new feedback entry."""
         # Use FeedbackSerializer to validate the incoming data
@@ -386,23 +629,40 @@ class FeedbackCreateView(APIView):
         
         if serializer.is_valid():
             # The serializer handles setting the user ID automatically
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
             
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+# This view handles GET to /api/accounts/feedback/summary/
+class FeedbackSummaryView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request, format=None):
+        """Feedback count, average rating and 1-5 star histogram (cached)."""
+        return Response(gallery.rating_summary(), status=status.HTTP_200_OK)
+
 # This view handles GET to /api/accounts/feedback/gallery/
 class FeedbackGalleryView(APIView):
     # Allow anyone (authenticated or not) to view the gallery
     permission_classes = [AllowAny] 
 
     def get(self, request, format=None):
-        """Returns a list of all feedback for the gallery."""
-        # Order by submission date (newest first)
-        feedbacks = Feedback.objects.all().order_by('-submitted_at')
-        
-        serializer = FeedbackSerializer(feedbacks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        """
+        Returns one page of feedback, newest first: {"results", "next", "summary"}.
+        Pass the `next` cursor back as ?cursor= for the following page; ?limit= sets the page size.
+        The rating summary is only included on the first page.
+        """
+        cursor = request.query_params.get('cursor')
+        try:
+            limit = int(request.query_params.get('limit', 0)) or None
+            page = gallery.feed_page(cursor, limit)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if not cursor:
+            page = {**page, 'summary': gallery.rating_summary()}
+        return Response(page, status=status.HTTP_200_OK)
 
 # ===============================================
 # ✅ NEW: APPOINTMENT VIEWS 
@@ -412,6 +672,7 @@ class FeedbackGalleryView(APIView):
 class AppointmentCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def post(self, request, format=None):
         """Creates a new appointment."""
         # Use AppointmentSerializer to validate the incoming data
@@ -419,7 +680,8 @@ class AppointmentCreateView(APIView):
         
         # NOTE: The serializer handles setting user, status, and checking validity
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
             
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -434,13 +696,195 @@ class AppointmentListView(APIView):
         appointments = Appointment.objects.filter(status='Confirmed').order_by('appointment_date')
         
         # Serialize only the essential data needed for the calendar (date, service ID)
-        # We use a list comprehension for a clean, minimal payload
+        # values_list() reads just these two columns, no Appointment/Service objects
         data = [
             {
-                'date': appt.appointment_date,
-                'service_id': appt.service.id,
+                'date': appointment_date,
+                'service_id': service_id,
             }
-            for appt in appointments
+            for appointment_date, service_id in appointments.values_list('appointment_date', 'service_id')
         ]
         
         return Response(data, status=status.HTTP_200_OK)
+
+# 3. Handles DELETE /api/accounts/appointments/<id>/ (Customer or staff cancels one booking)
+class AppointmentDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request, pk, format=None):
+        """Cancels the appointment; the row is kept for history."""
+        appointments = Appointment.objects.all()
+        if not request.user.is_staff:
+            appointments = appointments.filter(user=request.user)
+        result = apply_transition(Appointment, [pk], 'Cancelled', actor=request.user,
+                                  reason='Cancelled by user', queryset=appointments)
+        if result['not_found']:
+            return Response({"detail": "Appointment not found."}, status=status.HTTP_404_NOT_FOUND)
+        if result['skipped']:
+            current = result['skipped'][0]['status']
+            return Response({"detail": f"A {current.lower()} appointment cannot be cancelled."},
+                            status=status.HTTP_409_CONFLICT)
+        return Response({"message": "Appointment cancelled.", "id": pk, "status": 'Cancelled'},
+                        status=status.HTTP_200_OK)
+
+# ===============================================
+# BULK STATUS TRANSITIONS (STAFF)
+# ===============================================
+BULK_STATUS_MAX_IDS = 1000
+
+
+class BulkStatusView(APIView):
+    """
+    POST {"ids": [...], "status": "Completed", "reason": "end of day"}
+    Rows whose current status doesn't allow the move are reported under
+    "skipped" instead of failing the whole call.
+    """
+    permission_classes = [IsAuthenticated]
+    model = None
+
+    def post(self, request, format=None):
+        if not request.user.is_staff:
+            return Response({"detail": "Staff only."}, status=status.HTTP_403_FORBIDDEN)
+        if not isinstance(request.data, dict):
+            return Response({"detail": "Expected an object with 'ids' and 'status'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        ids = request.data.get('ids')
+        target = request.data.get('status')
+        if (not isinstance(ids, list) or not ids
+                or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids)):
+            return Response({"detail": "'ids' must be a non-empty list of integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(target, str):
+            return Response({"detail": "'status' must be a string."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > BULK_STATUS_MAX_IDS:
+            return Response({"detail": f"At most {BULK_STATUS_MAX_IDS} ids per call."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            result = apply_transition(self.model, ids, target, actor=request.user,
+                                      reason=str(request.data.get('reason', '')))
+        except TransitionError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class OrderBulkStatusView(BulkStatusView):
+    model = Order
+
+
+class AppointmentBulkStatusView(BulkStatusView):
+    model = Appointment
+
+# ===============================================
+# ADMIN DASHBOARD SUMMARY
+# ===============================================
+# Handles GET /api/accounts/dashboard/summary/
+class DashboardSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, format=None):
+        """Today's bookings, pending orders, low stock, new customers and rating (see accounts/dashboard.py)."""
+        if not request.user.is_staff:
+            return Response({"detail": "Unauthorized. Staff privileges required."}, status=status.HTTP_403_FORBIDDEN)
+        return Response(dashboard.summary(get_current_branch()), status=status.HTTP_200_OK)
+
+
+# ===============================================
+# BATCH VIEW (collapses dashboard fan-out)
+# ===============================================
+BATCH_PREFIX = '/api/accounts/'
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+
+def _run_batch_item(request, path):
+    """Runs one GET sub-request with the caller's already-authenticated identity."""
+    url = urlsplit(path)
+    if not url.path.startswith(BATCH_PREFIX) or url.path.rstrip('/').endswith('/batch'):
+        return {"path": path, "status": status.HTTP_400_BAD_REQUEST,
+                "body": {"detail": f"Only GET paths under {BATCH_PREFIX} can be batched."}}
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return {"path": path, "status": status.HTTP_404_NOT_FOUND, "body": {"detail": "Not found."}}
+    if iscoroutinefunction(match.func):
+        return {"path": path, "status": status.HTTP_400_BAD_REQUEST,
+                "body": {"detail": "Async and streaming endpoints cannot be batched."}}
+
+    sub_request = HttpRequest()
+    sub_request.method = 'GET'
+    sub_request.path = sub_request.path_info = url.path
+    sub_request.META = {k: v for k, v in request.META.items() if k not in ('CONTENT_TYPE', 'CONTENT_LENGTH')}
+    sub_request.META['QUERY_STRING'] = url.query
+    sub_request.GET = QueryDict(url.query)
+    # Skips a second JWT decode and user lookup for every sub-request.
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    response = match.func(sub_request, *match.args, **match.kwargs)
+    body = getattr(response, 'data', None)
+    if body is None and response.content:
+        try:
+            body = json.loads(response.content)
+        except ValueError:
+            body = response.content.decode(errors='replace')
+    return {"path": path, "status": response.status_code, "body": body}
+
+
+def _run_batch_item_in_thread(request, path):
+    try:
+        return _run_batch_item(request, path)
+    finally:
+        # Pool threads open their own connection; don't leave it dangling.
+        connection.close()
+
+
+class BatchView(APIView):
+    """
+    POST /api/accounts/batch/ {"requests": [{"path": "/api/accounts/services/"}, ...]}
+
+    Runs several read-only GETs in one authenticated round trip (in parallel
+    threads) and returns {"responses": [{"path", "status", "body"}, ...]} in
+    request order.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        items = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({"detail": "Provide a non-empty 'requests' list."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > BATCH_MAX_REQUESTS:
+            return Response({"detail": f"At most {BATCH_MAX_REQUESTS} requests per batch."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        paths = []
+        for item in items:
+            path = item.get('path') if isinstance(item, dict) else item
+            method = item.get('method', 'GET') if isinstance(item, dict) else 'GET'
+            if not isinstance(path, str) or str(method).upper() != 'GET':
+                return Response({"detail": "Each request needs a 'path' and only GET is supported."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            paths.append(path)
+
+        django_request = request._request
+        if len(paths) == 1:
+            return Response({"responses": [_run_batch_item(django_request, paths[0])]}, status=status.HTTP_200_OK)
+        with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(paths))) as pool:
+            # copy_context() carries the caller's branch scope into each worker thread.
+            futures = [pool.submit(contextvars.copy_context().run, _run_batch_item_in_thread, django_request, path)
+                       for path in paths]
+            responses = [future.result() for future in futures]
+        return Response({"responses": responses}, status=status.HTTP_200_OK)
+
+
+# ===============================================
+# LIVE EVENT STREAM TICKETS
+# ===============================================
+# Handles POST /api/accounts/events/ticket/
+class EventStreamTicketView(APIView):
+    """
+    Trades the caller's JWT (sent as a header) for a one-use ticket to open
+    GET events/?ticket=... with EventSource, which can't send headers.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        ticket, ttl = events.issue_ticket(request.user.pk)
+        return Response({"ticket": ticket, "expires_in": ttl}, status=status.HTTP_200_OK)
@@ -47,6 +47,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'accounts.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +55,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'accounts.branching.BranchScopeMiddleware',
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True  # for development only
@@ -87,6 +89,29 @@ DATABASES = {
     }
 }
 
+# Pub/sub used for the live change stream (/api/accounts/events/). The
+# in-process broker only reaches clients connected to the same worker; point
+# this at a class with the same publish()/subscribe() interface to fan out
+# across workers.
+EVENT_BROKER = 'accounts.events.InProcessBroker'
+
+# EventSource can't send an Authorization header, so clients first POST to
+# events/ticket/ and open the stream with ?ticket=: a random one-use value
+# that expires after TICKET_TTL seconds, instead of a JWT in the URL (and the
+# access logs). Tickets live in CACHE, which must be shared by the worker that
+# issues them and the one serving the stream (accounts.E004).
+EVENT_STREAM = {
+    'TICKET_TTL': 30,
+    'CACHE': 'default',
+}
+
+# Background jobs (accounts/jobs.py) are stored in the database and run by
+# `python manage.py run_worker`. Set to True to run them inline instead.
+JOBS_EAGER = False
+# How often (seconds) each worker requeues jobs orphaned by a dead worker and
+# makes sure finished jobs older than a week get pruned (accounts.jobs.housekeeping).
+JOBS_HOUSEKEEPING_INTERVAL = 300
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -108,8 +133,90 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.BranchJWTAuthentication',
     ),
+    # orjson-backed when installed, byte-compatible with DRF's JSON classes
+    'DEFAULT_RENDERER_CLASSES': (
+        'accounts.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'accounts.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Throttles key anonymous clients by IP. With NUM_PROXIES unset DRF trusts
+    # X-Forwarded-For as sent, so any client could pick a fresh bucket per
+    # request; 0 means REMOTE_ADDR only (settings_production reads the real count).
+    'NUM_PROXIES': 0,
+}
+
+# Token-bucket budgets for accounts.throttling. `burst` is the bucket size;
+# `rate` is the steady refill ('count/s|min|hour|day'). The counts live in
+# RATE_LIMIT_CACHE, which must be shared by all workers for one budget to
+# apply (`manage.py check --deploy` refuses one that isn't, see accounts/checks.py).
+RATE_LIMITS = {
+    'login': {'rate': '10/min', 'burst': 5},
+    'register': {'rate': '5/hour', 'burst': 3},
+    'feedback': {'rate': '10/hour', 'burst': 3},
+}
+RATE_LIMIT_CACHE = 'default'
+
+# Replay store for the Idempotency-Key header on create endpoints
+# (accounts/idempotency.py). The lock and the stored responses live in this
+# cache, so with several workers it must be a shared backend (Redis,
+# Memcached or the database cache), not the per-process LocMemCache;
+# `manage.py check --deploy` refuses one that isn't (accounts.E002).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+IDEMPOTENCY = {
+    'CACHE': 'default',
+    'TTL': 24 * 3600,
+    'LOCK_TIMEOUT': 30,
+}
+
+# Per-worker LRU of Service/Product snapshots used when orders and bookings
+# resolve their service (accounts/hot_objects.py). The invalidation stamps
+# live in CACHE, so workers only see each other's changes immediately when it
+# is a shared backend; otherwise TTL (seconds) bounds how stale they get.
+HOT_OBJECT_CACHE = {
+    'MAX_ENTRIES': 1024,
+    'TTL': 60,
+    'CACHE': 'default',
+}
+
+# Public feedback gallery (accounts/gallery.py): page size limits and how long
+# the cached first page and rating summary live. Both are rewritten after each
+# feedback change; the TTL only bounds staleness across workers that don't
+# share a cache.
+FEEDBACK_GALLERY = {
+    'PAGE_SIZE': 20,
+    'MAX_PAGE_SIZE': 100,
+    'CACHE_TTL': 300,
+}
+
+# Admin dashboard summary (accounts/dashboard.py): seconds the figures are
+# cached per branch.
+DASHBOARD_SUMMARY = {
+    'CACHE_TTL': 30,
+}
+
+# Bulk customer/pet CSV import (accounts/imports.py): rows per transaction and
+# password-hashing processes (None = one per CPU).
+CUSTOMER_IMPORT = {
+    'CHUNK_SIZE': 500,
+    'PROCESSES': None,
+}
+
+# gzip/brotli response compression (accounts.middleware.CompressionMiddleware).
+# Brotli is used when the `brotli` package is installed and the client accepts it.
+RESPONSE_COMPRESSION = {
+    'MIN_SIZE': 1024,
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 4,
 }
 
 SIMPLE_JWT = {
@@ -0,0 +1,43 @@
+"""
+API-only settings profile for the production workers.
+
+Same as backend.settings minus what a JSON API never uses: the admin,
+sessions, messages, static files, the template stack and the browsable API.
+Fewer apps and middleware mean fewer imports and system checks, so a fresh
+worker answers its first request sooner (see benchmarks/startup.py). What
+is left is mostly Django, DRF and simplejwt themselves; the accounts signal
+modules imported by AccountsConfig.ready() cost a few milliseconds.
+
+    DJANGO_SETTINGS_MODULE=backend.settings_api uvicorn backend.asgi:application
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS
+    if app not in (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+    )
+]
+
+# Authentication is JWT-only (DRF does it per view), so the session, CSRF and
+# messages layers have nothing to do.
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in (
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    )
+]
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ('accounts.renderers.FastJSONRenderer',),
+}
@@ -0,0 +1,82 @@
+"""
+Production settings: the API-only profile with DEBUG off and everything
+deployment-specific read from the environment.
+
+    DJANGO_SECRET_KEY         required
+    DJANGO_ALLOWED_HOSTS      comma-separated, default "localhost,127.0.0.1"
+    DJANGO_CORS_ORIGINS       comma-separated, default "http://localhost:3000"
+    DJANGO_SQLITE_PATH        database file, default backend/db.sqlite3
+    DJANGO_REDIS_URL          required, shared cache, e.g. redis://127.0.0.1:6379/0
+    DJANGO_NUM_PROXIES        reverse proxies in front of gunicorn, default 0
+
+Serve it with `python serve.py` (see serve.py for worker sizing).
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings_api import *  # noqa: F401,F403
+from .settings_api import DATABASES, REST_FRAMEWORK
+
+
+def _env_list(name, default):
+    return [value.strip() for value in os.environ.get(name, default).split(',') if value.strip()]
+
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', '')
+if not SECRET_KEY:
+    raise ImproperlyConfigured("Set DJANGO_SECRET_KEY to run with backend.settings_production.")
+
+ALLOWED_HOSTS = _env_list('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1')
+
+CORS_ALLOW_ALL_ORIGINS = False
+CORS_ALLOWED_ORIGINS = _env_list('DJANGO_CORS_ORIGINS', 'http://localhost:3000')
+
+DATABASES = {
+    'default': {
+        **DATABASES['default'],
+        'NAME': os.environ.get('DJANGO_SQLITE_PATH', DATABASES['default']['NAME']),
+        # Keep connections open across requests instead of reconnecting every time.
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # WAL lets readers in other worker processes run alongside a writer;
+            # IMMEDIATE transactions take the write lock up front instead of
+            # failing with "database is locked" when upgrading a read.
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+    }
+}
+
+# Rate-limit counts and Idempotency-Key locks must be shared by every worker
+# process and updated atomically, so the cache is Redis (`pip install redis`);
+# see accounts/checks.py.
+REDIS_URL = os.environ.get('DJANGO_REDIS_URL', '')
+if not REDIS_URL:
+    raise ImproperlyConfigured("Set DJANGO_REDIS_URL to run with backend.settings_production.")
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
+}
+
+# Rate limits key anonymous clients by IP, taken from X-Forwarded-For only as
+# far back as the proxies we run (each appends the address it saw); anything
+# further left is client-supplied.
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'NUM_PROXIES': int(os.environ.get('DJANGO_NUM_PROXIES', '0')),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+}
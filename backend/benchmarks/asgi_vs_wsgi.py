@@ -0,0 +1,151 @@
+"""
+Concurrency capacity of the async read views under ASGI versus the
+synchronous APIViews under WSGI.
+
+Both apps are driven in-process (no network), so the numbers isolate the
+request-handling model. --db-latency adds an artificial delay to every SQL
+statement to stand in for a slow disk or remote database, which is where a
+fixed pool of WSGI threads runs out first.
+
+    python -m benchmarks.asgi_vs_wsgi --concurrency 50 --requests 400 --db-latency 20
+"""
+import argparse
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import common
+
+ENDPOINTS = {
+    'services': ('/api/accounts/services/', '/api/accounts/async/services/'),
+    'products': ('/api/accounts/products/', '/api/accounts/async/products/'),
+    'gallery': ('/api/accounts/feedback/gallery/', '/api/accounts/async/feedback/gallery/'),
+    'booked': ('/api/accounts/appointments/booked/', '/api/accounts/async/appointments/booked/'),
+}
+
+
+def seed(rows):
+    from decimal import Decimal
+    from accounts.models import Service, Product, Feedback, Appointment
+
+    admin = common.make_user('bench_admin', is_staff=True, role='admin')
+    customer = common.make_user('bench_customer')
+    Service.objects.bulk_create(
+        Service(name=f'Service {i}', duration='1 hour', cost=Decimal('250.00'), created_by=admin)
+        for i in range(rows)
+    )
+    Product.objects.bulk_create(
+        Product(name=f'Product {i}', stocks=i, price=Decimal('99.50'), created_by=admin)
+        for i in range(rows)
+    )
+    Feedback.objects.bulk_create(
+        Feedback(user=customer, rating=1 + i % 5, feedback_text='Great service!') for i in range(rows)
+    )
+    service = Service.objects.first()
+    Appointment.objects.bulk_create(
+        Appointment(user=customer, service=service, appointment_date=f'2026-01-{1 + i % 28:02d}')
+        for i in range(rows)
+    )
+    return common.bearer_token(admin)
+
+
+def install_db_latency(seconds):
+    from django.db.backends.signals import connection_created
+
+    def slow_execute(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def add_wrapper(sender, connection, **kwargs):
+        connection.execute_wrappers.append(slow_execute)
+
+    connection_created.connect(add_wrapper, weak=False)
+
+
+def run_wsgi(path, token, concurrency, total):
+    from backend.wsgi import application
+
+    def call():
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '',
+            'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'HTTP_HOST': 'testserver',
+            'HTTP_AUTHORIZATION': token, 'wsgi.input': io.BytesIO(b''),
+            'wsgi.url_scheme': 'http', 'wsgi.errors': io.StringIO(),
+        }
+        statuses = []
+        result = application(environ, lambda status, headers: statuses.append(status))
+        b''.join(result)
+        result.close()
+        assert statuses[0].startswith('200'), statuses[0]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: call(), range(total)))
+    return time.perf_counter() - start
+
+
+def run_asgi(path, token, concurrency, total):
+    from backend.asgi import application
+
+    async def call():
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': b'', 'root_path': '', 'server': ('testserver', 80),
+            'headers': [(b'host', b'testserver'), (b'authorization', token.encode())],
+        }
+
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # Client stays connected until Django cancels the disconnect listener.
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                assert message['status'] == 200, message['status']
+
+        await application(scope, receive, send)
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded():
+            async with semaphore:
+                await call()
+
+        await asyncio.gather(*(bounded() for _ in range(total)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--wsgi-threads', type=int, default=8,
+                        help='Thread pool size standing in for WSGI worker threads.')
+    parser.add_argument('--db-latency', type=float, default=0, help='Artificial delay per SQL statement (ms).')
+    args = parser.parse_args()
+
+    common.setup()
+    token = seed(args.rows)
+    if args.db_latency:
+        install_db_latency(args.db_latency / 1000)
+
+    print(f"{args.requests} requests, {args.rows} rows, concurrency {args.concurrency}, "
+          f"WSGI threads {args.wsgi_threads}, db latency {args.db_latency} ms")
+    for name, (sync_path, async_path) in ENDPOINTS.items():
+        wsgi = run_wsgi(sync_path, token, min(args.wsgi_threads, args.concurrency), args.requests)
+        asgi = run_asgi(async_path, token, args.concurrency, args.requests)
+        print(f"{name:<10} WSGI {args.requests / wsgi:8.1f} req/s   ASGI {args.requests / asgi:8.1f} req/s")
+
+
+if __name__ == '__main__':
+    main()
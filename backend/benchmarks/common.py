@@ -0,0 +1,58 @@
+"""
+Shared bootstrap for the scripts in this folder.
+
+Every benchmark runs against a throwaway test database (never db.sqlite3),
+so run them from the backend folder with e.g.
+
+    python -m benchmarks.asgi_vs_wsgi
+"""
+import os
+import statistics
+import time
+
+import django
+
+
+def setup(settings_module='backend.settings'):
+    """Configures Django and creates a fresh, migrated test database."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+def make_user(username, is_staff=False, role='user', branch=None):
+    from django.contrib.auth.models import User
+    from accounts.models import UserProfile
+
+    user = User.objects.create_user(username=username, password='benchmark', is_staff=is_staff)
+    UserProfile.objects.create(user=user, role=role, status='Active', branch=branch)
+    return user
+
+
+def bearer_token(user):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    return 'Bearer ' + str(RefreshToken.for_user(user).access_token)
+
+
+def timed(func, repeat=5):
+    """Runs func `repeat` times and returns the list of wall-clock durations."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def report(label, durations, unit_count=None, unit='rows'):
+    best = min(durations)
+    line = f"{label:<40} best {best * 1000:9.2f} ms   median {statistics.median(durations) * 1000:9.2f} ms"
+    if unit_count:
+        line += f"   {unit_count / best:12,.0f} {unit}/s"
+    print(line)
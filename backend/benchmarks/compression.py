@@ -0,0 +1,74 @@
+"""
+CPU cost and bytes on the wire for the largest JSON responses (/logs/,
+/inventory/, /orders/): DRF's JSONRenderer versus FastJSONRenderer, and
+identity versus gzip/brotli as chosen by CompressionMiddleware.
+
+    python -m benchmarks.compression --rows 5000
+"""
+import argparse
+from decimal import Decimal
+
+from . import common
+
+ENDPOINTS = ('/api/accounts/logs/', '/api/accounts/inventory/', '/api/accounts/orders/')
+
+
+def seed(rows):
+    from accounts.models import LoginActivity, Product, Service, Order
+
+    admin = common.make_user('bench_admin', is_staff=True, role='admin')
+    customers = [common.make_user(f'customer_{i}') for i in range(20)]
+    LoginActivity.objects.bulk_create(LoginActivity(user=customers[i % 20]) for i in range(rows))
+    Product.objects.bulk_create(
+        Product(name=f'Product {i}', description='Grain-free salmon recipe for adult dogs', category='Food',
+                stocks=i % 80, price=Decimal('1299.00'), created_by=admin)
+        for i in range(rows)
+    )
+    service = Service.objects.create(name='Full Grooming', duration='2 hours', cost=Decimal('850.00'))
+    Order.objects.bulk_create(
+        Order(user=customers[i % 20], service=service, total_cost=Decimal('850.00')) for i in range(rows)
+    )
+    return admin
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    common.setup()
+    admin = seed(args.rows)
+
+    from django.test import RequestFactory
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+    from accounts.middleware import CompressionMiddleware, brotli
+    from accounts.renderers import FastJSONRenderer
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=common.bearer_token(admin))
+    middleware = CompressionMiddleware(lambda request: None)
+    factory = RequestFactory()
+
+    for path in ENDPOINTS:
+        data = client.get(path, HTTP_ACCEPT_ENCODING='identity').data
+        stock, fast = JSONRenderer(), FastJSONRenderer()
+        body = stock.render(data)
+        assert fast.render(data) == body
+        print(f"{path}  ({len(data):,} rows, {len(body):,} bytes uncompressed)")
+        common.report('  render JSONRenderer', common.timed(lambda: stock.render(data), args.repeat), len(data))
+        common.report('  render FastJSONRenderer', common.timed(lambda: fast.render(data), args.repeat), len(data))
+
+        encodings = ['gzip'] + (['br'] if brotli is not None else [])
+        for encoding in encodings:
+            request = factory.get(path, HTTP_ACCEPT_ENCODING=encoding)
+            assert middleware.choose_encoding(request) == encoding
+            compressed = middleware.compress(encoding, body)
+            saved = 100 * (1 - len(compressed) / len(body))
+            durations = common.timed(lambda: middleware.compress(encoding, body), args.repeat)
+            common.report(f'  {encoding} {len(compressed):,} bytes ({saved:.1f}% saved)', durations)
+
+
+if __name__ == '__main__':
+    main()
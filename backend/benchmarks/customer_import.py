@@ -0,0 +1,57 @@
+"""
+Customers per second: creating them one at a time the way RegisterUserView
+and PetProfileListView do (hash, User insert, UserProfile insert, PetProfile
+insert per row) versus the chunked CSV import with a password-hashing pool.
+
+    python -m benchmarks.customer_import --rows 200 --processes 4
+
+Password hashing dominates both, so the speed-up tracks the number of cores.
+"""
+import argparse
+import io
+import os
+import time
+
+from . import common
+
+
+def csv_text(prefix, rows):
+    lines = ['username,email,password,pet_name,pet_breed,age']
+    lines += [f'{prefix}{i},{prefix}{i}@example.com,secret-{i},Pet {i},Aspin,2 Years' for i in range(rows)]
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.contrib.auth.models import User
+    from django.db import transaction
+    from accounts.imports import import_customers
+    from accounts.models import UserProfile, PetProfile
+
+    start = time.perf_counter()
+    for i in range(args.rows):
+        with transaction.atomic():
+            user = User.objects.create_user(f'single{i}', f'single{i}@example.com', f'secret-{i}')
+            UserProfile.objects.create(user=user, role='user', status='Active')
+            PetProfile.objects.create(pet_name=f'Pet {i}', pet_breed='Aspin', age='2 Years', owner=user)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = import_customers(io.StringIO(csv_text('bulk', args.rows)), chunk_size=args.chunk_size,
+                              processes=args.processes)
+    bulk = time.perf_counter() - start
+    assert report.customers_created == args.rows and report.pets_created == args.rows, report.as_dict()
+
+    print(f"{args.rows} customers with one pet each, {args.processes} hashing process(es)")
+    print(f"one at a time          {single:8.2f} s   {args.rows / single:8.1f} customers/s")
+    print(f"chunked CSV import     {bulk:8.2f} s   {args.rows / bulk:8.1f} customers/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Admin overview: the naive fan-out (six list calls, counted on the client)
+versus GET /dashboard/summary/ uncached and from its cache.
+
+    python -m benchmarks.dashboard_summary --rows 2000
+"""
+import argparse
+import json
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from . import common
+
+
+def seed(rows):
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+    from accounts.models import Service, Product, Order, Appointment, Feedback, FeedbackSummary, UserProfile
+
+    rng = random.Random(0)
+    users = User.objects.bulk_create(User(username=f'customer{i}', password='!') for i in range(rows))
+    UserProfile.objects.bulk_create(UserProfile(user=user, role='user', status='Active') for user in users)
+    service = Service.objects.create(name='Bath', duration='1 hour', cost=Decimal('250.00'))
+    Product.objects.bulk_create(
+        Product(name=f'Product {i}', stocks=rng.randint(0, 40), price=Decimal('99.99')) for i in range(rows)
+    )
+    statuses = ['Pending', 'Confirmed', 'Completed', 'Cancelled']
+    Order.objects.bulk_create(
+        Order(user=rng.choice(users), service=service, total_cost=Decimal('250.00'), status=rng.choice(statuses))
+        for _ in range(rows)
+    )
+    today = timezone.localdate()
+    Appointment.objects.bulk_create(
+        Appointment(user=rng.choice(users), service=service, status=rng.choice(statuses),
+                    appointment_date=(today + timedelta(days=rng.randint(-30, 30))).isoformat())
+        for _ in range(rows)
+    )
+    Feedback.objects.bulk_create(
+        Feedback(user=rng.choice(users), rating=rng.randint(1, 5), feedback_text='Great!') for _ in range(rows)
+    )
+    FeedbackSummary.objects.update_or_create(pk=FeedbackSummary.SINGLETON_ID, defaults=FeedbackSummary.compute())
+
+
+def fan_out(client, today):
+    """What the dashboard would have to do without the summary endpoint."""
+    get = lambda path: json.loads(client.get(f'/api/accounts/{path}').content)  # noqa: E731
+    customers = get('users/staff/?role=user')
+    orders = get('orders/')
+    appointments = get('appointments/booked/')
+    products = get('inventory/')
+    feedback = get('feedback/summary/')
+    get('logs/')
+    return {
+        'bookings_today': sum(1 for a in appointments if a['date'] == today),
+        'pending_orders': sum(1 for o in orders if o['status'] == 'Pending'),
+        'low_stock': sum(1 for p in products if 0 < p['stocks'] <= p['reorder_point']),
+        'customers': len(customers),
+        'average_rating': feedback['average_rating'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.utils import timezone
+    from rest_framework.test import APIClient
+
+    settings.ALLOWED_HOSTS = ['*']
+    seed(args.rows)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=common.bearer_token(common.make_user('bench_admin', is_staff=True,
+                                                                                role='admin')))
+    today = timezone.localdate().isoformat()
+
+    def summary(cached):
+        def run():
+            if not cached:
+                cache.clear()
+            response = client.get('/api/accounts/dashboard/summary/')
+            assert response.status_code == 200, response.content
+        return run
+
+    print(f"{args.rows} rows per table")
+    common.report('six list calls (fan-out)', common.timed(lambda: fan_out(client, today), args.repeat))
+    common.report('/dashboard/summary/ uncached', common.timed(summary(cached=False), args.repeat))
+    common.report('/dashboard/summary/ cached', common.timed(summary(cached=True), args.repeat))
+
+
+if __name__ == '__main__':
+    main()
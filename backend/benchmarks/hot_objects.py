@@ -0,0 +1,56 @@
+"""
+Service lookups in the order/booking write path: validating an order with a
+plain PrimaryKeyRelatedField (one SELECT per request) versus the hot-object
+cache (accounts/hot_objects.py), over a burst that keeps hitting the same few
+services.
+
+    python -m benchmarks.hot_objects --requests 5000 --services 30
+"""
+import argparse
+import random
+
+from . import common
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--services', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.db import connection
+    from rest_framework import serializers
+    from accounts import hot_objects
+    from accounts.models import Service
+    from accounts.serializers import OrderSerializer
+
+    class UncachedOrderSerializer(OrderSerializer):
+        service = serializers.PrimaryKeyRelatedField(queryset=Service.objects.all())
+
+    ids = [Service.objects.create(name=f'Service {i}', duration='30 minutes', cost='250.00').id
+           for i in range(args.services)]
+    rng = random.Random(0)
+    burst = [{'service': rng.choice(ids)} for _ in range(args.requests)]
+
+    def validate(serializer_class):
+        def run():
+            for data in burst:
+                serializer = serializer_class(data=data)
+                serializer.is_valid(raise_exception=True)
+                serializer.validated_data['service'].cost
+        return run
+
+    hot_objects.clear()
+    for label, serializer_class in (('PrimaryKeyRelatedField', UncachedOrderSerializer),
+                                    ('hot-object cache', OrderSerializer)):
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)):
+            validate(serializer_class)()
+        durations = common.timed(validate(serializer_class), args.repeat)
+        common.report(f"{label} ({len(queries)} queries)", durations, args.requests, 'orders')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Rows per second for the list endpoints: ModelSerializer + JSONRenderer (the
+original path) versus the values() projections + FastJSONRenderer. Also
+checks that both produce byte-identical JSON.
+
+    python -m benchmarks.list_serialization --rows 5000
+"""
+import argparse
+from decimal import Decimal
+
+from . import common
+
+
+def seed(rows):
+    from accounts.models import Service, Product, Order, Feedback
+
+    admin = common.make_user('bench_admin', is_staff=True, role='admin')
+    customer = common.make_user('bench_customer')
+    # Every fifth row has no creator/user to cover DRF's null-relation behaviour.
+    creator = lambda i: None if i % 5 == 0 else admin  # noqa: E731
+    Service.objects.bulk_create(
+        Service(name=f'Service {i}', description='Bath & blow-dry with ribbon', duration='1 hour',
+                cost=Decimal('250.50'), created_by=creator(i))
+        for i in range(rows)
+    )
+    Product.objects.bulk_create(
+        Product(name=f'Product {i}', description='Premium kibble – 2kg', stocks=i, price=Decimal('99.99'),
+                created_by=creator(i))
+        for i in range(rows)
+    )
+    service = Service.objects.first()
+    Order.objects.bulk_create(
+        Order(user=customer, service=service, total_cost=Decimal('250.50')) for _ in range(rows)
+    )
+    Feedback.objects.bulk_create(
+        Feedback(user=None if i % 5 == 0 else customer, rating=1 + i % 5, feedback_text='Great service! 🐶')
+        for i in range(rows)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    common.setup()
+    seed(args.rows)
+
+    from rest_framework.renderers import JSONRenderer
+    from accounts import fast_serializers, serializers
+    from accounts.models import Service, Product, Order, Feedback
+    from accounts.renderers import FastJSONRenderer
+
+    cases = [
+        ('services', Service.objects.order_by('-created_at'),
+         serializers.ServiceSerializer, fast_serializers.ServiceValuesSerializer),
+        ('products', Product.objects.order_by('-created_at'),
+         serializers.ProductSerializer, fast_serializers.ProductValuesSerializer),
+        ('orders', Order.objects.order_by('-order_date'),
+         serializers.OrderSerializer, fast_serializers.OrderValuesSerializer),
+        ('feedback', Feedback.objects.order_by('-submitted_at'),
+         serializers.FeedbackSerializer, fast_serializers.FeedbackValuesSerializer),
+    ]
+    for name, queryset, model_serializer, values_serializer in cases:
+        def slow():
+            return JSONRenderer().render(model_serializer(queryset.all(), many=True).data)
+
+        def fast():
+            return FastJSONRenderer().render(values_serializer().serialize(queryset.all()))
+
+        assert slow() == fast(), f"{name}: fast path output differs"
+        common.report(f"{name} ModelSerializer", common.timed(slow, args.repeat), args.rows)
+        common.report(f"{name} values() + fast renderer", common.timed(fast, args.repeat), args.rows)
+
+
+if __name__ == '__main__':
+    main()
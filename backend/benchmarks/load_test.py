@@ -0,0 +1,162 @@
+"""
+Local load test: requests per second and latency for several ways of
+serving the backend, each against the same freshly migrated and seeded
+SQLite file (never db.sqlite3).
+
+    python -m benchmarks.load_test --configs runserver wsgi-1x1 wsgi asgi --duration 10 --concurrency 32
+
+Configurations (see serve.py):
+    runserver   manage.py runserver --noreload (the documented dev mode)
+    wsgi-1x1    gunicorn, one worker, one thread
+    wsgi        gunicorn gthread workers sized from the CPU count
+    asgi        gunicorn + uvicorn workers sized from the CPU count
+
+Clients run in several processes so the load generator is not limited by
+one GIL; on a small machine it still competes with the server for CPU, so
+compare configurations with each other rather than reading absolute numbers.
+"""
+import argparse
+import http.client
+import os
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+CONFIGS = {
+    'runserver': lambda port: ['manage.py', 'runserver', f'127.0.0.1:{port}', '--noreload'],
+    'wsgi-1x1': lambda port: ['serve.py', '--bind', f'127.0.0.1:{port}', '--workers', '1', '--threads', '1'],
+    'wsgi': lambda port: ['serve.py', '--bind', f'127.0.0.1:{port}'],
+    'asgi': lambda port: ['serve.py', '--asgi', '--bind', f'127.0.0.1:{port}'],
+}
+
+SEED = """
+import django
+django.setup()
+from decimal import Decimal
+from django.core.management import call_command
+call_command('migrate', verbosity=0)
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.models import Service, Feedback, UserProfile
+user = User.objects.create_user('load_test', password='load_test')
+UserProfile.objects.create(user=user, role='user', status='Active')
+Service.objects.bulk_create(
+    Service(name=f'Service {i}', description='Bath and blow-dry', duration='1 hour', cost=Decimal('250.00'))
+    for i in range(100)
+)
+Feedback.objects.bulk_create(Feedback(user=user, rating=1 + i % 5, feedback_text='Great!') for i in range(100))
+print(str(RefreshToken.for_user(user).access_token))
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"server on port {port} did not start within {timeout}s")
+
+
+def client_process(port, paths, token, threads, duration):
+    """Runs `threads` keep-alive clients for `duration` seconds; returns (latencies, errors)."""
+    def run_client(offset):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        headers = {'Authorization': f'Bearer {token}', 'Accept-Encoding': 'identity'}
+        latencies, errors, i = [], 0, offset
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                continue
+            latencies.append(time.perf_counter() - start)
+        connection.close()
+        return latencies, errors
+
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(run_client, range(threads)))
+    return [lat for lats, _ in results for lat in lats], sum(errors for _, errors in results)
+
+
+def run_config(name, env, token, args):
+    port = free_port()
+    server = subprocess.Popen([sys.executable, *CONFIGS[name](port)], cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(port)
+        # Warm up every worker so imports and first connections aren't measured.
+        client_process(port, args.paths, token, args.concurrency, 1)
+        processes = min(args.client_processes, args.concurrency)
+        per_process = [args.concurrency // processes + (i < args.concurrency % processes) for i in range(processes)]
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [pool.submit(client_process, port, args.paths, token, threads, args.duration)
+                       for threads in per_process]
+            results = [future.result() for future in futures]
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies = sorted(lat for lats, _ in results for lat in lats)
+    errors = sum(errors for _, errors in results)
+    if not latencies:
+        print(f"{name:<12} no successful requests ({errors} errors)")
+        return
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<12} {len(latencies) / args.duration:10,.0f} req/s   p50 {statistics.median(latencies) * 1000:7.1f} ms"
+          f"   p99 {p99 * 1000:7.1f} ms   errors {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--configs', nargs='+', default=['runserver', 'wsgi-1x1', 'wsgi', 'asgi'], choices=CONFIGS)
+    parser.add_argument('--paths', nargs='+', default=['/api/accounts/services/', '/api/accounts/feedback/gallery/'])
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per configuration.')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent keep-alive clients.')
+    parser.add_argument('--client-processes', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'backend.settings_production',
+            'DJANGO_SECRET_KEY': secrets.token_urlsafe(50),
+            'DJANGO_SQLITE_PATH': str(Path(tmp) / 'load_test.sqlite3'),
+        }
+        seeded = subprocess.run([sys.executable, '-c', SEED], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+        if seeded.returncode != 0:
+            raise SystemExit(seeded.stderr)
+        token = seeded.stdout.strip().splitlines()[-1]
+        print(f"{args.concurrency} clients, {args.duration:.0f}s per configuration, {os.cpu_count()} CPU(s)")
+        for name in args.configs:
+            run_config(name, env, token, args)
+
+
+if __name__ == '__main__':
+    main()
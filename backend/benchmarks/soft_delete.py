@@ -0,0 +1,93 @@
+"""
+Hard delete versus soft-delete + background purge for a user who owns a
+large history (default 100k rows spread over orders, appointments, login
+records and feedback).
+
+    python -m benchmarks.soft_delete --rows 100000 --batch-size 1000
+"""
+import argparse
+import time
+from unittest import mock
+
+from . import common
+
+
+def seed_history(username, rows):
+    from decimal import Decimal
+    from accounts.models import Service, Order, Appointment, LoginActivity, LoginLog, Feedback
+
+    user = common.make_user(username)
+    service = Service.objects.create(name=f'{username} service', duration='1 hour', cost=Decimal('100.00'))
+    share = rows // 5
+    batch = 5000
+    Order.objects.bulk_create(
+        (Order(user=user, service=service, total_cost=Decimal('100.00')) for _ in range(share)), batch_size=batch)
+    Appointment.objects.bulk_create(
+        (Appointment(user=user, service=service, appointment_date='2026-01-01') for _ in range(share)),
+        batch_size=batch)
+    LoginActivity.objects.bulk_create((LoginActivity(user=user) for _ in range(share)), batch_size=batch)
+    LoginLog.objects.bulk_create((LoginLog(user=user, role='user') for _ in range(share)), batch_size=batch)
+    Feedback.objects.bulk_create(
+        (Feedback(user=user, rating=5, feedback_text='ok') for _ in range(rows - 4 * share)), batch_size=batch)
+    return user
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.db import connection
+    from rest_framework.test import APIClient
+    from accounts import tasks
+
+    admin = common.make_user('bench_admin', is_staff=True, role='admin')
+
+    hard = seed_history('hard_delete', args.rows)
+    start = time.perf_counter()
+    hard.delete()
+    hard_seconds = time.perf_counter() - start
+
+    soft = seed_history('soft_delete', args.rows)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=common.bearer_token(admin))
+    start = time.perf_counter()
+    response = client.delete(f'/api/accounts/users/{soft.pk}/')
+    request_seconds = time.perf_counter() - start
+    assert response.status_code == 202, response.status_code
+
+    # Time each purge transaction to find the longest write-lock hold.
+    longest = 0.0
+    original_atomic = tasks.transaction.atomic
+
+    class TimedAtomic:
+        def __init__(self, *args, **kwargs):
+            self.inner = original_atomic(*args, **kwargs)
+
+        def __enter__(self):
+            self.start = time.perf_counter()
+            return self.inner.__enter__()
+
+        def __exit__(self, *exc):
+            nonlocal longest
+            result = self.inner.__exit__(*exc)
+            longest = max(longest, time.perf_counter() - self.start)
+            return result
+
+    # tasks.transaction is django.db.transaction itself, so patch it only for the purge.
+    with mock.patch.object(tasks.transaction, 'atomic', TimedAtomic):
+        start = time.perf_counter()
+        tasks.purge_user(soft.pk, batch_size=args.batch_size)
+        purge_seconds = time.perf_counter() - start
+
+    print(f"{args.rows:,} dependent rows on {connection.vendor}")
+    print(f"hard delete (request + lock)       {hard_seconds * 1000:10.1f} ms")
+    print(f"soft delete request (tombstone)    {request_seconds * 1000:10.1f} ms")
+    print(f"background purge total             {purge_seconds * 1000:10.1f} ms")
+    print(f"longest purge transaction          {longest * 1000:10.1f} ms  (batch size {args.batch_size})")
+
+
+if __name__ == '__main__':
+    main()
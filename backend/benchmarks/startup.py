@@ -0,0 +1,82 @@
+"""
+Cold-start cost of a worker process: wall time until the first response
+from the WSGI app and for `manage.py check`, per settings module, plus the
+slowest imports from `python -X importtime`. Every sample is a fresh
+interpreter, and nothing touches the database.
+
+    python -m benchmarks.startup --settings backend.settings backend.settings_api --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Builds the WSGI app and serves one unauthenticated request (a 401, so no
+# database access), i.e. everything a worker does before its first real hit.
+FIRST_REQUEST = """
+from io import BytesIO
+from backend.wsgi import application
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/accounts/services/', 'QUERY_STRING': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+    'wsgi.input': BytesIO(), 'wsgi.url_scheme': 'http', 'wsgi.errors': BytesIO(),
+}
+statuses = []
+b''.join(application(environ, lambda status, headers: statuses.append(status)))
+assert statuses[0].startswith('401'), statuses[0]
+"""
+
+
+def _run(args, settings_module, **kwargs):
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+                            **kwargs)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise SystemExit(f"{' '.join(args)} failed with {settings_module}:\n{result.stderr}")
+    return elapsed, result
+
+
+def import_profile(settings_module, top):
+    """Import self time (ms) summed per top-level package, from -X importtime."""
+    _, result = _run(['-X', 'importtime', '-c', FIRST_REQUEST], settings_module)
+    totals = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        totals[package] = totals.get(package, 0) + int(self_us) / 1000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', nargs='+', default=['backend.settings', 'backend.settings_api'])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12, help='Packages to list in the import profile.')
+    args = parser.parse_args()
+
+    for settings_module in args.settings:
+        print(f"== {settings_module}")
+        cases = (
+            ('bare interpreter', ['-c', 'pass']),
+            ('WSGI app + first request', ['-c', FIRST_REQUEST]),
+            ('manage.py check', ['manage.py', 'check']),
+        )
+        for label, command in cases:
+            samples = [_run(command, settings_module)[0] for _ in range(args.runs)]
+            print(f"{label:<30} median {statistics.median(samples) * 1000:8.1f} ms   best {min(samples) * 1000:8.1f} ms")
+        print("slowest packages to import (self time, ms):")
+        for package, ms in import_profile(settings_module, args.top):
+            print(f"  {package:<28} {ms:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
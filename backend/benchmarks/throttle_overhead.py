@@ -0,0 +1,65 @@
+"""
+Per-request cost of the token-bucket throttles: allow_request() for one
+client hammering a bucket and for many distinct clients (the spraying case),
+plus a threaded run. The counts live in the RATE_LIMIT_CACHE cache, so the
+figures include its round trips (LocMemCache here).
+
+    python -m benchmarks.throttle_overhead --calls 200000 --threads 8
+"""
+import argparse
+import threading
+import time
+
+from . import common
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=100_000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    common.setup()
+    from rest_framework.request import Request
+    from accounts.parsers import FastJSONParser
+    from rest_framework.test import APIRequestFactory
+    from accounts.throttling import LoginRateThrottle, FeedbackRateThrottle, bucket_store
+
+    factory = APIRequestFactory()
+    login = Request(factory.post('/api/accounts/login/', {'username': 'bench', 'password': 'x'}, format='json'),
+                    parsers=[FastJSONParser()])
+    login.data  # Parse once, as DRF does before the throttles run
+    throttle = LoginRateThrottle()
+
+    def same_client():
+        for _ in range(args.calls):
+            throttle.allow_request(login, None)
+
+    raw = [factory.get('/', REMOTE_ADDR=f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}') for i in range(args.calls)]
+    many = [Request(r) for r in raw]
+    feedback = FeedbackRateThrottle()
+
+    def many_clients():
+        bucket_store.cache.clear()
+        for request in many:
+            feedback.allow_request(request, None)
+
+    def threaded():
+        per_thread = args.calls // args.threads
+        workers = [threading.Thread(target=lambda: [throttle.allow_request(login, None) for _ in range(per_thread)])
+                   for _ in range(args.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    for label, func in (('one client (login, ip+username)', same_client),
+                        ('distinct clients (feedback, ip)', many_clients),
+                        (f'{args.threads} threads, one client', threaded)):
+        durations = common.timed(func, 3)
+        common.report(label, durations, args.calls, unit='calls')
+        print(f"{'':<40} {min(durations) / args.calls * 1e6:9.2f} us per allow_request()")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Production launcher for the backend.
+
+Runs gunicorn with the app preloaded in the master process, so workers fork
+with Django already imported. Worker and thread counts are sized from the
+CPU count, and each worker is recycled after --max-requests requests (with
+jitter, so they don't all restart at once) to bound memory growth.
+
+    python serve.py                    # WSGI, threaded workers
+    python serve.py --asgi             # ASGI (async views, SSE) with uvicorn workers
+    python serve.py --workers 4 --threads 8 --max-requests 2000
+
+Requires `pip install gunicorn` (and `uvicorn` for --asgi). Gunicorn does not
+run on Windows; there the ASGI app is started with uvicorn's own workers.
+"""
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+
+
+def default_workers(asgi, cpus):
+    # Threaded WSGI workers spend most of their time waiting on the database,
+    # so one per core plus one keeps every core busy; an ASGI worker
+    # multiplexes requests on its event loop and needs no spare.
+    return cpus if asgi else cpus + 1
+
+
+def default_threads(asgi):
+    return 1 if asgi else 4
+
+
+def require(module, package):
+    if importlib.util.find_spec(module) is None:
+        raise SystemExit(f"{package} is not installed: pip install {package}")
+
+
+def build_command(options):
+    cpus = os.cpu_count() or 1
+    workers = options.workers or default_workers(options.asgi, cpus)
+    threads = options.threads or default_threads(options.asgi)
+    jitter = max(options.max_requests // 10, 1) if options.max_requests else 0
+
+    if os.name == 'nt':
+        require('uvicorn', 'uvicorn')
+        host, _, port = options.bind.rpartition(':')
+        command = [
+            sys.executable, '-m', 'uvicorn', 'backend.asgi:application',
+            '--host', host or '127.0.0.1', '--port', port, '--workers', str(workers),
+        ]
+        if options.max_requests:
+            command += ['--limit-max-requests', str(options.max_requests)]
+        return command
+
+    require('gunicorn', 'gunicorn')
+    if options.asgi:
+        require('uvicorn', 'uvicorn')
+        app, worker_class = 'backend.asgi:application', 'uvicorn.workers.UvicornWorker'
+    else:
+        app, worker_class = 'backend.wsgi:application', 'gthread'
+    command = [
+        sys.executable, '-m', 'gunicorn', app,
+        '--preload',
+        '--bind', options.bind,
+        '--worker-class', worker_class,
+        '--workers', str(workers),
+        '--threads', str(threads),
+        '--max-requests', str(options.max_requests),
+        '--max-requests-jitter', str(jitter),
+        '--timeout', str(options.timeout),
+        '--graceful-timeout', str(options.timeout),
+        '--keep-alive', '5',
+    ]
+    if options.access_log:
+        command += ['--access-logfile', '-']
+    return command
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--asgi', action='store_true', help='Serve backend.asgi instead of backend.wsgi.')
+    parser.add_argument('--bind', default='127.0.0.1:8000')
+    parser.add_argument('--workers', type=int, default=0, help='Default: sized from the CPU count.')
+    parser.add_argument('--threads', type=int, default=0, help='Threads per WSGI worker (default 4).')
+    parser.add_argument('--max-requests', type=int, default=1000,
+                        help='Recycle a worker after this many requests (0 disables).')
+    parser.add_argument('--timeout', type=int, default=30, help='Seconds before a stuck worker is restarted.')
+    parser.add_argument('--settings', default='backend.settings_production')
+    parser.add_argument('--access-log', action='store_true')
+    parser.add_argument('--dry-run', action='store_true', help='Print the server command instead of running it.')
+    options = parser.parse_args(argv)
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = options.settings
+    command = build_command(options)
+    if options.dry_run:
+        print(' '.join(command))
+        return
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    # Gunicorn skips Django's system checks; refuse to start on deployment
+    # errors (e.g. a cache the workers can't share, see accounts/checks.py).
+    if subprocess.run([sys.executable, 'manage.py', 'check', '--deploy', '--fail-level', 'ERROR']).returncode:
+        raise SystemExit("manage.py check failed; not starting the server.")
+    os.execv(command[0], command)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,70 @@
-import React from "react";
+import React, { useEffect, useState } from "react";
+import axios from "axios";
+
+const BASE_URL = "http://127.0.0.1:8000/api/accounts/";
+
+function StatCard({ label, value, hint }) {
+  return (
+    <div className="bg-white rounded-lg shadow p-4">
+      <p className="text-sm text-gray-500">{label}</p>
+      <p className="text-3xl font-bold">{value}</p>
+      {hint && <p className="text-xs text-gray-400 mt-1">{hint}</p>}
+    </div>
+  );
+}
 
 export default function DashboardHome() {
+  const [summary, setSummary] = useState(null);
+  const [error, setError] = useState(null);
+
+  useEffect(() => {
+    // One request for every card (the figures are cached server-side for a few seconds)
+    axios
+      .get(`${BASE_URL}dashboard/summary/`, {
+        headers: { Authorization: `Bearer ${localStorage.getItem("access")}` },
+      })
+      .then((res) => setSummary(res.data))
+      .catch((err) => {
+        console.error("Error loading dashboard summary:", err);
+        setError(err.response?.status === 403 ? "Staff access required." : "Failed to load the summary.");
+      });
+  }, []);
+
   return (
     <div className="p-6">
       <h1 className="text-2xl font-bold">Dashboard Home</h1>
       <p>Welcome to the dashboard!</p>
+
+      {error && <p className="text-red-500 mt-4">{error}</p>}
+      {summary && (
+        <div className="grid grid-cols-1 md:grid-cols-3 gap-4 mt-6">
+          <StatCard
+            label="Bookings today"
+            value={summary.bookings.today}
+            hint={`${summary.bookings.upcoming} upcoming, ${summary.bookings.today_cancelled} cancelled today`}
+          />
+          <StatCard
+            label="Pending orders"
+            value={summary.orders.pending}
+            hint={`${summary.orders.today} today, ₱${summary.orders.revenue_today} completed`}
+          />
+          <StatCard
+            label="Low stock products"
+            value={summary.products.low_stock}
+            hint={`${summary.products.out_of_stock} out of stock`}
+          />
+          <StatCard
+            label="New customers today"
+            value={summary.users.new_today}
+            hint={`${summary.users.new_this_week} this week, ${summary.users.customers} active`}
+          />
+          <StatCard
+            label="Average rating"
+            value={summary.feedback.average_rating ?? "–"}
+            hint={`${summary.feedback.count} reviews`}
+          />
+        </div>
+      )}
     </div>
   );
 }
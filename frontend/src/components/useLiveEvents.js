@@ -0,0 +1,72 @@
+import { useEffect, useRef } from "react";
+import axios from "axios";
+
+const BASE_URL = "http://127.0.0.1:8000/api/accounts/";
+const RECONNECT_MS = 5000;
+
+// Subscribes to the server-sent change stream (GET events/) for the given
+// channels ("product", "service", "appointment") and calls onEvent with each
+// {channel, op, id, changes} diff. EventSource can't send the JWT header, so
+// every connection first trades it for a one-use ticket. onResync runs after
+// a reconnect or when the server says we fell behind: refetch the list then.
+// The stream is only served by the ASGI app (python serve.py --asgi).
+export default function useLiveEvents(channels, onEvent, onResync) {
+    const handlers = useRef({ onEvent, onResync });
+    handlers.current = { onEvent, onResync };
+    const channelList = channels.join(",");
+
+    useEffect(() => {
+        const token = localStorage.getItem("access");
+        if (!token) return undefined;
+
+        let source = null;
+        let retryTimer = null;
+        let closed = false;
+        let connectedBefore = false;
+
+        const connect = () => {
+            axios
+                .post(`${BASE_URL}events/ticket/`, null, { headers: { Authorization: `Bearer ${token}` } })
+                .then((res) => {
+                    if (closed) return;
+                    source = new EventSource(`${BASE_URL}events/?channels=${channelList}&ticket=${res.data.ticket}`);
+                    source.onopen = () => {
+                        // Anything published while we were away was missed
+                        if (connectedBefore && handlers.current.onResync) handlers.current.onResync();
+                        connectedBefore = true;
+                    };
+                    channelList.split(",").forEach((channel) =>
+                        source.addEventListener(channel, (e) => handlers.current.onEvent(JSON.parse(e.data)))
+                    );
+                    source.addEventListener("control", (e) => {
+                        if (JSON.parse(e.data).op === "resync" && handlers.current.onResync) handlers.current.onResync();
+                    });
+                    // The ticket is spent, so EventSource's own retry would be refused: reconnect with a new one
+                    source.onerror = () => {
+                        source.close();
+                        scheduleReconnect();
+                    };
+                })
+                .catch(scheduleReconnect);
+        };
+
+        const scheduleReconnect = () => {
+            if (!closed) retryTimer = setTimeout(connect, RECONNECT_MS);
+        };
+
+        connect();
+        return () => {
+            closed = true;
+            clearTimeout(retryTimer);
+            if (source) source.close();
+        };
+    }, [channelList]);
+}
+
+// Applies one stream event to a list of rows keyed by id. New rows only carry
+// the tracked fields, so callers refetch on "created" instead.
+export function applyChange(rows, event) {
+    if (event.op === "deleted") return rows.filter((row) => row.id !== event.id);
+    if (event.op === "updated") return rows.map((row) => (row.id === event.id ? { ...row, ...event.changes } : row));
+    return rows;
+}
@@ -104,7 +104,8 @@ export default function Appointment() {
         if (!isAuthenticated) return;
         setLoading(true);
         try {
-            const response = await axios.get(`${BASE_URL}services/`, {
+            // Only the columns the dropdown and summary use (sparse fieldset)
+            const response = await axios.get(`${BASE_URL}services/?fields=id,name,cost,duration,availability`, {
                 headers: { 'Authorization': `Bearer ${token}` }
             });
             const available = response.data.filter(s => s.availability);
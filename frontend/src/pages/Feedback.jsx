@@ -39,6 +39,8 @@ export default function Feedback() {
     const [loading, setLoading] = useState(false);
     const [galleryData, setGalleryData] = useState([]); // State for public feedback
     const [galleryLoading, setGalleryLoading] = useState(true); // State for gallery loading
+    const [nextCursor, setNextCursor] = useState(null); // Cursor for the next gallery page (null = no more)
+    const [summary, setSummary] = useState(null); // { count, average_rating, histogram }
     
     // FIX: Disable ESLint warning since `Maps` is intentionally unused after redirect removal
     const navigate = useNavigate(); // eslint-disable-line no-unused-vars 
@@ -49,16 +51,21 @@ export default function Feedback() {
     const BASE_URL = "http://127.0.0.1:8000/api/accounts/";
     
     // --- Gallery Fetch Handler ---
-    const fetchGallery = useCallback(async () => {
+    // The gallery is paginated: the first page comes with the rating summary,
+    // later pages are fetched with the `next` cursor and appended.
+    const fetchGallery = useCallback(async (cursor = null) => {
         setGalleryLoading(true);
         try {
-            // NOTE: Assuming a new public endpoint /feedback/gallery/
-            const res = await axios.get(`${BASE_URL}feedback/gallery/`);
-            setGalleryData(res.data);
+            const res = await axios.get(`${BASE_URL}feedback/gallery/`, {
+                params: cursor ? { cursor } : {},
+            });
+            setGalleryData(prev => cursor ? [...prev, ...res.data.results] : res.data.results);
+            setNextCursor(res.data.next);
+            if (res.data.summary) setSummary(res.data.summary);
         } catch (err) {
             console.error("Error fetching gallery:", err);
             // Non-critical error, just log and display empty list
-            setGalleryData([]);
+            if (!cursor) setGalleryData([]);
         } finally {
             setGalleryLoading(false);
         }
@@ -198,10 +205,15 @@ export default function Feedback() {
                     {/* --- RIGHT COLUMN: Feedback Gallery --- */}
                     <div className="p-6 bg-gray-50 rounded-xl shadow-md border border-gray-200">
                         <h2 className="text-2xl font-bold text-default-text mb-4 border-b border-gray-200 pb-2">
-                            Customer Reviews ({galleryData.length})
+                            Customer Reviews ({summary ? summary.count : galleryData.length})
                         </h2>
+                        {summary && summary.average_rating !== null && (
+                            <p className="text-sm text-gray-600 mb-4">
+                                Average rating: <span className="font-semibold">{summary.average_rating.toFixed(1)}</span> / 5
+                            </p>
+                        )}
                         
-                        {galleryLoading ? (
+                        {galleryLoading && galleryData.length === 0 ? (
                             <p className="text-center text-gray-500 py-6">Loading reviews...</p>
                         ) : galleryData.length === 0 ? (
                             <p className="text-center text-gray-500 py-6">Be the first to leave feedback!</p>
@@ -224,6 +236,15 @@ export default function Feedback() {
                                         </p>
                                     </div>
                                 ))}
+                                {nextCursor && (
+                                    <button
+                                        onClick={() => fetchGallery(nextCursor)}
+                                        disabled={galleryLoading}
+                                        className="w-full text-sm text-gray-600 p-2 rounded-lg border border-gray-200 hover:bg-white transition disabled:opacity-50"
+                                    >
+                                        {galleryLoading ? 'Loading...' : 'Show more reviews'}
+                                    </button>
+                                )}
                             </div>
                         )}
                     </div>
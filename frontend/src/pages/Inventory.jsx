@@ -1,5 +1,6 @@
 import React, { useState, useEffect, useCallback } from "react";
 import axios from "axios";
+import useLiveEvents, { applyChange } from "../components/useLiveEvents";
 
 export default function Inventory() {
     const [products, setProducts] = useState([]);
@@ -35,11 +36,19 @@ export default function Inventory() {
         fetchProducts();
     }, [fetchProducts]);
 
-    const getStatusStyles = (isAvailable, stocks) => {
+    // Stock and availability edits made elsewhere show up without a reload
+    useLiveEvents(
+        ["product"],
+        (event) => (event.op === "created" ? fetchProducts() : setProducts((prev) => applyChange(prev, event))),
+        fetchProducts
+    );
+
+    // Red once a product is at or below its reorder point (the level that triggers a stock alert)
+    const getStatusStyles = (isAvailable, stocks, reorderPoint) => {
         if (!isAvailable) {
             return "bg-gray-500 text-white";
         }
-        if (stocks <= 5) {
+        if (stocks <= reorderPoint) {
             return "bg-red-500 text-white";
         }
         if (stocks <= 20) {
@@ -89,8 +98,8 @@ export default function Inventory() {
                                 </td>
                                 {/* FIX: Added text-center here to align the status badge */}
                                 <td className="px-6 py-4 whitespace-nowrap text-center"> 
-                                    <span className={`inline-flex items-center px-3 py-0.5 rounded-full text-xs font-medium ${getStatusStyles(product.is_available, product.stocks)}`}>
-                                        {product.is_available ? (product.stocks === 0 ? 'Out of Stock' : 'In Stock') : 'Unavailable'}
+                                    <span className={`inline-flex items-center px-3 py-0.5 rounded-full text-xs font-medium ${getStatusStyles(product.is_available, product.stocks, product.reorder_point)}`}>
+                                        {product.is_available ? (product.stocks <= 0 ? 'Out of Stock' : product.stocks <= product.reorder_point ? 'Low Stock' : 'In Stock') : 'Unavailable'}
                                     </span>
                                 </td>
                             </tr>
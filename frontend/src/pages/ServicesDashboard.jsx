@@ -1,5 +1,6 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import axios from "axios";
+import useLiveEvents, { applyChange } from "../components/useLiveEvents";
 
 export default function ServicesDashboard() {
     const [services, setServices] = useState([]);
@@ -31,6 +32,18 @@ export default function ServicesDashboard() {
             .catch((err) => console.error("Error fetching services:", err));
     }, [token]);
 
+    // Edits by other staff are patched in as they happen (see useLiveEvents)
+    const refetchServices = () =>
+        axios
+            .get(`${BASE_URL}services/`, { headers: { Authorization: `Bearer ${token}` } })
+            .then((res) => setServices(res.data))
+            .catch((err) => console.error("Error fetching services:", err));
+    useLiveEvents(
+        ["service"],
+        (event) => (event.op === "created" ? refetchServices() : setServices((prev) => applyChange(prev, event))),
+        refetchServices
+    );
+
     // --- HANDLERS FOR ADD FORM (Unchanged) ---
     const handleChange = (e) => {
         const { name, value } = e.target;
@@ -107,14 +120,24 @@ export default function ServicesDashboard() {
 
         axios
             .put(`${BASE_URL}services/${id}/`, payload, {
-                headers: { Authorization: `Bearer ${token}` },
+                // Refused with 412 if someone else saved this service after it was loaded
+                headers: { Authorization: `Bearer ${token}`, 'If-Match': `"${editingService.version}"` },
             })
             .then((res) => {
                 setServices((prev) => prev.map((s) => (s.id === id ? res.data : s)));
                 setEditingService(null); // Close the modal
                 setIsEditing(false); // Reset edit state
             })
-            .catch((err) => console.error("Error updating service:", err));
+            .catch((err) => {
+                if (err.response?.status === 412) {
+                    const current = err.response.data.current;
+                    setServices((prev) => prev.map((s) => (s.id === id ? current : s)));
+                    handleView(current); // Reload the form with their changes
+                    alert("This service was changed by someone else. The latest version has been loaded; review it and save again.");
+                    return;
+                }
+                console.error("Error updating service:", err);
+            });
     };
 
     // Function to close the modal and reset states
@@ -125,16 +148,49 @@ export default function ServicesDashboard() {
 
     // --- HANDLERS FOR ACTIONS (Unchanged) ---
 
-    const handleToggleAvailability = (id) => {
-        // ... (Toggle availability logic)
+    // Availability clicks show up immediately and are sent together a moment
+    // later (inventory/changes/), so rapid toggling costs one write, not one per click.
+    const pendingToggles = useRef({});
+    const flushTimer = useRef(null);
+
+    const flushToggles = () => {
+        clearTimeout(flushTimer.current);
+        flushTimer.current = null;
+        const changes = Object.entries(pendingToggles.current).map(([id, availability]) => ({
+            id: Number(id),
+            availability,
+        }));
+        pendingToggles.current = {};
+        if (changes.length === 0) return;
+
         axios
-            .patch(`${BASE_URL}services/${id}/toggle/`, null, {
+            .post(`${BASE_URL}inventory/changes/`, { services: changes }, {
                 headers: { Authorization: `Bearer ${token}` },
             })
             .then((res) => {
-                setServices((prev) => prev.map((s) => (s.id === id ? res.data : s)));
+                const saved = Object.fromEntries(res.data.services.updated.map((s) => [s.id, s.availability]));
+                setServices((prev) => prev.map((s) => (s.id in saved ? { ...s, availability: saved[s.id] } : s)));
             })
-            .catch((err) => console.error("Error toggling availability:", err));
+            .catch((err) => {
+                console.error("Error toggling availability:", err);
+                // Put the list back in step with the server
+                axios
+                    .get(`${BASE_URL}services/`, { headers: { Authorization: `Bearer ${token}` } })
+                    .then((res) => setServices(res.data));
+            });
+    };
+
+    // Don't drop clicks that are still buffered when the page closes
+    useEffect(() => flushToggles, []); // eslint-disable-line react-hooks/exhaustive-deps
+
+    const handleToggleAvailability = (id) => {
+        const service = services.find((s) => s.id === id);
+        if (!service) return;
+        const availability = !service.availability;
+        setServices((prev) => prev.map((s) => (s.id === id ? { ...s, availability } : s)));
+        pendingToggles.current[id] = availability;
+        clearTimeout(flushTimer.current);
+        flushTimer.current = setTimeout(flushToggles, 500);
     };
 
     const handleRemoveService = (id) => {
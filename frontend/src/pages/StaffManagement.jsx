@@ -24,7 +24,8 @@ export default function StaffManagement() {
 
         try {
             // NOTE: This endpoint assumes your Django backend has a view at users/staff/
-            const res = await axios.get(`${BASE_URL}users/staff/`, { 
+            // Only staff roles are fetched; customers are filtered out server-side.
+            const res = await axios.get(`${BASE_URL}users/staff/?role=admin,manager`, { 
                 headers: { Authorization: `Bearer ${token}` },
             });
             // FIX: Ensure the retrieved data is mutable and correctly structured